@@ -1,5 +1,14 @@
+import argparse
+import hashlib
+import os
+import sys
+
 import numpy as np
 
+# Módulos compartilhados entre os modelos ficam na pasta shared/ na raiz do repositório
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "shared"))
+from rules import parse_rule  # regra "B3/S23" -> (nascimento, sobrevivência)
+
 # Padrões predefinidos para alguns caracteres usando células do Jogo da Vida
 PREDEFINED_PATTERNS = {
     "a": [(1, 1), (1, 2), (2, 1), (2, 2)],  # Bloco - Padrão fixo
@@ -10,60 +19,399 @@ PREDEFINED_PATTERNS = {
     "f": [(0, 1), (0, 4), (1, 0), (1, 4), (2, 4), (3, 1), (3, 3)],  # LWSS - "Nave espacial leve" - Padrão gerador
 }
 
-# Função para dar um passo no Jogo da Vida de Conway. Segue as regras normais.
-def conway_game_of_life_step(grid):
-    rows, cols = grid.shape
-    new_grid = np.zeros((rows, cols), dtype=int)  # Matriz para o novo estado
-    for x in range(rows):
-        for y in range(cols):
-            neighbors = [(x-1, y-1), (x-1, y), (x-1, y+1), (x, y-1), (x, y+1), (x+1, y-1), (x+1, y), (x+1, y+1)]  #Coordenadas dos vizinhos no grid
-            count = sum(grid[nx % rows, ny % cols] for nx, ny in neighbors)
-            # Regras do Jogo da Vida
-            if grid[x, y] == 1 and count in [2, 3]:  # Sobrevive
-                new_grid[x, y] = 1
-            elif grid[x, y] == 0 and count == 3:  # Nasce
-                new_grid[x, y] = 1
-    return new_grid
+# Regra padrão do Jogo da Vida no formato B/S (nasce com 3 vizinhos, sobrevive com 2 ou 3)
+CONWAY_RULE = "B3/S23"
+
+# Função para dar um passo no Jogo da Vida de Conway. Segue as regras normais (ou outra regra B/S).
+# Aceita uma grade (linhas, colunas) ou uma pilha de grades (padrões, linhas, colunas), que evoluem todas juntas.
+def conway_game_of_life_step(grid, rule=CONWAY_RULE):
+    rows, cols = grid.shape[-2:]
+    # Borda de 1 célula copiada do lado oposto (wrap), para somar os vizinhos com fatias
+    padded = np.pad(grid.astype(np.uint8, copy=False), [(0, 0)] * (grid.ndim - 2) + [(1, 1), (1, 1)], mode="wrap")
+    count = np.zeros(grid.shape, dtype=np.uint8)
+    for dx in (0, 1, 2):
+        for dy in (0, 1, 2):
+            if dx != 1 or dy != 1:
+                count += padded[..., dx:dx + rows, dy:dy + cols]
+    if rule == CONWAY_RULE:
+        # Regras do Jogo da Vida: sobrevive com 2 ou 3 vizinhos, nasce com 3
+        return ((count == 3) | ((grid == 1) & (count == 2))).astype(grid.dtype)
+    birth, survive = parse_rule(rule)
+    return np.where(grid == 1, np.isin(count, survive), np.isin(count, birth)).astype(grid.dtype)
 
 # Função para gerar o padrão final após um número de passos. Recebe os pontos iniciais, tamanho da grid (padrão 10x10) e o número de passos (padrão 10). Executa os passos e retorna uma string de 0 (azulejo apagado) e 1 (azulejo aceso)
-def generate_game_pattern(starting_positions, grid_size=(10, 10), steps=10):
-
-    grid = np.zeros(grid_size, dtype=int)  #Criando a grid vazia e definindo as posições iniciais baseadas no input da função
-    for x, y in starting_positions:
-        grid[x % grid_size[0], y % grid_size[1]] = 1
-  
-    for _ in range(steps): #Executando os passos
-        grid = conway_game_of_life_step(grid)
-    return ''.join(map(str, grid.flatten()))
-
-# Função para criar o mapeamento de caracteres para padrões do Jogo da Vida. Para este trabalho, usamos apenas padrões predefinidos, porém o código pode ser extendido para gerar naturalmente padrões aleatórios para cada caractere.
-def create_mapping(characters, steps=10, grid_size=(10, 10)):
-    mapping = {}
-    for char in characters: 
-        if char in PREDEFINED_PATTERNS:
-            starting_positions = PREDEFINED_PATTERNS[char]
-      
-        # Gera o padrão final após a evolução do Jogo da Vida
-        final_state = generate_game_pattern(starting_positions, grid_size, steps)
-        mapping[char] = final_state
+def generate_game_pattern(starting_positions, grid_size=(10, 10), steps=10, rule=CONWAY_RULE):
+    return generate_game_patterns([starting_positions], grid_size, steps, rule)[0]
+
+# Versão em lote: todos os padrões iniciais são empilhados em um array 3D e evoluem juntos, um passo vetorizado por geração
+def generate_game_patterns(positions_list, grid_size=(10, 10), steps=10, rule=CONWAY_RULE):
+    grids = np.zeros((len(positions_list),) + tuple(grid_size), dtype=np.uint8)
+    for i, starting_positions in enumerate(positions_list):
+        for x, y in starting_positions:
+            grids[i, x % grid_size[0], y % grid_size[1]] = 1
+
+    grids = evolve_grids(grids, steps, rule)
+    # Cada grade vira uma string de '0' e '1' (código ASCII 48 + valor da célula)
+    return [(grid.flatten() + ord('0')).tobytes().decode() for grid in grids]
+
+# Evolui uma pilha de grades (padrões, linhas, colunas) em lotes de batch_size, para não criar arrays temporários enormes
+def evolve_grids(grids, steps=10, rule=CONWAY_RULE, batch_size=4096):
+    out = np.empty_like(grids)
+    for start in range(0, len(grids), batch_size):
+        batch = grids[start:start + batch_size]
+        for _ in range(steps): #Executando os passos
+            batch = conway_game_of_life_step(batch, rule)
+        out[start:start + batch_size] = batch
+    return out
+
+# Gera um padrão inicial aleatório (mas sempre o mesmo) para cada código de caractere. Os bits saem de um
+# hash (splitmix64) de (semente, código, tentativa, posição), então o padrão de um caractere não depende dos outros
+def seed_patterns(codes, grid_size=(10, 10), seed=0, attempt=0):
+    rows, cols = grid_size
+    words = -(-rows * cols // 64)
+    codes = np.asarray(codes, dtype=np.uint64)
+    x = codes[:, None] * np.uint64(words) + np.arange(words, dtype=np.uint64)
+    x ^= _mix64(np.array([seed, attempt], dtype=np.uint64)).sum(dtype=np.uint64)
+    bits = np.unpackbits(_mix64(x).astype("<u8").view(np.uint8), axis=1, bitorder="little")
+    return bits[:, :rows * cols].reshape(len(codes), rows, cols)
+
+def _mix64(x):
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+# Grades iniciais (caracteres, linhas, colunas) e máscara dos caracteres com padrão predefinido; os demais usam seed_patterns
+def starting_grids(characters, grid_size=(10, 10), seed=0):
+    grids = np.zeros((len(characters),) + tuple(grid_size), dtype=np.uint8)
+    fixed = np.array([char in PREDEFINED_PATTERNS for char in characters], dtype=bool)
+    for i in np.flatnonzero(fixed):
+        for x, y in PREDEFINED_PATTERNS[characters[i]]:
+            grids[i, x % grid_size[0], y % grid_size[1]] = 1
+    codes = np.array([ord(char) for char in characters], dtype=np.int64)
+    pending = np.flatnonzero(~fixed)
+    grids[pending] = seed_patterns(codes[pending], grid_size, seed)
+    return grids, fixed
+
+# Estados finais (caracteres, linhas, colunas) de todos os caracteres, sem repetições. Caracteres de PREDEFINED_PATTERNS
+# usam o padrão predefinido; os outros usam seed_patterns. Os estados finais já aceitos ficam em um índice (dict)
+# pelos bytes empacotados; caracteres cujo estado colide com um já aceito são sorteados de novo com outra tentativa.
+def generate_unique_states(characters, grid_size=(10, 10), steps=10, rule=CONWAY_RULE, seed=0, max_attempts=64):
+    characters = list(characters)
+    # Caracteres repetidos recebem o mesmo estado: os estados são gerados só para os distintos e depois repetidos
+    unique = list(dict.fromkeys(characters))
+    if len(unique) < len(characters):
+        states = generate_unique_states(unique, grid_size, steps, rule, seed, max_attempts)
+        position = {char: i for i, char in enumerate(unique)}
+        return states[[position[char] for char in characters]]
+
+    grids, fixed = starting_grids(characters, grid_size, seed)
+    codes = np.array([ord(char) for char in characters], dtype=np.int64)
+    pending = np.flatnonzero(~fixed)
+
+    states = evolve_grids(grids, steps, rule)
+    index = {}
+    # Os predefinidos entram primeiro no índice, então nunca são trocados
+    candidates = np.concatenate((np.flatnonzero(fixed), pending))
+    for attempt in range(1, max_attempts + 1):
+        packed = np.packbits(states[candidates].reshape(len(candidates), -1), axis=1)
+        rejected = []
+        for i, block in zip(candidates, packed):
+            key = block.tobytes()
+            if key in index:
+                if fixed[i]:
+                    raise ValueError(f"os padrões predefinidos de {characters[index[key]]!r} e {characters[i]!r} colidem")
+                rejected.append(i)
+            else:
+                index[key] = i
+        if not rejected:
+            return states
+        candidates = np.array(rejected)
+        grids[candidates] = seed_patterns(codes[candidates], grid_size, seed, attempt)
+        states[candidates] = evolve_grids(grids[candidates], steps, rule)
+    raise ValueError(f"não foi possível gerar padrões distintos para {len(candidates)} caracteres")
+
+# Mapeamento de caracteres para padrões. É um dict (caractere -> string de 0 e 1) somente leitura, que guarda
+# o mapeamento inverso e o tamanho dos padrões, calculados uma vez só, para o decrypt_message reaproveitar.
+# O create_mapping devolve o mesmo objeto para a mesma configuração, então ele não pode ser alterado:
+# para editar, crie outro (CharacterMapping({**mapping, "z": padrão}, mapping.grid_size, mapping.steps, mapping.rule))
+class CharacterMapping(dict):
+    def __init__(self, items=(), grid_size=(10, 10), steps=10, rule=CONWAY_RULE):
+        super().__init__(items)
+        self.grid_size = tuple(grid_size)
+        self.steps = steps
+        self.rule = rule
+        # Caches derivados do conteúdo: inverso e versão empacotada
+        self._reverse = None
+        self._packed = None
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("CharacterMapping é somente leitura; crie outro mapeamento para alterar os padrões")
+
+    __setitem__ = __delitem__ = __ior__ = update = setdefault = pop = popitem = clear = _read_only
+
+    # pickle e copy recriam o mapeamento pelo construtor (o dict somente leitura não aceita __setitem__)
+    def __reduce__(self):
+        return (CharacterMapping, (dict(self), self.grid_size, self.steps, self.rule))
+
+    @property
+    def reverse(self):
+        if self._reverse is None:
+            self._reverse = {v: k for k, v in self.items()}
+        return self._reverse
+
+    @property
+    def chunk_size(self):
+        return self.grid_size[0] * self.grid_size[1]
+
+    # Versão empacotada (PackedMapping) usada no modo binário, também calculada uma vez só
+    @property
+    def packed(self):
+        if self._packed is None:
+            self._packed = PackedMapping.from_mapping(self)
+        return self._packed
+
+# Versão da geração dos mapeamentos. Entra na chave do cache (em memória e no nome do arquivo em disco):
+# aumente quando generate_unique_states mudar de um jeito que as grades iniciais não mostram
+MAPPING_VERSION = 2
+
+# Mapeamentos já calculados neste processo, indexados por mapping_key
+_mapping_cache = {}
+
+# Chave do cache: os parâmetros, a versão e um hash das grades iniciais de verdade. Editar PREDEFINED_PATTERNS ou
+# seed_patterns muda a chave, então um mapeamento antigo nunca é reaproveitado por engano
+def mapping_key(characters, grid_size=(10, 10), steps=10, rule=CONWAY_RULE, seed=0):
+    grids, _ = starting_grids(characters, grid_size, seed)
+    patterns = hashlib.sha1(np.packbits(grids.reshape(len(characters), -1), axis=1).tobytes()).hexdigest()
+    return (MAPPING_VERSION, tuple(characters), tuple(grid_size), steps, rule, seed, patterns)
+
+# Função para criar o mapeamento de caracteres para padrões do Jogo da Vida. Os caracteres de PREDEFINED_PATTERNS usam
+# os padrões predefinidos e os demais ganham um padrão gerado a partir de `seed`; o mapa é sempre injetivo (ver generate_unique_states).
+# O resultado fica guardado em memória e, se cache_dir for dado, também em disco (ver save_mapping), então o autômato só roda uma vez por configuração.
+def create_mapping(characters, steps=10, grid_size=(10, 10), rule=CONWAY_RULE, cache_dir=None, seed=0):
+    characters = list(characters)
+    key = mapping_key(characters, grid_size, steps, rule, seed)
+    if key in _mapping_cache:
+        return _mapping_cache[key]
+
+    path = None
+    if cache_dir is not None:
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        path = os.path.join(cache_dir, f"mapping-{digest}.cgol")
+    if path is not None and os.path.exists(path):
+        mapping = load_mapping(path)
+    else:
+        # Gera o padrão final de todos os caracteres de uma vez
+        states = generate_unique_states(characters, grid_size, steps, rule, seed)
+        text = (states.reshape(len(characters), -1) + ord('0')).tobytes().decode()
+        size = grid_size[0] * grid_size[1]
+        final_states = [text[i:i + size] for i in range(0, len(text), size)]
+        mapping = CharacterMapping(zip(characters, final_states), grid_size, steps, rule)
+        if path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            save_mapping(mapping, path)
+    _mapping_cache[key] = mapping
     return mapping
 
+# Mapeamento de todos os caracteres com código em `codes` (padrão: os 256 valores de um byte, para o modo binário)
+def create_full_mapping(codes=range(256), steps=10, grid_size=(10, 10), rule=CONWAY_RULE, cache_dir=None, seed=0):
+    return create_mapping([chr(code) for code in codes], steps, grid_size, rule, cache_dir, seed)
+
+# Formato binário do mapeamento em disco: cabeçalho, códigos dos caracteres (uint32) e padrões empacotados (8 células por byte)
+MAPPING_MAGIC = b"CGOLMAP1"
+MAPPING_HEADER = np.dtype([
+    ("magic", "S8"), ("count", "<i8"), ("rows", "<i8"), ("cols", "<i8"), ("steps", "<i8"), ("rule", "S16"),
+])
+
+# Salva o mapeamento no formato binário compacto
+def save_mapping(mapping, path):
+    header = np.zeros(1, dtype=MAPPING_HEADER)
+    header["magic"] = MAPPING_MAGIC
+    header["count"] = len(mapping)
+    header["rows"], header["cols"] = mapping.grid_size
+    header["steps"] = mapping.steps
+    header["rule"] = mapping.rule.encode()
+    codes = np.array([ord(char) for char in mapping], dtype="<u4")
+    cells = np.frombuffer("".join(mapping.values()).encode(), dtype=np.uint8) - ord("0")
+    packed = np.packbits(cells.reshape(len(mapping), -1), axis=1)
+    with open(path, "wb") as f:
+        header.tofile(f)
+        codes.tofile(f)
+        packed.tofile(f)
+
+# Lê um mapeamento salvo com save_mapping. Os arrays são mapeados em memória (np.memmap), sem ler o arquivo inteiro
+def load_mapping_arrays(path):
+    header = np.fromfile(path, dtype=MAPPING_HEADER, count=1)[0]
+    if header["magic"] != MAPPING_MAGIC:
+        raise ValueError(f"{path} não é um arquivo de mapeamento")
+    count, cells = int(header["count"]), int(header["rows"] * header["cols"])
+    codes = np.memmap(path, dtype="<u4", mode="r", offset=MAPPING_HEADER.itemsize, shape=(count,))
+    packed = np.memmap(
+        path, dtype=np.uint8, mode="r", offset=MAPPING_HEADER.itemsize + 4 * count, shape=(count, -(-cells // 8))
+    )
+    return header, codes, packed
+
+def load_mapping(path):
+    header, codes, packed = load_mapping_arrays(path)
+    cells = int(header["rows"] * header["cols"])
+    bits = np.unpackbits(packed, axis=1)[:, :cells] + ord("0")
+    patterns = [row.tobytes().decode() for row in bits]
+    return CharacterMapping(
+        zip((chr(code) for code in codes), patterns),
+        (int(header["rows"]), int(header["cols"])),
+        int(header["steps"]),
+        header["rule"].decode(),
+    )
+
 # Função para criptografar a mensagem usando o mapeamento
 def encrypt_message(message, mapping):
     return ''.join(mapping[char] for char in message if char in mapping)
 
 # Função para descriptografar a mensagem usando o mapeamento invertido
 def decrypt_message(encrypted_message, mapping):
-    reverse_mapping = {v: k for k, v in mapping.items()}  # Gera o mapeamento inverso
-    chunk_size = len(next(iter(mapping.values())))  # Obtém o tamanho de cada padrão
+    if isinstance(mapping, CharacterMapping):
+        # Mapeamento inverso e tamanho já calculados junto com o mapeamento
+        reverse_mapping = mapping.reverse
+        chunk_size = mapping.chunk_size
+    else:
+        reverse_mapping = {v: k for k, v in mapping.items()}  # Gera o mapeamento inverso
+        chunk_size = len(next(iter(mapping.values())))  # Obtém o tamanho de cada padrão
 
     #Quebra a mensagem em pedaços do tamanho de cada padrão, e usa o mapeamento inverso para obter a mensagem real
     return ''.join(reverse_mapping[encrypted_message[i:i+chunk_size]] 
                    for i in range(0, len(encrypted_message), chunk_size))
 
+# Modo binário: cada padrão é um bloco de bits empacotados (8 casas por byte) em vez de uma string de '0' e '1'.
+# A criptografia vira uma indexação da tabela pelos códigos dos caracteres e a descriptografia uma busca
+# em um array ordenado de chaves de 64 bits calculadas a partir de cada bloco.
+class PackedMapping:
+    def __init__(self, codes, table):
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self.table = np.asarray(table, dtype=np.uint8)  # (caracteres, bytes por bloco)
+        self.block_bytes = self.table.shape[1]
+        # Código do caractere -> linha da tabela (-1 quando o caractere não está no mapa)
+        self.index = np.full(int(self.codes.max()) + 1 if len(self.codes) else 0, -1, dtype=np.int64)
+        self.index[self.codes] = np.arange(len(self.codes))
+        keys = block_keys(self.table)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+        # Chaves repetidas vêm de padrões repetidos (o mapa não pode ser invertido) ou de colisões do hash de
+        # block_keys entre blocos diferentes; estes são procurados pelos bytes completos em `collisions`
+        same = np.flatnonzero(self.sorted_keys[1:] == self.sorted_keys[:-1])
+        rows = self.order[np.union1d(same, same + 1)]
+        self.collisions = {self.table[row].tobytes(): row for row in rows} if len(rows) else None
+        self.injective = len(self.collisions or ()) == len(rows)
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        codes = [ord(char) for char in mapping]
+        cells = np.frombuffer("".join(mapping.values()).encode(), dtype=np.uint8) - ord("0")
+        return cls(codes, np.packbits(cells.reshape(len(mapping), -1), axis=1))
+
+    # Lê direto um arquivo salvo com save_mapping, sem passar pelas strings
+    @classmethod
+    def load(cls, path):
+        _, codes, packed = load_mapping_arrays(path)
+        return cls(codes, packed)
+
+    # Recebe um array de códigos de caracteres e devolve os blocos concatenados (caracteres fora do mapa são ignorados)
+    def encrypt_codes(self, codes):
+        codes = np.asarray(codes, dtype=np.int64)
+        rows = np.full(len(codes), -1, dtype=np.int64)
+        known = codes < len(self.index)
+        rows[known] = self.index[codes[known]]
+        return self.table[rows[rows >= 0]].tobytes()
+
+    # Recebe os blocos concatenados e devolve o array de códigos dos caracteres
+    def decrypt_codes(self, data):
+        if not self.injective:
+            raise ValueError("o mapeamento tem padrões repetidos e não pode ser invertido")
+        blocks = np.frombuffer(data, dtype=np.uint8).reshape(-1, self.block_bytes)
+        keys = block_keys(blocks)
+        pos = np.minimum(np.searchsorted(self.sorted_keys, keys), len(self.sorted_keys) - 1)
+        rows = self.order[pos]
+        for i in np.flatnonzero(~(self.table[rows] == blocks).all(axis=1)):
+            # Chave de outro bloco (colisão do hash) ou bloco que não está no mapa
+            row = self.collisions.get(blocks[i].tobytes()) if self.collisions else None
+            if row is None:
+                raise ValueError("bloco não encontrado no mapeamento")
+            rows[i] = row
+        return self.codes[rows]
+
+# Chave de 64 bits de cada bloco: os bytes do bloco lidos como palavras uint64 e combinados (exata para blocos de até 8 bytes;
+# acima disso duas chaves iguais podem vir de blocos diferentes, e o PackedMapping confere os bytes nesses casos)
+def block_keys(blocks):
+    words = -(-blocks.shape[1] // 8)
+    padded = np.zeros((blocks.shape[0], 8 * words), dtype=np.uint8)
+    padded[:, :blocks.shape[1]] = blocks
+    values = padded.view("<u8")
+    keys = values[:, 0].astype(np.uint64)
+    for i in range(1, words):
+        keys = keys * np.uint64(0x9E3779B97F4A7C15) + values[:, i]
+    return keys
+
+# Criptografa uma string no modo binário, devolvendo bytes
+def encrypt_binary(message, mapping):
+    codes = np.frombuffer(message.encode("utf-32-le"), dtype="<u4")
+    return mapping.packed.encrypt_codes(codes)
+
+# Descriptografa bytes gerados por encrypt_binary
+def decrypt_binary(ciphertext, mapping):
+    codes = mapping.packed.decrypt_codes(ciphertext)
+    return codes.astype("<u4").tobytes().decode("utf-32-le")
+
+# PackedMapping usado pelos fluxos binários, em que cada caractere é um byte: caracteres de código acima de 255
+# não caberiam na saída do decrypt_stream (nem podem vir da entrada do encrypt_stream), então são recusados
+def _byte_mapping(mapping):
+    packed = mapping.packed if isinstance(mapping, CharacterMapping) else mapping
+    if len(packed.codes) and packed.codes.max() > 255:
+        raise ValueError("o modo de fluxo usa 1 byte por caractere; o alfabeto tem caracteres de código acima de 255")
+    return packed
+
+# Criptografa um arquivo binário (cada byte é um caractere de código 0 a 255) lendo aos pedaços,
+# então a memória usada não depende do tamanho da entrada
+def encrypt_stream(src, dst, mapping, chunk_size=1 << 16):
+    packed = _byte_mapping(mapping)
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            break
+        dst.write(packed.encrypt_codes(np.frombuffer(chunk, dtype=np.uint8)))
+
+# Descriptografa um arquivo gerado por encrypt_stream, lendo blocos inteiros de cada vez
+def decrypt_stream(src, dst, mapping, chunk_size=1 << 16):
+    packed = _byte_mapping(mapping)
+    read_size = chunk_size * packed.block_bytes
+    while True:
+        chunk = src.read(read_size)
+        if not chunk:
+            break
+        while len(chunk) % packed.block_bytes:
+            more = src.read(packed.block_bytes - len(chunk) % packed.block_bytes)
+            if not more:
+                raise ValueError("arquivo criptografado truncado")
+            chunk += more
+        dst.write(packed.decrypt_codes(chunk).astype(np.uint8).tobytes())
+
 # Exemplo de uso simples
 
-if __name__ == "__main__":
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Uso em linha de comando: python conwaycrypt-muitobasico.py encrypt|decrypt < entrada > saida
+    parser = argparse.ArgumentParser(description="Criptografia com o Jogo da Vida em modo binário (stdin -> stdout)")
+    parser.add_argument("mode", choices=["encrypt", "decrypt"])
+    parser.add_argument("--characters", default=None, help="Padrão: todos os 256 valores de byte")
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--grid-size", type=int, nargs=2, default=(10, 10))
+    parser.add_argument("--cache-dir", default=None)
+    args = parser.parse_args()
+    if args.characters is None:
+        mapping = create_full_mapping(steps=args.steps, grid_size=tuple(args.grid_size), cache_dir=args.cache_dir)
+    else:
+        mapping = create_mapping(list(args.characters), args.steps, tuple(args.grid_size), cache_dir=args.cache_dir)
+    stream = encrypt_stream if args.mode == "encrypt" else decrypt_stream
+    stream(sys.stdin.buffer, sys.stdout.buffer, mapping)
+
+elif __name__ == "__main__":
     characters = list("abcdef")  # Lista de caracteres a serem criptografados
     steps = 10  # Número de passos para evoluir o Jogo da Vida (padrão)
     grid_size = (10, 10)  # Tamanho da grade (padrão)
@@ -0,0 +1,174 @@
+# Execução de ensembles (Monte Carlo) do model_probabilistico: várias réplicas de cada conjunto de parâmetros,
+# distribuídas em um pool de processos. Cada job (conjunto de parâmetros, réplica) tem a própria semente,
+# derivada de (base_seed, índice do conjunto, réplica), então o resultado não depende da ordem nem do número de processos.
+# Os resultados são gravados aos poucos em arquivos colunares (.npz) na pasta de saída, e uma execução
+# interrompida continua de onde parou.
+
+import glob
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from model_probabilistico import GameOfLifeModel
+
+COLUMNS = ("param_index", "replica", "step", "alive_count", "alive_fraction")
+
+
+def parameter_grid(grid):
+    """
+    Produto cartesiano de um dicionário {parâmetro: lista de valores}, como
+    lista de dicionários de parâmetros do GameOfLifeModel.
+
+        parameter_grid({"lamb": [10, 100], "age_death": [True, False]})
+    """
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def run_job(job):
+    """
+    Roda uma réplica e devolve as colunas da série temporal. Executado nos processos do pool.
+    """
+    param_index, replica, params, model_kwargs, steps, base_seed = job
+    # Inteiro derivado de (base_seed, conjunto, réplica); o Model do mesa só aceita sementes simples
+    seed = int(np.random.SeedSequence([base_seed, param_index, replica]).generate_state(1, np.uint64)[0])
+    model = GameOfLifeModel(**model_kwargs, **params, engine="vectorized", seed=seed)
+
+    alive_count = np.empty(steps + 1, dtype=np.int64)
+    alive_count[0] = np.sum(model.cell_layer.data)
+    for step in range(1, steps + 1):
+        model.step()
+        alive_count[step] = model.alive_count
+    return {
+        "param_index": np.full(steps + 1, param_index, dtype=np.int32),
+        "replica": np.full(steps + 1, replica, dtype=np.int32),
+        "step": np.arange(steps + 1, dtype=np.int32),
+        "alive_count": alive_count,
+        "alive_fraction": alive_count / model.cells,
+    }
+
+
+def run_ensemble(
+    param_sets,
+    replicas,
+    steps,
+    output_dir,
+    base_seed=0,
+    model_kwargs=None,
+    workers=None,
+    flush_every=32,
+):
+    """
+    Roda `replicas` réplicas de cada conjunto de parâmetros em `param_sets`
+    por `steps` passos e grava os resultados em `output_dir`.
+
+    Args:
+        param_sets (list): Lista de dicionários de parâmetros (por exemplo de `parameter_grid`).
+        replicas (int): Número de réplicas (sementes) por conjunto.
+        steps (int): Número de passos de cada réplica.
+        output_dir (str): Pasta de saída. Se já tiver resultados do mesmo ensemble, os jobs prontos são pulados.
+        base_seed (int): Semente base do ensemble.
+        model_kwargs (dict): Parâmetros comuns a todos os jobs (width, height, alive_fraction...).
+        workers (int): Número de processos. Padrão: número de núcleos.
+        flush_every (int): Quantos jobs terminados são juntados em cada arquivo.
+    """
+    model_kwargs = dict(model_kwargs or {})
+    os.makedirs(output_dir, exist_ok=True)
+    _check_manifest(output_dir, {
+        "param_sets": param_sets,
+        "replicas": replicas,
+        "steps": steps,
+        "base_seed": base_seed,
+        "model_kwargs": model_kwargs,
+    })
+
+    done = completed_jobs(output_dir)
+    jobs = [
+        (param_index, replica, params, model_kwargs, steps, base_seed)
+        for param_index, params in enumerate(param_sets)
+        for replica in range(replicas)
+        if (param_index, replica) not in done
+    ]
+    # Numeração dos novos arquivos continua depois do último existente
+    parts = glob.glob(os.path.join(output_dir, "part-*.npz"))
+    part = max((int(os.path.basename(path)[5:10]) for path in parts), default=-1) + 1
+    pending = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_job, job) for job in jobs]
+        for future in as_completed(futures):
+            pending.append(future.result())
+            if len(pending) >= flush_every:
+                _write_part(output_dir, part, pending)
+                part += 1
+                pending = []
+    if pending:
+        _write_part(output_dir, part, pending)
+
+
+def _check_manifest(output_dir, manifest):
+    # O manifesto descreve o ensemble; retomar com outros parâmetros misturaria resultados diferentes
+    path = os.path.join(output_dir, "manifest.json")
+    manifest = json.loads(json.dumps(manifest, sort_keys=True))
+    if os.path.exists(path):
+        with open(path) as f:
+            if json.load(f) != manifest:
+                raise ValueError(f"{output_dir} já tem resultados de um ensemble com outros parâmetros")
+    else:
+        with open(path, "w") as f:
+            json.dump(manifest, f, sort_keys=True, indent=1)
+
+
+def _write_part(output_dir, part, results):
+    # Grava em um arquivo temporário e renomeia, então um arquivo part-*.npz nunca fica pela metade
+    columns = {name: np.concatenate([result[name] for result in results]) for name in COLUMNS}
+    path = os.path.join(output_dir, f"part-{part:05d}.npz")
+    with open(path + ".tmp", "wb") as f:
+        np.savez(f, **columns)
+    os.replace(path + ".tmp", path)
+
+
+def completed_jobs(output_dir):
+    """
+    Conjunto de (índice do conjunto de parâmetros, réplica) já gravados em `output_dir`.
+    """
+    done = set()
+    for path in sorted(glob.glob(os.path.join(output_dir, "part-*.npz"))):
+        with np.load(path) as data:
+            done.update(zip(data["param_index"].tolist(), data["replica"].tolist()))
+    return done
+
+
+def load_ensemble(output_dir):
+    """
+    Lê todos os resultados de `output_dir` em um DataFrame, com uma linha por
+    (conjunto de parâmetros, réplica, passo) e uma coluna por parâmetro.
+    """
+    parts = []
+    for path in sorted(glob.glob(os.path.join(output_dir, "part-*.npz"))):
+        with np.load(path) as data:
+            parts.append(pd.DataFrame({name: data[name] for name in COLUMNS}))
+    results = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=COLUMNS)
+
+    with open(os.path.join(output_dir, "manifest.json")) as f:
+        param_sets = json.load(f)["param_sets"]
+    params = pd.DataFrame(param_sets)
+    params["param_index"] = np.arange(len(param_sets), dtype=np.int32)
+    return results.merge(params, on="param_index", how="left")
+
+
+if __name__ == "__main__":
+    param_sets = parameter_grid({
+        "revive_probabilities": [{3: 1.0}, {3: 0.9, 6: 0.1}],
+        "survive_probabilities": [{2: 1.0, 3: 1.0}],
+        "lamb": [10, 100, 1000],
+        "age_death": [True, False],
+    })
+    run_ensemble(param_sets, replicas=20, steps=200, output_dir="ensemble_output",
+                 model_kwargs={"width": 50, "height": 50})
+    results = load_ensemble("ensemble_output")
+    final = results[results["step"] == results["step"].max()]
+    print(final.groupby(["lamb", "age_death"])["alive_fraction"].describe())
@@ -1,9 +1,29 @@
+import numbers
+import os
+import sys
+
 import numpy as np
 from mesa import Model
-from mesa.datacollection import DataCollector
 from mesa.space import PropertyLayer
 from scipy.signal import convolve2d
-from scipy.stats import expon
+
+# Módulos compartilhados entre os modelos ficam na pasta shared/ na raiz do repositório
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "shared"))
+import hazard
+import sparse
+from metrics import MetricsCollector, PopulationCounter
+
+
+def mesa_seed(seed):
+    """
+    Semente aceita pelo Model do mesa (random.Random): int, str ou None. Outras
+    sementes do numpy (Generator, SeedSequence, BitGenerator) viram None.
+    """
+    if isinstance(seed, numbers.Integral) and not isinstance(seed, bool):
+        return int(seed)
+    if seed is None or isinstance(seed, str):
+        return seed
+    return None
 
 
 class GameOfLifeModel(
@@ -18,8 +38,24 @@ class GameOfLifeModel(
         alive_fraction=0.2,
         lamb=1000,
         age_death=True,
+        engine="loop",
+        seed=None,
+        lifetime=None,
     ):
-        super().__init__()
+        # Gerador de números aleatórios da grade inicial e dos dois motores. `seed` pode ser qualquer semente do
+        # numpy, inclusive um np.random.Generator já pronto (por exemplo com o Rule30BitGenerator), usado direto
+        rng = np.random.default_rng(seed)
+        # O Model do mesa (self.random) só aceita sementes simples; nos outros casos a semente dele sai do gerador
+        simple_seed = mesa_seed(seed)
+        if simple_seed is None and seed is not None:
+            simple_seed = int(rng.integers(2**63))
+        super().__init__(seed=simple_seed)
+        self.reset_randomizer(simple_seed)
+        self.rng = rng
+        # Motor usado no step: "loop" (célula por célula) ou "vectorized" (grade inteira com numpy)
+        if engine not in ("loop", "vectorized"):
+            raise ValueError(f"engine desconhecido: {engine!r}")
+        self.engine = engine
         # Adicionei o parametro lambida da distibuição de probabilidade
         # Determina se a morte por idade está habilitado
         self.age_death = age_death
@@ -27,7 +63,7 @@ class GameOfLifeModel(
         self.cell_layer = PropertyLayer("cells", width, height, False, dtype=bool)
         # Defino a idade de cada celula
         self.age_layer = PropertyLayer("ages", width, height, 0, dtype=int)
-        self.cell_layer.data = np.random.choice(
+        self.cell_layer.data = self.rng.choice(
             [True, False], size=(width, height), p=[alive_fraction, 1 - alive_fraction]
         )
 
@@ -43,12 +79,16 @@ class GameOfLifeModel(
 
         # Parametro lambida
         self.lamb = lamb
+        # Tabela de morte por idade (hazard.HazardTable). Se não for dada, usa a exponencial com o lambida
+        self.lifetime = lifetime
 
         # Metrics and datacollector
         self.cells = width * height
+        # Número de células mortas e vivas; os engines informam o total de vivas que já contam no passo
+        self.population = PopulationCounter(self.cell_layer.data)
         self.alive_count = 0
         self.alive_fraction = 0
-        self.datacollector = DataCollector(
+        self.datacollector = MetricsCollector(
             model_reporters={
                 "Cells alive": "alive_count",
                 "Fraction alive": "alive_fraction",
@@ -56,6 +96,12 @@ class GameOfLifeModel(
         )
         self.datacollector.collect(self)
 
+    def __new__(cls, *args, seed=None, **kwargs):
+        # O mesa 2.x cria self.random já no Model.__new__, com o `seed` da chamada; no mesa 3 não há __new__ próprio
+        if Model.__new__ is object.__new__:
+            return super().__new__(cls)
+        return super().__new__(cls, *args, seed=mesa_seed(seed), **kwargs)
+
     def step(self):
         # Define a kernel for counting neighbors
         kernel = np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]])
@@ -65,26 +111,57 @@ class GameOfLifeModel(
             self.cell_layer.data, kernel, mode="same", boundary="wrap"
         )
 
+        if self.engine == "vectorized":
+            alive = self._step_vectorized(neighbor_count)
+        else:
+            alive = self._step_loop(neighbor_count)
+
+        # Update metrics
+        self.population.set(1, alive)
+        self.alive_count = self.population[1]
+        self.alive_fraction = self.population.fraction(1)
+        self.datacollector.collect(self)
+
+    # Chamado por checkpoint.load_checkpoint depois de restaurar a grade
+    def on_restore(self):
+        self.population.recount(self.cell_layer.data)
+        self.alive_count = self.population[1]
+        self.alive_fraction = self.population.fraction(1)
+
+    def hazard_table(self):
+        """
+        Retorna a tabela de probabilidade de morte por idade usada no passo.
+        """
+        if self.lifetime is not None:
+            return self.lifetime
+        return hazard.exponential(self.lamb)
+
+    def _step_loop(self, neighbor_count):
+        # Probabilidade de morte por idade de todas as células, consultada na tabela pré-calculada
+        if self.age_death:
+            morte_probs = self.hazard_table().lookup(self.age_layer.data)
+
         # Apply custom probabilistic rules for each cell
         new_state = np.zeros_like(self.cell_layer.data, dtype=bool)
+        vivas = 0
         for x in range(self.cell_layer.data.shape[0]):
             for y in range(self.cell_layer.data.shape[1]):
                 alive = self.cell_layer.data[x, y]
                 neighbors = neighbor_count[x, y]
-                idade = self.age_layer.data[x, y]
                 if alive:
                     # Apply survival probability if the cell is alive
                     survival_prob = self.survive_probabilities.get(neighbors, 0)
                     # probabilidade de morte (quanto maior o lambida, menor vai ser com o tempo)
                     morte_prob = 0
                     if self.age_death:
-                        morte_prob = expon.cdf(idade, scale=self.lamb)
+                        morte_prob = morte_probs[x, y]
                     # Retorna se conseguiu ou não sobreviver
-                    viva = np.random.rand() < survival_prob
+                    viva = self.rng.random() < survival_prob
                     # Retorna se morreu ou não
-                    morta = np.random.rand() < morte_prob
+                    morta = self.rng.random() < morte_prob
                     if viva and not morta:
                         new_state[x, y] = True
+                        vivas += 1
                     else:
                         new_state[x, y] = False
                     # Altera a idade
@@ -95,11 +172,135 @@ class GameOfLifeModel(
                 else:
                     # Apply revival probability if the cell is dead
                     revival_prob = self.revive_probabilities.get(neighbors, 0)
-                    new_state[x, y] = np.random.rand() < revival_prob
+                    new_state[x, y] = self.rng.random() < revival_prob
+                    vivas += new_state[x, y]
 
         self.cell_layer.data = new_state
+        return int(vivas)
 
-        # Update metrics
-        self.alive_count = np.sum(self.cell_layer.data)
+    def _step_vectorized(self, neighbor_count):
+        self.cell_layer.data = probabilistic_update(
+            self.cell_layer.data,
+            self.age_layer.data,
+            neighbor_count,
+            self.survive_probabilities,
+            self.revive_probabilities,
+            self.hazard_table() if self.age_death else None,
+            self.rng,
+        )
+        return np.count_nonzero(self.cell_layer.data)
+
+
+class ReplicaGameOfLifeModel:
+    """
+    N réplicas independentes do GameOfLifeModel (mesmos parâmetros, sorteios
+    diferentes) guardadas em um único array (N, width, height). Cada passo
+    conta os vizinhos de todas as réplicas de uma vez e faz um único sorteio
+    em lote, então o custo do Python é dividido entre as réplicas. Com as
+    probabilidades padrão e sem morte por idade é o Jogo da Vida determinístico.
+
+    As métricas por réplica (`alive_count`, `alive_fraction`) são arrays de
+    tamanho N, calculados com reduções nos eixos da grade.
+
+    Args:
+        replicas (int): Número de réplicas N.
+        seed (int): Semente do gerador usado na grade inicial e nos passos.
+        Os demais argumentos são os mesmos do GameOfLifeModel.
+    """
+
+    def __init__(
+        self,
+        replicas=100,
+        width=10,
+        height=10,
+        revive_probabilities=None,
+        survive_probabilities=None,
+        alive_fraction=0.2,
+        lamb=1000,
+        age_death=True,
+        seed=None,
+        lifetime=None,
+    ):
+        self.rng = np.random.default_rng(seed)
+        self.replicas = replicas
+        self.age_death = age_death
+        self.cells_data = self.rng.random((replicas, width, height)) < alive_fraction
+        self.ages = np.zeros((replicas, width, height), dtype=int)
+        self.revive_probabilities = (
+            revive_probabilities if revive_probabilities is not None else {3: 1.0}
+        )
+        self.survive_probabilities = (
+            survive_probabilities
+            if survive_probabilities is not None
+            else {2: 1.0, 3: 1.0}
+        )
+        self.lamb = lamb
+        self.lifetime = lifetime
+        self.cells = width * height
+        self.steps = 0
+        self._update_metrics()
+
+    # Mesma tabela de morte por idade do GameOfLifeModel
+    hazard_table = GameOfLifeModel.hazard_table
+
+    def step(self):
+        # Contagem de vizinhos de todas as réplicas: borda com wrap e soma de fatias em uint8
+        padded = np.pad(self.cells_data.view(np.uint8), ((0, 0), (1, 1), (1, 1)), mode="wrap")
+        neighbor_count = sparse.neighbor_sum(padded, sparse.MOORE)
+
+        self.cells_data = probabilistic_update(
+            self.cells_data,
+            self.ages,
+            neighbor_count,
+            self.survive_probabilities,
+            self.revive_probabilities,
+            self.hazard_table() if self.age_death else None,
+            self.rng,
+        )
+        self.steps += 1
+        self._update_metrics()
+
+    def _update_metrics(self):
+        self.alive_count = self.cells_data.sum(axis=(1, 2))
         self.alive_fraction = self.alive_count / self.cells
-        self.datacollector.collect(self)
+
+
+def probabilistic_update(alive, ages, neighbor_count, survive_probabilities, revive_probabilities, lifetime, rng):
+    """
+    Um passo das regras probabilísticas sobre arrays de qualquer formato (uma
+    grade ou uma pilha de réplicas). `ages` é atualizado no próprio array e a
+    nova grade é retornada. `lifetime` é a HazardTable da morte por idade, ou
+    None para desligá-la.
+    """
+    # Tabelas de consulta: probabilidade indexada pelo número de vizinhos (0 a 8).
+    # São reconstruídas a cada passo porque os dicionários podem ser alterados durante a execução
+    survive_table = probability_table(survive_probabilities)
+    revive_table = probability_table(revive_probabilities)
+
+    # Todos os números aleatórios do passo são sorteados de uma vez
+    draws = rng.random((2,) + alive.shape)
+
+    # Células vivas: sobrevivem pela vizinhança e não morrem pela idade
+    survived = alive & (draws[0] < survive_table[neighbor_count])
+    if lifetime is not None:
+        survived &= draws[1] >= lifetime.lookup(ages)
+    # Células mortas: revivem pela vizinhança
+    revived = ~alive & (draws[0] < revive_table[neighbor_count])
+
+    # Atualiza a idade no próprio array: sobreviventes envelhecem, as que morreram zeram
+    ages += survived
+    ages[alive & ~survived] = 0
+
+    return survived | revived
+
+
+def probability_table(probabilities):
+    """
+    Converte um dicionário {número de vizinhos: probabilidade} em um array
+    indexado pelo número de vizinhos (0 a 8). Vizinhanças ausentes valem 0.
+    """
+    table = np.zeros(9)
+    for neighbors, prob in probabilities.items():
+        if 0 <= neighbors <= 8:
+            table[neighbors] = prob
+    return table
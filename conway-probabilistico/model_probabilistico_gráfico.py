@@ -6,20 +6,25 @@
 # Ps: deve dar pra fazer alguma coisa parecida na parte das presas e tal pra extrair e vizualizar os dados (as vezes mantendo informações diferentes das daqui), mas honestamente
 # eu (Pedro) ainda não li os códigos dessa parte.
 
+# Atualização: o gráfico agora é desenhado dentro da própria janela do pygame (MetricsPanel, em shared/render.py),
+# sem matplotlib, então não trava nem fecha a janela do jogo e só avança quando o jogo dá um passo.
+
 
 # The previous default libraries 
+import os
+import sys
 import numpy as np
 import pygame
 from mesa import Model
-from mesa.datacollection import DataCollector
 from mesa.space import PropertyLayer
 from scipy.signal import convolve2d
 from scipy.stats import expon
 
-# For the evolution graph ploting
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from threading import Thread
+# Coletor de métricas compartilhado (pasta shared/ na raiz do repositório)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "shared"))
+from metrics import MetricsCollector
+# For the evolution graph ploting (desenhado na janela do pygame)
+from render import MetricsPanel
 
 
 class GameOfLifeModel(
@@ -64,7 +69,7 @@ class GameOfLifeModel(
         self.cells = width * height
         self.alive_count = 0
         self.alive_fraction = 0
-        self.datacollector = DataCollector(
+        self.datacollector = MetricsCollector(
             model_reporters={
                 "Cells alive": "alive_count",
                 "Fraction alive": "alive_fraction",
@@ -83,6 +88,7 @@ class GameOfLifeModel(
 
         # Apply custom probabilistic rules for each cell
         new_state = np.zeros_like(self.cell_layer.data, dtype=bool)
+        vivas = 0  # Células vivas no novo estado, contadas no próprio laço
         for x in range(self.cell_layer.data.shape[0]):
             for y in range(self.cell_layer.data.shape[1]):
                 alive = self.cell_layer.data[x, y]
@@ -101,6 +107,7 @@ class GameOfLifeModel(
                     morta = np.random.rand() < morte_prob
                     if viva and not morta:
                         new_state[x, y] = True
+                        vivas += 1
                     else:
                         new_state[x, y] = False
                     # Altera a idade
@@ -112,11 +119,12 @@ class GameOfLifeModel(
                     # Apply revival probability if the cell is dead
                     revival_prob = self.revive_probabilities.get(neighbors, 0)
                     new_state[x, y] = np.random.rand() < revival_prob
+                    vivas += new_state[x, y]
 
         self.cell_layer.data = new_state
 
         # Update metrics
-        self.alive_count = np.sum(self.cell_layer.data)
+        self.alive_count = int(vivas)
         self.alive_fraction = self.alive_count / self.cells
         self.datacollector.collect(self)
 
@@ -136,7 +144,12 @@ def run_GameOfLifeModel(
     graph=False
 ):
     pygame.init()
-    screen = pygame.display.set_mode((width * cell_size, height * cell_size + 100))  # Mais espaço para a barra de velocidade
+    # O gráfico fica entre o slider e o status de pausa; em janelas estreitas (menos de 100 px livres ali)
+    # ele ganha uma faixa própria abaixo dos controles
+    graph_width = width * cell_size - 340 - 130
+    graph_below = graph and graph_width < 100
+    extra_height = 100 if graph_below else 0
+    screen = pygame.display.set_mode((width * cell_size, height * cell_size + 100 + extra_height))  # Mais espaço para a barra de velocidade
     clock = pygame.time.Clock()
 
     model = GameOfLifeModel(
@@ -147,42 +160,14 @@ def run_GameOfLifeModel(
     dragging = False
 
     # Graph setup. Se graph == False, o código funciona exatamente como antes da modificação
+    # O gráfico guarda as últimas 4096 proporções
     if graph:
-        proportions = []  # Para armazenar as proporções de cada passo
-        fig, ax = plt.subplots()
-        x_data, y_data = [], []
-        line, = ax.plot([], [], lw=2)
-
-        def init_plot():
-            ax.set_xlim(0, 100)  # Range inicial do eixo x
-            ax.set_ylim(0, 1)  # Proporção de células vivas entre 0 e 1
-            ax.set_title("Fraction of Alive Cells Over Time")
-            ax.set_xlabel("Steps")
-            ax.set_ylabel("Fraction Alive")
-            return line,
-
-        def update_plot(frame):
-            if len(proportions) > 0:
-                x_data.append(frame)
-                y_data.append(proportions[-1])
-                line.set_data(x_data, y_data)
-
-                # Ajustar dinamicamente o range do eixo y
-                max_y = max(y_data)
-                y_limit = min(1, 1.5 * max_y)
-                ax.set_ylim(0, y_limit)
-
-                ax.set_xlim(0, len(proportions))  # Ajustar dinamicamente o eixo x
-            return line,
-
-        ani = FuncAnimation(fig, update_plot, init_func=init_plot, interval=100)
-
-        def show_graph():
-            plt.show()
-
-        # Para rodar o gráfico e o game em threads separados. É uma tentativa de resolver os bugs mencionados no começo, sobre fechar subitamente o game mexendo no grafico etc. Melhorou mas ainda não está funcionando muito bem
-        graph_thread = Thread(target=show_graph)
-        graph_thread.start()
+        if graph_below:
+            graph_rect = pygame.Rect(10, height * cell_size + 105, max(width * cell_size - 20, 100), 90)
+        else:
+            graph_rect = pygame.Rect(340, height * cell_size + 5, graph_width, 90)
+        panel = MetricsPanel(graph_rect, capacity=4096, title="Fraction alive")
+        panel.append(0, np.count_nonzero(model.cell_layer.data) / model.cells)
 
     # Cores
     empty_color = colors["empty"]
@@ -297,20 +282,17 @@ def run_GameOfLifeModel(
         alive_count_text = font.render(f"Vivas: {model.alive_count}", True, (255, 255, 255))
         screen.blit(alive_count_text, (10, 10))
 
+        # Gráfico da fração de células vivas (só é redesenhado quando há um passo novo)
+        if graph:
+            panel.draw(screen)
+
         pygame.display.flip()
 
         if not paused:
             model.step()
             if graph:
-                proportions.append(model.alive_fraction)
                 frame_count += 1
-        
-        if graph:
-            plt.pause(0.001)  # Permite o gráfico atualizar dinamicamente
-    
-
-    if graph:
-        plt.show()
+                panel.append(frame_count, model.alive_fraction)
 
 
     pygame.quit()
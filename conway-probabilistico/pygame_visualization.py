@@ -1,5 +1,9 @@
+import sys
 import pygame
 from model_probabilistico import GameOfLifeModel # Modelo do jogo
+from trajectory import ReplayModel # Replay de trajetórias gravadas (pasta shared/)
+from render import GridRenderer, age_indices, age_palette, init_display # Desenho da grade com numpy (pasta shared/)
+from simulation import Simulation, SimulationThread # Simulação separada do desenho (pasta shared/)
 import numpy as np
 
 def run_GameOfLifeModel(
@@ -11,7 +15,12 @@ def run_GameOfLifeModel(
     initial_config=None,
     colors={"empty": (0, 0, 0), "filled": (255, 255, 255)},
     alive_fraction = 0.2,
-    tick=20 
+    tick=20,
+    replay=None,
+    headless=False,
+    max_frames=None,
+    fps=60,
+    steps_per_frame=None
 ):
     """
     Função principal para executar o jogo da vida probabilístico.
@@ -28,6 +37,13 @@ def run_GameOfLifeModel(
         colors (dict): Cores para células vivas e mortas.
         alive_fraction (float): Fração inicial de células vivas.
         tick (int): Velocidade inicial da simulação.
+        replay (str, optional): Arquivo de trajetória (gravado com trajectory.record_model, com as camadas
+            cell_layer e age_layer) para tocar no lugar do modelo.
+        headless (bool): Roda sem janela (driver "dummy" do SDL), para medir desempenho.
+        max_frames (int, optional): Encerra depois desse número de quadros.
+        fps (int): Quadros por segundo do desenho, independente da velocidade da simulação.
+        steps_per_frame (int, optional): Roda esse número de passos a cada quadro, sem thread. Padrão: o
+            modelo roda em uma thread própria, na velocidade do slider (passos por segundo).
     """
 
     # Definição de cores para células e botões
@@ -35,25 +51,24 @@ def run_GameOfLifeModel(
     filled_color = colors["filled"]
     button_color = (200, 200, 200)
     button_hover_color = (150, 150, 150)
+    # Cores das células: mortas e rampa de idade das vivas (ciano -> vermelho)
+    palette = age_palette(empty_color)
+    # Estado do modelo lido pelo desenho a cada quadro
+    layers, values = ("cell_layer", "age_layer"), ("alive_count",)
 
     def initialize_pygame(cell_size):
         """
         Inicializa o Pygame em modo tela cheia e configura o relógio.
         Calcula o número de células baseado na resolução da tela.
         """
-        pygame.init()
-
-        # Obtém informações da tela
-        display_info = pygame.display.Info()
-        screen_width = display_info.current_w  # Largura da tela em pixels
-        screen_height = display_info.current_h  # Altura da tela em pixels
+        # Configura a tela em modo tela cheia (tamanho (0, 0) = resolução da tela)
+        screen = init_display(headless=headless)
+        screen_width, screen_height = screen.get_size()
 
         # Ajusta a largura e comprimento
         width = (screen_width) // cell_size
         height = (screen_height - 100) // cell_size  # Subtraímos 100 pixels para os controles
 
-        # Configura a tela em modo tela cheia
-        screen = pygame.display.set_mode((screen_width, screen_height))
         clock = pygame.time.Clock()
 
         return screen, clock, width, height
@@ -84,8 +99,19 @@ def run_GameOfLifeModel(
         }
         return sliders
 
+    def steps_per_second(value):
+        """
+        Velocidade da simulação para a posição do slider (de 0 a 1): 0 pausa, o
+        fim do slider roda sem limite e o resto vai de 2 a 20000 passos por segundo.
+        """
+        if value == 0:
+            return 0
+        if value >= 1:
+            return None
+        return round(2 * 10 ** (4 * value))
+
     def handle_events(
-        model, width, height, cell_size, clear_button_rect, random_button_rect, exit_button_rect,
+        simulation, width, height, cell_size, clear_button_rect, random_button_rect, exit_button_rect,
         sliders, paused, dragging_slider
     ):
         """
@@ -102,11 +128,13 @@ def run_GameOfLifeModel(
 
                 # Botões
                 if clear_button_rect.collidepoint(mouse_x, mouse_y):
-                    model.cell_layer.data = np.zeros((width, height), dtype=bool)
+                    with simulation.edit() as model:
+                        model.cell_layer.data = np.zeros((width, height), dtype=bool)
                 elif random_button_rect.collidepoint(mouse_x, mouse_y):
                     slider3 = sliders['slider3']
                     alive_fraction = slider3['pos']/200
-                    model.cell_layer.data = np.random.rand(width, height) <= alive_fraction
+                    with simulation.edit() as model:
+                        model.cell_layer.data = np.random.rand(width, height) <= alive_fraction
                 elif exit_button_rect.collidepoint(mouse_x, mouse_y):  
                     running = False
 
@@ -140,26 +168,13 @@ def run_GameOfLifeModel(
         slider_values = {key: slider["pos"] / 200 for key, slider in sliders.items()}
         return running, paused, dragging_slider, slider_values
         
-    def draw_cells(screen, model, cell_size, width, height, empty_color):
+    def draw_cells(screen, state, renderer):
         """
-        Renderiza as células com base no estado do modelo.
+        Renderiza as células com base no estado do modelo: a cor de cada célula
+        sai da paleta (morta ou idade da viva) e só os blocos que mudaram são
+        redesenhados. Retorna os retângulos alterados.
         """
-        for x in range(width):
-            for y in range(height):
-                if model.cell_layer.data[x][y]:
-                    age = model.age_layer.data[x][y]
-                    red_intensity = min(255, max(0, age * 5))
-                    green_intensity = max(0, 255 - age * 5)
-                    blue_intensity = max(0, 255 - age * 5)
-                    cell_color = (red_intensity, green_intensity, blue_intensity)
-                else:
-                    cell_color = empty_color
-
-                pygame.draw.rect(
-                    screen,
-                    cell_color,
-                    (x * cell_size, y * cell_size, cell_size, cell_size)
-                )
+        return renderer.render(screen, age_indices(state.cell_layer, state.age_layer, palette))
 
     def draw_button(screen, rect, text, font, mouse_pos, color, hover_color):
         """
@@ -173,12 +188,15 @@ def run_GameOfLifeModel(
         button_text = font.render(text, True, (0, 0, 0))
         screen.blit(button_text, (rect.x + 15, rect.y + 5))
 
-    def render_game(screen, model, cell_size, width, height, empty_color):
+    def render_game(screen, state, renderer, panel_rect):
         """
-        Renderiza o estado atual do jogo na tela.
+        Renderiza o estado atual do jogo na tela: as células que mudaram e o
+        painel de controles (limpo a cada quadro). Retorna os retângulos alterados.
         """
-        screen.fill((0, 0, 0))  # Limpa a tela
-        draw_cells(screen, model, cell_size, width, height, empty_color)
+        rects = draw_cells(screen, state, renderer)
+        screen.fill((0, 0, 0), panel_rect)
+        rects.append(panel_rect)
+        return rects
 
     def render_buttons(screen, font, mouse_pos, clear_button_rect, random_button_rect, exit_button_rect, button_color, button_hover_color):
         """
@@ -205,10 +223,10 @@ def run_GameOfLifeModel(
             label = font.render(slider["label"], True, (255, 255, 255))
             screen.blit(label, (slider["rect"].x, slider["rect"].y - 20))
 
-        # Valor do slider (de 0 a 50) para a velocidade
+        # Valor do slider (passos por segundo) para a velocidade
         slider1 = sliders['slider1']
-        value = int(slider1["pos"] / 200 * 50)  # Escala o valor de 0 a 50
-        value_text = font.render(f"{value:.1f}", True, (255, 255, 255))
+        value = steps_per_second(slider1["pos"] / 200)
+        value_text = font.render("max" if value is None else f"{value}/s", True, (255, 255, 255))
         screen.blit(value_text, (slider1["rect"].x + slider1["rect"].width + 10, slider1["rect"].y))
         # Valor do slider (de 0% a 0.02%) para o respawn
         slider2 = sliders['slider2']
@@ -240,31 +258,43 @@ def run_GameOfLifeModel(
         screen_height = display_info.current_h  # Altura da tela em pixels
         screen.blit(pause_surface, (screen_width - 120, screen_height - 80))
 
-    def render_model_info(screen, font, model, max_age):
+    def render_model_info(screen, font, state, max_age):
         """
-        Exibe informações do modelo: células vivas, idade média e máxima.
+        Exibe informações do modelo: células vivas, idade média e máxima e passos já rodados.
         """
         try:
-            average_age = np.mean(model.age_layer.data[model.cell_layer.data])
-            max_age = max(max_age, np.max(model.age_layer.data[model.cell_layer.data]))
+            average_age = np.mean(state.age_layer[state.cell_layer])
+            max_age = max(max_age, np.max(state.age_layer[state.cell_layer]))
         except:
             average_age = 0
 
-        alive_count_text = font.render(f"Vivas: {model.alive_count}", True, (255, 255, 255))
+        alive_count_text = font.render(f"Vivas: {state.alive_count}", True, (255, 255, 255))
         avg_age_text = font.render(f"Idade Média: {average_age:.2f}", True, (255, 255, 255))
         max_age_text = font.render(f"Idade Máxima: {max_age}", True, (255, 255, 255))
+        steps_text = font.render(f"Passos: {state.steps}", True, (255, 255, 255))
         
-        screen.blit(alive_count_text, (10, 10))
-        screen.blit(avg_age_text, (10, 30))
-        screen.blit(max_age_text, (10, 50))
+        text_rect = screen.blit(alive_count_text, (10, 10))
+        text_rect = text_rect.union(screen.blit(avg_age_text, (10, 30)))
+        text_rect = text_rect.union(screen.blit(max_age_text, (10, 50)))
+        text_rect = text_rect.union(screen.blit(steps_text, (10, 70)))
 
-        return max_age  # Atualiza o valor de idade máxima
+        return max_age, text_rect  # Atualiza o valor de idade máxima e retorna a área do texto
     
     # Inicialização do jogo
     screen, clock, width, height = initialize_pygame(cell_size)
-    model = GameOfLifeModel( # Instancia o modelo do jogo.
-        width, height, revive_probabilities, survival_probabilities, alive_fraction, lamb, age_death
-    ) 
+    if replay is not None:
+        model = ReplayModel(replay, loop=True) # Toca a trajetória gravada, com o tamanho de grade dela
+        width, height = model.width, model.height
+    else:
+        model = GameOfLifeModel( # Instancia o modelo do jogo.
+            width, height, revive_probabilities, survival_probabilities, alive_fraction, lamb, age_death
+        ) 
+    # O modelo roda em uma thread (ou N passos por quadro) e o desenho só lê o último estado publicado
+    if steps_per_frame is not None:
+        simulation = Simulation(model, layers, values, steps_per_frame=steps_per_frame)
+    else:
+        simulation = SimulationThread(model, layers, values)
+    simulation.start()
     clear_button_rect, random_button_rect, exit_button_rect = setup_buttons(cell_size, height) # Configuração dos botões.
     sliders = setup_sliders(cell_size, height)  # Configuração inicial dos sliders
     font = pygame.font.SysFont(None, 24) # Fonte usada nos textos.
@@ -272,50 +302,76 @@ def run_GameOfLifeModel(
     dragging_slider = {key: False for key in sliders}  # Inicialização do estado de arraste
     max_age = 0 # Idade máxima inicial.
     click_buffer = np.zeros((width, height), dtype=bool)
+    # Desenho da grade e área dos controles (abaixo da grade inicial, onde ficam os botões e sliders)
+    renderer = GridRenderer((width, height), cell_size, palette)
+    panel_rect = pygame.Rect(0, height * cell_size, screen.get_width(), screen.get_height() - height * cell_size)
+    frames = 0
 
     # Loop Principal do jogo.
     while running:
         mouse_pos = pygame.mouse.get_pos()
         running, paused, dragging_slider, slider_values = handle_events(
-            model, width, height, cell_size, clear_button_rect, random_button_rect, exit_button_rect,
+            simulation, width, height, cell_size, clear_button_rect, random_button_rect, exit_button_rect,
             sliders, paused, dragging_slider
         )
-        speed = int(slider_values["slider1"] * 50)
-
-        if speed != 0:
-            clock.tick(speed)  # Ajusta a velocidade do jogo
+        speed = steps_per_second(slider_values["slider1"])
 
         if speed == 0:
             paused = True
 
-        if not paused:
-            model.step()
-        model.cell_layer.data = np.logical_or(model.cell_layer.data, click_buffer)
-        click_buffer.fill(False)
+        # Ajusta a velocidade do jogo (passos por segundo da thread, sem relação com os quadros)
+        simulation.paused = paused
+        simulation.steps_per_second = speed
+        simulation.frame()
+        if click_buffer.any():
+            with simulation.edit() as model:
+                model.cell_layer.data = np.logical_or(model.cell_layer.data, click_buffer)
+            click_buffer.fill(False)
 
         new_cell_size = int(slider_values["slider4"] * 45 + 5)
 
         # Se o tamanho das células mudou, recalcular a grade
-        if new_cell_size != cell_size:
+        if new_cell_size != cell_size and replay is not None:
+            cell_size = new_cell_size # No replay a grade tem tamanho fixo, só o desenho muda
+            renderer = None
+        elif new_cell_size != cell_size:
             cell_size = new_cell_size
             width = screen.get_width() // cell_size
             height = (screen.get_height() - 100) // cell_size
-            model = GameOfLifeModel(
+            simulation.replace(GameOfLifeModel(
                 width, height, revive_probabilities, survival_probabilities, alive_fraction, lamb, age_death
-            )
+            ))
             # Reinicialize o click_buffer para o novo tamanho
             click_buffer = np.zeros((width, height), dtype=bool)
-
-        # Renderização
-        screen.fill((0, 0, 0))
-        render_game(screen, model, cell_size, width, height, empty_color)
+            renderer = None
+
+        # A grade mudou de tamanho: novo renderer e a tela inteira é redesenhada
+        full_redraw = renderer is None
+        if full_redraw:
+            screen.fill((0, 0, 0))
+            renderer = GridRenderer((width, height), cell_size, palette)
+
+        # Renderização: só as partes que mudaram vão para a tela
+        with simulation.latest() as state:
+            rects = render_game(screen, state, renderer, panel_rect)
+            max_age, text_rect = render_model_info(screen, font, state, max_age)
         render_buttons(screen, font, mouse_pos, clear_button_rect, random_button_rect, exit_button_rect, button_color, button_hover_color)
         render_sliders(screen, font, sliders)
         render_status(screen, font, width, cell_size, paused)
-        max_age = render_model_info(screen, font, model, max_age)
-        pygame.display.flip()
-
+        # Texto e controles ficam por cima da grade: as células embaixo deles são redesenhadas no próximo quadro
+        renderer.invalidate(text_rect)
+        renderer.invalidate(panel_rect)
+        rects.append(text_rect)
+        pygame.display.update(screen.get_rect() if full_redraw else rects)
+        clock.tick(fps)  # Taxa de quadros fixa; a simulação segue no seu próprio ritmo
+
+        frames += 1
+        if max_frames is not None and frames >= max_frames:
+            running = False
+
+    simulation.stop()
     pygame.quit()
 
 
-run_GameOfLifeModel(10, {0: 0.001, 3: 1.0}, {2: 1, 3: 1}, 1050, False)
\ No newline at end of file
+# python pygame_visualization.py arquivo.traj: toca uma trajetória gravada em vez de rodar o modelo
+run_GameOfLifeModel(10, {0: 0.001, 3: 1.0}, {2: 1, 3: 1}, 1050, False, replay=sys.argv[1] if len(sys.argv) > 1 else None)
\ No newline at end of file
@@ -1,10 +1,15 @@
+import os
+import sys
+
 import numpy as np
 from mesa import Model
-from mesa.datacollection import DataCollector
 from mesa.space import PropertyLayer
-from scipy.signal import convolve2d
 
-from scipy.stats import expon
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+from metrics import MetricsCollector, PopulationCounter
+from sparse import SpeciesCounter
+import hazard
+
 class GameOfLifeModel(Model):
     def __init__(
         self,
@@ -16,9 +21,15 @@ class GameOfLifeModel(Model):
         game_type=[[0], [2]],
         probabilidade_presa=0.05,
         probabilidade_predador=0.1,
+        seed=None,
+        starvation=None,
+        feeding=None,
+        reproduction=None,
 
     ):
         super().__init__()
+        # Gerador de números aleatórios da inicialização e dos movimentos (seed opcional para reprodutibilidade)
+        self.rng = np.random.default_rng(seed)
         # Initialize the property layer for cell states
         # [0->Vazio, 1->Presa, 2->Predador]
         self.cell_layer = PropertyLayer("cells", width, height, 0, dtype=int)
@@ -26,46 +37,49 @@ class GameOfLifeModel(Model):
         self.time_no_eat = PropertyLayer("time", width, height, 0, dtype=int )
         # Parametro lambda da distribuição exponencial
         self.lamb = lamb
+        # Regras da ecologia como tabelas (hazard.HazardTable), consultadas para todos os animais de uma vez:
+        # starvation: probabilidade de morrer de fome pelo tempo sem comer (padrão: exponencial com o lambda)
+        # feeding: probabilidade de um predador comer (zerando o tempo sem comer) pelo número de presas vizinhas
+        # reproduction: probabilidade de uma presa virar predador pelo número de predadores vizinhos
+        # feeding e reproduction desligados (None) mantêm o modelo original, em que predadores não comem
+        self.starvation = starvation
+        self.feeding = feeding
+        self.reproduction = reproduction
         # Randomly set cells to alive
         # Vamos determinar o número de presas e predador
-        presa_inicializacao = np.random.choice(
+        presa_inicializacao = self.rng.choice(
             [0, 1],
             size=(width, height),
             p=[1 - probabilidade_presa, probabilidade_presa],
         )
-        predador_inicializa = np.random.choice(
+        predador_inicializa = self.rng.choice(
             [0, 2],
             size=(width, height),
             p=[1 - probabilidade_predador, probabilidade_predador],
         )
         self.cell_layer.data = np.maximum(presa_inicializacao, predador_inicializa)
+        # Contagem de vizinhos de cada espécie (vazio, presa, predador) em uma só passada, com buffers reaproveitados
+        self.neighbors = SpeciesCounter((width, height), 3)
         # Metrics and datacollector
         self.cells = width * height
-        self.presas_count = 0
-        self.preadores_count = 0
-        self.datacollector = DataCollector(
+        # Número de células de cada estado (vazio, presa, predador), atualizado no passo a partir das mortes e conversões
+        self.population = PopulationCounter(self.cell_layer.data, 3)
+        self.presas_count = self.population[1]
+        self.preadores_count = self.population[2]
+        self.datacollector = MetricsCollector(
             model_reporters={
-                "Presas count": "self.presas_count",
-                "Predador count": "self.preadores_count",
+                "Presas count": "presas_count",
+                "Predador count": "preadores_count",
             }
         )
         self.datacollector.collect(self)
         self.game_type = game_type  # Matriz que determina a regra do jogo
     def step(self):
-        # Define a kernel for counting neighbors. The kernel has 1s around the center cell (which is 0).
-        kernel = np.array(
-            [[1, 1, 1], [1, 0, 1], [1, 1, 1]]
-        )  # Define a vizinhança, no nosso caso a vizinhança será Norte, Sul, Leste, Oeste
-        # Count neighbors using convolution.
-        neighbor_count = convolve2d(
-            self.cell_layer.data, kernel, mode="same", boundary="wrap"
-        )
-        vizinhos_presas = convolve2d(
-            self.cell_layer.data == 1, kernel, mode="same", boundary="wrap"
-        )
-        vizinhos_predadores = convolve2d(
-            self.cell_layer.data == 2, kernel, mode="same", boundary="wrap"
-        )
+        # Número de presas e de predadores vizinhos (vizinhança de Moore, com wrap). Só as regras
+        # feeding e reproduction usam as contagens, então sem elas a contagem é pulada
+        if self.feeding is not None or self.reproduction is not None:
+            counts = self.neighbors.count(self.cell_layer.data)
+            vizinhos_presas, vizinhos_predadores = counts[1], counts[2]
         # Cria uma cópia do estado atual para evitar alterações durante a iteração
         new_state = np.copy(self.cell_layer.data)
         # Regra para as presas:
@@ -94,39 +108,98 @@ class GameOfLifeModel(Model):
         )'''
 
         #Criação de um nomo modelo, as presas e os predadores se movem
-        predador_positions = np.argwhere(self.cell_layer.data == 2) # Pegar todos os que são predadores
-        presa_positions = np.argwhere(self.cell_layer.data == 1) # Pegar todos que são presas
-        for pos in predador_positions:
-            x, y = pos
-            
-            # O nosso modelo em um modelo sem bordas, podemos então não nos preucupar com o tamanho da matriz
-            dx, dy = np.random.choice([-1, 0, 1], size=2)
-            new_x, new_y = (x + dx) % self.cell_layer.width, (y + dy) % self.cell_layer.height
-            
-            if new_state[new_x, new_y] == 0:
-                new_state[new_x, new_y] = 2
-                self.time_no_eat.data[new_x, new_y] = self.time_no_eat.data[x,y]+1
-                new_state[x, y] = 0
-                self.time_no_eat.data[x,y] = 0
-            # Uso de uma distribuição de probabilidade exponencial que almenta a probabilidade de uma célula morrer caso não coma
-            morte_prob = expon.cdf(self.time_no_eat.data[new_x, new_y], scale= self.lamb)
-            morta = np.random.rand() < morte_prob
-            if morta:
-                new_state[new_x, new_y] = 0
-            
-        for pos in presa_positions:#movimento da presa
-            x, y = pos
-            dx, dy = np.random.choice([-1, 0, 1], size=2)
-            new_x, new_y = (x + dx) % self.cell_layer.width, (y + dy) % self.cell_layer.height
-
-            if new_state[new_x, new_y] == 0:
-                new_state[new_x, new_y] = 1
-                new_state[x, y] = 0
+        # Os movimentos são feitos de uma vez para todos os animais de cada espécie (ver move_agents).
+        # Predadores se movem primeiro e as presas depois, para as células que continuaram vazias
+        width, height = self.cell_layer.width, self.cell_layer.height
+        time_no_eat = self.time_no_eat.data.ravel()
+        new_flat = new_state.ravel()
+
+        predadores = np.flatnonzero(new_flat == 2) # Pegar todos os que são predadores
+        if self.feeding is not None:
+            comeu = self.rng.random(len(predadores)) < self.feeding.lookup(vizinhos_presas.ravel()[predadores])
+            time_no_eat[predadores[comeu]] = 0
+        moved, destino = move_agents(predadores, new_flat, width, height, self.rng)
+        origem, destino = predadores[moved], destino[moved]
+        new_flat[destino] = 2
+        new_flat[origem] = 0
+        time_no_eat[destino] = time_no_eat[origem] + 1
+        time_no_eat[origem] = 0
+        predadores[moved] = destino # Posição final de cada predador
+
+        # Uso de uma distribuição de probabilidade (exponencial por padrão) que almenta a probabilidade de uma célula morrer caso não coma.
+        # A probabilidade vem da tabela pré-calculada e todos os sorteios são feitos de uma vez
+        morte_prob = self.starvation_table().lookup(time_no_eat[predadores])
+        mortos = predadores[self.rng.random(len(predadores)) < morte_prob]
+        new_flat[mortos] = 0
+        time_no_eat[mortos] = 0
+        self.population.move(2, 0, len(mortos))
+
+        presas = np.flatnonzero(self.cell_layer.data.ravel() == 1) # Pegar todos que são presas
+        if self.reproduction is not None:
+            # Presas cercadas por predadores são comidas e viram predadores (que não se movem neste passo)
+            convertidas = self.rng.random(len(presas)) < self.reproduction.lookup(vizinhos_predadores.ravel()[presas])
+            new_flat[presas[convertidas]] = 2
+            time_no_eat[presas[convertidas]] = 0
+            presas = presas[~convertidas]
+            self.population.move(1, 2, np.count_nonzero(convertidas))
+        moved, destino = move_agents(presas, new_flat, width, height, self.rng)
+        new_flat[destino[moved]] = 1
+        new_flat[presas[moved]] = 0
 
         self.cell_layer.data = new_state
         # Atualiza o estado da camada de células
         self.cell_layer.data = new_state
-        # Atualiza as métricas de presas e predadores
-        self.presas_count = np.sum(self.cell_layer.data == 1)
-        self.preadores_count = np.sum(self.cell_layer.data == 2)
+        # Atualiza as métricas de presas e predadores (movimentos não mudam as contagens)
+        self.presas_count = self.population[1]
+        self.preadores_count = self.population[2]
         self.datacollector.collect(self)
+
+    def set_cell(self, x, y, state):
+        """
+        Muda o estado de uma célula (edição pela interface) mantendo as contagens em dia.
+        """
+        self.population.move(self.cell_layer.data[x, y], state)
+        self.cell_layer.data[x, y] = state
+        self.presas_count = self.population[1]
+        self.preadores_count = self.population[2]
+
+    def on_restore(self):
+        # Depois de load_checkpoint: as contagens vêm da grade restaurada
+        self.population.recount(self.cell_layer.data)
+
+    def starvation_table(self):
+        """
+        Retorna a tabela de probabilidade de morte por fome usada no passo.
+        """
+        if self.starvation is not None:
+            return self.starvation
+        return hazard.exponential(self.lamb)
+
+
+# Deslocamentos possíveis (dx, dy) de um animal: as 8 células vizinhas ou ficar parado
+MOVES = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+
+
+def move_agents(positions, state, width, height, rng):
+    """
+    Sorteia um deslocamento para cada animal em `positions` (índices na grade
+    achatada `state`, com wrap nas bordas) e decide quem consegue se mover.
+    Só valem destinos vazios em `state`; quando vários animais escolhem a
+    mesma célula, o vencedor é sorteado (ordenação pelo destino e por uma
+    chave aleatória), sem depender da ordem dos animais na grade.
+
+    Retorna (moved, target): quem conseguiu se mover e o destino sorteado de cada animal.
+    """
+    x, y = np.divmod(positions, height)
+    move = MOVES[rng.integers(0, len(MOVES), size=len(positions))]
+    target = ((x + move[:, 0]) % width) * height + (y + move[:, 1]) % height
+
+    # Ordena por destino e, dentro de cada destino, pela chave aleatória: o primeiro de cada grupo vence
+    order = np.lexsort((rng.random(len(target)), target))
+    sorted_target = target[order]
+    first = np.ones(len(target), dtype=bool)
+    first[1:] = sorted_target[1:] != sorted_target[:-1]
+    moved = np.zeros(len(target), dtype=bool)
+    moved[order[first]] = True
+    moved &= state[target] == 0
+    return moved, target
@@ -1,4 +1,6 @@
 from pp_model import GameOfLifeModel
+from render import GridRenderer, init_display # Desenho da grade com numpy (pasta shared/)
+from simulation import Simulation, SimulationThread # Simulação separada do desenho (pasta shared/)
 import pygame
 import matplotlib.pyplot as plt
 
@@ -10,13 +12,25 @@ def run_GameOfLifeModel(
     lamb,
     initial_config=None,
     colors={"empty": (0, 255, 0), "prey": (255, 255, 0), "predator": (255, 0, 0)},
+    headless=False,
+    max_frames=None,
+    fps=60,
+    steps_per_frame=None,
 ):
-    pygame.init()
-    screen = pygame.display.set_mode((width * cell_size, height * cell_size + 100))  # Adicionando espaço para o controle de velocidade
+    # headless: sem janela (driver "dummy" do SDL), para medir desempenho; max_frames encerra depois de N quadros
+    # O modelo roda em uma thread própria, na velocidade do slider, e a tela é desenhada a `fps` quadros por segundo;
+    # com steps_per_frame, roda esse número de passos a cada quadro, sem thread
+    screen = init_display((width * cell_size, height * cell_size + 100), headless=headless)  # Adicionando espaço para o controle de velocidade
     clock = pygame.time.Clock()
 
     # Corrigindo a criação do modelo para garantir que lamb seja utilizado corretamente
     model = GameOfLifeModel(lamb,width, height, alive_fraction=0.2)
+    layers, values = ("cell_layer",), ("presas_count", "preadores_count")
+    if steps_per_frame is not None:
+        simulation = Simulation(model, layers, values, steps_per_frame=steps_per_frame)
+    else:
+        simulation = SimulationThread(model, layers, values)
+    simulation.start()
     running = True
     paused = False  # Para controlar a pausa do jogo
     last_click_time = 0  # Para controlar o clique duplo
@@ -25,6 +39,10 @@ def run_GameOfLifeModel(
     empty_color = (0, 0, 0)  # Cor preta para o fundo
     prey_color = colors["prey"]  # Cor para presas
     predator_color = colors["predator"]  # Cor para predadores
+    # O estado da célula (0, 1, 2) é o índice da cor: a grade vai direto para o renderer
+    renderer = GridRenderer((width, height), cell_size, [empty_color, prey_color, predator_color])
+    panel_rect = pygame.Rect(0, height * cell_size, width * cell_size, 100)  # Área dos controles, abaixo da grade
+    frames = 0
 
     # Definir a área do botão RESET (na parte inferior esquerda)
     reset_button_rect = pygame.Rect(10, height * cell_size - 40, 100, 30)
@@ -34,16 +52,21 @@ def run_GameOfLifeModel(
     prey_counts = []
     predator_counts = []
     time_steps = []
-    time_step = 0
+    step_offset = 0  # Passos dos modelos anteriores ao último RESET
 
     # Barra de controle de velocidade
     slider_rect = pygame.Rect(10, height * cell_size + 50, 200, 20)  # Caixa do slider
     slider_pos = 100  # Posição inicial do slider (100 => 50% da velocidade)
     dragging_slider = False
 
-    # Velocidade inicial de simulação
+    # Velocidade inicial de simulação, em passos por segundo
     base_speed = 10  # Base da velocidade (quanto maior, mais rápido)
-    max_speed = 100  # Velocidade máxima
+    max_speed = 10000  # Velocidade máxima antes do fim do slider (no fim, sem limite)
+
+    # Fontes criadas uma vez só (SysFont procura a fonte no sistema a cada chamada)
+    font = pygame.font.SysFont("Arial", 20)
+    counter_font = pygame.font.SysFont("Arial", 24)
+    rate_font = font
 
     while running:
         for event in pygame.event.get():
@@ -62,17 +85,19 @@ def run_GameOfLifeModel(
 
                 # Clique no botão RESET
                 if reset_button_rect.collidepoint(mouse_x, mouse_y):
-                    model = GameOfLifeModel(lamb,width, height, alive_fraction=0.2)  # Reiniciar o modelo
+                    step_offset += simulation.steps
+                    simulation.replace(GameOfLifeModel(lamb,width, height, alive_fraction=0.2))  # Reiniciar o modelo
                 elif slider_rect.collidepoint(mouse_x, mouse_y):
                     slider_pos = max(0, min(200, mouse_x - slider_rect.x))
                     dragging_slider = True
                 else:
                     # Clique simples ou duplo
                     current_time = pygame.time.get_ticks()
-                    if current_time - last_click_time < 500:
-                        model.cell_layer.data[grid_x][grid_y] = 1  # Presa
-                    else:
-                        model.cell_layer.data[grid_x][grid_y] = 2  # Predador
+                    with simulation.edit() as model:
+                        if current_time - last_click_time < 500:
+                            model.set_cell(grid_x, grid_y, 1)  # Presa
+                        else:
+                            model.set_cell(grid_x, grid_y, 2)  # Predador
                     last_click_time = current_time
 
             if event.type == pygame.MOUSEBUTTONUP:
@@ -85,31 +110,25 @@ def run_GameOfLifeModel(
 
         # Atualizar a velocidade com base no slider
         speed_factor = slider_pos / 200  # Ajusta a velocidade com base na posição do slider (0 a 1)
-        speed = base_speed * (speed_factor + 0.3)
-
-
-        if not paused:
-            model.step()
-
-        prey_count = sum(1 for x in range(width) for y in range(height) if model.cell_layer.data[x][y] == 1)
-        predator_count = sum(1 for x in range(width) for y in range(height) if model.cell_layer.data[x][y] == 2)
-        # Armazenar os dados
-        prey_counts.append(prey_count)
-        predator_counts.append(predator_count)
-        time_steps.append(time_step)
-        time_step += 1
-
-
-        screen.fill(empty_color)  # Limpar tela com fundo preto
-
-
-        # Desenho das células
-        for x in range(width):
-            for y in range(height):
-                if model.cell_layer.data[x][y] == 1:
-                    pygame.draw.rect(screen, prey_color, (x * cell_size, y * cell_size, cell_size, cell_size))
-                elif model.cell_layer.data[x][y] == 2:
-                    pygame.draw.rect(screen, predator_color, (x * cell_size, y * cell_size, cell_size, cell_size))
+        speed = base_speed * (max_speed / base_speed) ** speed_factor if speed_factor < 1 else None
+
+        simulation.paused = paused
+        simulation.steps_per_second = speed
+        simulation.frame()
+
+        # Último estado publicado pela simulação, com as contagens mantidas pelo próprio modelo
+        with simulation.latest() as state:
+            prey_count = state.presas_count
+            predator_count = state.preadores_count
+            # Armazenar os dados
+            prey_counts.append(prey_count)
+            predator_counts.append(predator_count)
+            time_steps.append(step_offset + state.steps)
+
+            # Desenho das células: só os blocos da grade que mudaram são redesenhados
+            rects = renderer.render(screen, state.cell_layer)
+        screen.fill(empty_color, panel_rect)  # Limpar a área dos controles com fundo preto
+        rects.append(panel_rect)
 
         # Desenhando a barra deslizante (sl10)ider)
         pygame.draw.rect(screen, (255, 255, 255), slider_rect, 2)  # Caixa do slider
@@ -117,25 +136,30 @@ def run_GameOfLifeModel(
 
         # Desenhando o botão RESET
         pygame.draw.rect(screen, (200, 200, 200), reset_button_rect)
-        font = pygame.font.SysFont("Arial", 20)
         text = font.render("RESET", True, (0, 0, 0))
         screen.blit(text, (reset_button_rect.x + 20, reset_button_rect.y + 5))
 
         # Exibindo o contador de presas e predadores
-        counter_font = pygame.font.SysFont("Arial", 24)
         prey_text = counter_font.render(f"Presas: {prey_count}", True, (0, 255, 0))  # Cor verde para presas
         predator_text = counter_font.render(f"Predadores: {predator_count}", True, (255, 0, 0))  # Cor vermelha para predadores
         screen.blit(prey_text, (1000, 710))  # Exibindo o contador de presas 
         screen.blit(predator_text, (1000, 740))  # Exibindo o contador de predadores logo abaixo
 
         # Adicionando a palavra 'Velocidade' acima do slider
-        rate_font = pygame.font.SysFont("Arial", 20)
         rate_text = rate_font.render("Velocidade:", True, (255, 255, 255))  # Cor branca para o texto
         screen.blit(rate_text, (slider_rect.x + (slider_rect.width // 2) - rate_text.get_width() // 2, slider_rect.y - 30))
 
-        pygame.display.flip()  # Atualizar a tela
-        clock.tick(speed)  # Ajusta a velocidade com base no slider (quanto maior o valor de speed, mais rápido será)
+        # O botão RESET fica por cima da grade: as células embaixo dele são redesenhadas no próximo quadro
+        renderer.invalidate(reset_button_rect)
+        rects.append(reset_button_rect)
+        pygame.display.update(rects)  # Atualizar só as partes da tela que mudaram
+
+        frames += 1
+        if max_frames is not None and frames >= max_frames:
+            running = False
+        clock.tick(fps)  # Taxa de quadros fixa; a velocidade da simulação é a do slider
 
+    simulation.stop()
     pygame.quit()  # Finaliza o pygame
 
 
@@ -1,8 +1,12 @@
 import numpy as np
 from mesa import Model
-from mesa.datacollection import DataCollector
 from mesa.space import PropertyLayer
 from scipy.signal import convolve2d
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "shared"))
+from bitlife import BitPackedLife, PackedLayer
+from metrics import MetricsCollector, PopulationCounter
 from flask import Flask, render_template_string, jsonify, request
 import matplotlib
 matplotlib.use('Agg')  
@@ -12,42 +16,78 @@ import base64
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 
 class GameOfLifeModel(Model):
-    def __init__(self, width=10, height=10, alive_fraction=0.2):
+    def __init__(self, width=10, height=10, alive_fraction=0.2, backend="convolve"):
         super().__init__()
-        self.cell_layer = PropertyLayer("cells", width, height, False, dtype=bool)
-        self.cell_layer.data = np.random.choice([True, False], size=(width, height), p=[alive_fraction, 1 - alive_fraction])
-        self.cell_layer_copy = np.copy(self.cell_layer.data) # guardar os dados iniciais
+        # backend "convolve" conta vizinhos com convolve2d; "bitpacked" guarda 64 células por uint64 (BitPackedLife)
+        if backend not in ("convolve", "bitpacked"):
+            raise ValueError(f"backend desconhecido: {backend!r}")
+        self.backend = backend
         self.cells = width * height
+        if backend == "bitpacked":
+            # O tabuleiro empacotado é a grade: é sorteado já empacotado (semente tirada do np.random global)
+            # e cell_layer.data só desempacota quando alguém lê os pixels (o /plot.png)
+            rng = np.random.default_rng(np.random.randint(0, 2**63, dtype=np.int64))
+            self.board = BitPackedLife.random((width, height), alive_fraction, rng)
+            self.cell_layer = PackedLayer("cells", self.board)
+            self.cell_layer_copy = np.copy(self.board.board) # guardar os dados iniciais (já empacotados)
+            alive = self.board.population()
+            self.population = PopulationCounter.from_counts([self.cells - alive, alive])
+        else:
+            self.cell_layer = PropertyLayer("cells", width, height, False, dtype=bool)
+            self.cell_layer.data = np.random.choice([True, False], size=(width, height), p=[alive_fraction, 1 - alive_fraction])
+            self.board = None
+            self.cell_layer_copy = np.copy(self.cell_layer.data) # guardar os dados iniciais
+            # Células mortas e vivas, atualizadas pelo popcount do tabuleiro ("bitpacked") ou pela grade nova
+            self.population = PopulationCounter(self.cell_layer.data)
         self.alive_count = 0
         self.alive_fraction = 0
-        self.datacollector = DataCollector(
+        self.datacollector = MetricsCollector(
             model_reporters={"Cells alive": "alive_count",
                              "Fraction alive": "alive_fraction"}
         )
         self.datacollector.collect(self)
 
     def step(self):
-        kernel = np.array([[1, 1, 1],
-                           [1, 0, 1],
-                           [1, 1, 1]])
+        if self.backend == "bitpacked":
+            self.board.step()
+            self.population.set(1, self.board.population())
+        else:
+            kernel = np.array([[1, 1, 1],
+                               [1, 0, 1],
+                               [1, 1, 1]])
 
-        neighbor_count = convolve2d(self.cell_layer.data, kernel, mode="same", boundary="wrap")
+            neighbor_count = convolve2d(self.cell_layer.data, kernel, mode="same", boundary="wrap")
 
-        self.cell_layer.data = np.logical_or(
-            np.logical_and(self.cell_layer.data, np.logical_or(neighbor_count == 2, neighbor_count == 3)),
-            np.logical_and(~self.cell_layer.data, neighbor_count == 3)
-        )
+            self.cell_layer.data = np.logical_or(
+                np.logical_and(self.cell_layer.data, np.logical_or(neighbor_count == 2, neighbor_count == 3)),
+                np.logical_and(~self.cell_layer.data, neighbor_count == 3)
+            )
+            self.population.set(1, np.count_nonzero(self.cell_layer.data))
 
-        self.alive_count = np.sum(self.cell_layer.data)
-        self.alive_fraction = self.alive_count / self.cells
+        self.alive_count = self.population[1]
+        self.alive_fraction = self.population.fraction(1)
         self.datacollector.collect(self)
     #Função resetar 
     def reset(self):
-        self.cell_layer.data = self.cell_layer_copy
-        self.alive_count = np.sum(self.cell_layer.data)
-        self.alive_fraction = self.alive_count / self.cells
+        # cópia: a configuração inicial não pode ser alterada pelos passos
+        if self.backend == "bitpacked":
+            self.board.board = np.copy(self.cell_layer_copy)
+            self.population.set(1, self.board.population())
+        else:
+            self.cell_layer.data = np.copy(self.cell_layer_copy)
+            self.population.recount(self.cell_layer.data)
+        self.alive_count = self.population[1]
+        self.alive_fraction = self.population.fraction(1)
         self.datacollector.collect(self)
 
+    # Chamado por checkpoint.load_checkpoint depois de restaurar a grade
+    def on_restore(self):
+        if self.backend == "bitpacked":
+            # A grade restaurada já foi empacotada no tabuleiro pelo cell_layer.data
+            self.population.set(1, self.board.population())
+        else:
+            self.population.recount(self.cell_layer.data)
+
 app = Flask(__name__)
 model = GameOfLifeModel(width=20, height=20, alive_fraction=0.3)
 max_steps = 100
@@ -1,6 +1,5 @@
 import numpy as np
 from mesa import Model
-from mesa.datacollection import DataCollector
 from flask import Flask, render_template_string, jsonify
 import matplotlib
 matplotlib.use('Agg')
@@ -12,46 +11,105 @@ from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 import threading
 import time
 from matplotlib.patches import RegularPolygon
+import sys
+from functools import partial
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "shared"))
+from sparse import ActiveTiles, HEX, hex_life_block, neighbor_sum
+from metrics import MetricsCollector, PopulationCounter
+from rules import parse_rule
+
 
 class HexGameOfLifeModel(Model):
-    def __init__(self, width=10, height=10, alive_fraction=0.2):
+    def __init__(self, width=10, height=10, alive_fraction=0.2, backend="loop", rule="B3/S23", wrap=True):
         super().__init__()
         self.width = width
         self.height = height
+        # Regra B/S (por exemplo "B2/S34") e se a grade dá a volta nas bordas ou não
+        self.birth, self.survive = parse_rule(rule)
+        self.wrap = wrap
+        # backend "loop" percorre célula por célula; "vectorized" calcula a grade inteira com numpy;
+        # "sparse" só calcula os blocos que mudaram recentemente
+        if backend not in ("loop", "vectorized", "sparse"):
+            raise ValueError(f"backend desconhecido: {backend!r}")
+        if backend == "sparse" and not wrap:
+            raise ValueError("o backend 'sparse' só funciona com wrap=True")
+        self.backend = backend
+        block = partial(hex_life_block, birth=self.birth, survive=self.survive)
+        self.tracker = ActiveTiles((width, height), block) if backend == "sparse" else None
+        # Tabelas indexadas pelo número de vizinhos (0 a 6) para o backend "vectorized"
+        self.birth_table = np.isin(np.arange(7), self.birth)
+        self.survive_table = np.isin(np.arange(7), self.survive)
         self.grid = np.random.choice([True, False], size=(width, height), p=[alive_fraction, 1 - alive_fraction])
         self.grid_copy = np.copy(self.grid) #Salvar configuração inicial
         self.cells = width * height
+        # Células mortas e vivas, atualizadas com os nascimentos e mortes de cada passo
+        self.population = PopulationCounter(self.grid)
         self.alive_count = 0
         self.alive_fraction = 0
-        self.datacollector = DataCollector(
+        # Fração de blocos calculados no último passo (sempre 1 fora do backend "sparse")
+        self.active_tile_fraction = 1.0
+        self.datacollector = MetricsCollector(
             model_reporters={"Cells alive": "alive_count",
-                             "Fraction alive": "alive_fraction"}
+                             "Fraction alive": "alive_fraction",
+                             "Active tile fraction": "active_tile_fraction"}
         )
         self.datacollector.collect(self)
 
     def step(self):
-        new_grid = np.copy(self.grid)
-        for x in range(self.width):
-            for y in range(self.height):
-                neighbors = self.count_neighbors(x, y)
-                if self.grid[x, y]:
-                    if neighbors < 2 or neighbors > 3:
-                        new_grid[x, y] = False
-                else:
-                    if neighbors == 3:
-                        new_grid[x, y] = True
-        
-        self.grid = new_grid
-        self.alive_count = np.sum(self.grid)
-        self.alive_fraction = self.alive_count / self.cells
+        if self.backend == "sparse":
+            self.grid = self.tracker.step(self.grid)
+            self.active_tile_fraction = self.tracker.active_fraction
+            self.population.apply(self.tracker.delta)
+        elif self.backend == "vectorized":
+            # Borda de 1 célula: cópia do lado oposto (wrap) ou células mortas (bordas fechadas)
+            padded = np.pad(self.grid, 1, mode="wrap" if self.wrap else "constant")
+            neighbors = neighbor_sum(padded, HEX)
+            self.grid = np.where(self.grid, self.survive_table[neighbors], self.birth_table[neighbors])
+            self.population.set(1, np.count_nonzero(self.grid))
+        else:
+            new_grid = np.copy(self.grid)
+            for x in range(self.width):
+                for y in range(self.height):
+                    neighbors = self.count_neighbors(x, y)
+                    if self.grid[x, y]:
+                        if neighbors not in self.survive:
+                            new_grid[x, y] = False
+                            self.population.move(1, 0)
+                    else:
+                        if neighbors in self.birth:
+                            new_grid[x, y] = True
+                            self.population.move(0, 1)
+
+            self.grid = new_grid
+        self.alive_count = self.population[1]
+        self.alive_fraction = self.population.fraction(1)
         self.datacollector.collect(self)
     #função reset 
     def reset(self):
-        self.grid = self.grid_copy 
-        self.alived_count = 0
-        self.alived_fraction = 0
+        self.grid = np.copy(self.grid_copy)  # cópia: o backend "sparse" altera a grade no próprio array
+        self.population.recount(self.grid)
+        self.alive_count = self.population[1]
+        self.alive_fraction = self.population.fraction(1)
         self.datacollector.collect(self)
         
+    def set_cell(self, x, y, value):
+        """
+        Muda o estado de uma célula (edição pela interface): marca o bloco no
+        backend "sparse" e mantém a contagem de vivas em dia.
+        """
+        value = bool(value)
+        old = bool(self.grid[x, y])
+        self.grid[x, y] = value
+        if self.tracker is not None:
+            self.tracker.mark(x, y)
+        self.population.move(int(old), int(value))
+        self.alive_count = self.population[1]
+        self.alive_fraction = self.population.fraction(1)
+
+    # Chamado por checkpoint.load_checkpoint depois de restaurar a grade
+    def on_restore(self):
+        self.population.recount(self.grid)
+
 
     def count_neighbors(self, x, y):
         directions = [
@@ -59,7 +117,11 @@ class HexGameOfLifeModel(Model):
         ]
         count = 0
         for dx, dy in directions:
-            nx, ny = (x + dx) % self.width, (y + dy) % self.height
+            nx, ny = x + dx, y + dy
+            if self.wrap:
+                nx, ny = nx % self.width, ny % self.height
+            elif not (0 <= nx < self.width and 0 <= ny < self.height):
+                continue
             if self.grid[nx, ny]:
                 count += 1
         return count
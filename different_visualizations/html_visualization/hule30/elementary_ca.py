@@ -0,0 +1,97 @@
+import numpy as np
+
+
+class ElementaryCA:
+    """
+    Autômato celular elementar (regras de Wolfram 0 a 255) atualizado uma linha inteira por vez.
+
+    A linha é guardada em um inteiro do Python, como no Rule30Model: o bit j é
+    a célula j, o vizinho da "esquerda" é o bit j + 1 e o da "direita" o bit j - 1.
+    Cada passo é feito com deslocamentos e operações bit a bit sobre o inteiro
+    inteiro, sem percorrer as células. O histórico fica em um array uint8
+    empacotado (8 células por byte), que cresce sob demanda.
+
+    Args:
+        width (int): Número de células da linha.
+        rule (int): Número da regra de Wolfram (0 a 255).
+        boundary (str): "fixed" (células fora da linha valem 0) ou "wrap" (a linha dá a volta).
+        state (int): Linha inicial. Padrão: uma única célula viva no meio.
+    """
+
+    def __init__(self, width=128, rule=30, boundary="fixed", state=None):
+        if not 0 <= rule <= 255:
+            raise ValueError(f"regra inválida: {rule}")
+        if boundary not in ("fixed", "wrap"):
+            raise ValueError(f"boundary desconhecido: {boundary!r}")
+        self.width = width
+        self.rule = rule
+        self.boundary = boundary
+        self.mask = (1 << width) - 1
+        self.state = (1 << (width // 2)) if state is None else state & self.mask
+        # Padrões (esquerda, centro, direita) que geram uma célula viva na regra
+        self.patterns = [p for p in range(8) if (rule >> p) & 1]
+
+        self.row_bytes = -(-width // 8)
+        self._history = np.zeros((64, self.row_bytes), dtype=np.uint8)
+        self.generation = 0
+        self.collect_state()
+
+    def next_state(self, state):
+        """
+        Calcula a próxima linha a partir de `state`.
+        """
+        left = state >> 1
+        right = (state << 1) & self.mask
+        if self.boundary == "wrap":
+            left |= (state & 1) << (self.width - 1)
+            right |= state >> (self.width - 1)
+
+        if self.rule == 30:
+            # Caso mais usado: esquerda XOR (centro OU direita)
+            return left ^ (state | right)
+
+        # Soma dos mintermos da regra: para cada padrão vivo, E das três entradas (negadas quando o bit é 0)
+        mask = self.mask
+        new = 0
+        for pattern in self.patterns:
+            term = left if pattern & 4 else ~left & mask
+            term &= state if pattern & 2 else ~state & mask
+            term &= right if pattern & 1 else ~right & mask
+            new |= term
+        return new
+
+    def step(self, generations=1):
+        """
+        Avança `generations` linhas, guardando cada uma no histórico.
+        """
+        for _ in range(generations):
+            self.state = self.next_state(self.state)
+            self.generation += 1
+            self.collect_state()
+
+    def collect_state(self):
+        """
+        Guarda a linha atual no histórico empacotado.
+        """
+        if self.generation >= len(self._history):
+            grown = np.zeros((2 * len(self._history), self.row_bytes), dtype=np.uint8)
+            grown[: len(self._history)] = self._history
+            self._history = grown
+        row = self.state.to_bytes(self.row_bytes, "little")
+        self._history[self.generation] = np.frombuffer(row, dtype=np.uint8)
+
+    @property
+    def packed_history(self):
+        """
+        Histórico empacotado, formato (gerações, ceil(width / 8)). O bit j % 8
+        do byte j // 8 é a célula j.
+        """
+        return self._history[: self.generation + 1]
+
+    def history(self):
+        """
+        Histórico desempacotado (gerações, width), com a célula de maior índice
+        na primeira coluna, como no Rule30Model.collect_state.
+        """
+        bits = np.unpackbits(self.packed_history, axis=1, bitorder="little")
+        return bits[:, : self.width][:, ::-1]
@@ -0,0 +1,272 @@
+import ctypes
+import threading
+
+import numpy as np
+
+
+class Rule30Stream:
+    """
+    Gerador de bits pseudoaleatórios a partir da coluna central da regra 30.
+
+    Várias sementes independentes (lanes) rodam ao mesmo tempo em formato
+    bit-sliced: `cells[j]` é um array de palavras uint64 e o bit k da palavra
+    guarda a célula j da lane k. Um passo da regra 30 para todas as lanes é
+    então `esquerda ^ (centro | direita)` sobre a linha inteira de palavras, e
+    cada passo produz um bit da coluna central por lane, já empacotado em bytes.
+
+    A saída é um único fluxo de bytes: passo a passo, os bits centrais das
+    lanes (lane 0 no bit menos significativo do primeiro byte).
+
+    Args:
+        seed (int): Semente; o estado inicial de todas as lanes sai dela (SeedSequence).
+        width (int): Largura de cada linha (com wrap nas bordas).
+        lanes (int): Número de sementes independentes; múltiplo de 64. Cada
+            passo custa quase o mesmo até alguns milhares de lanes, então mais
+            lanes rendem mais bytes por passo (256 lanes: ~3 MB/s; 4096: ~19 MB/s).
+        burn_in (int): Passos descartados no início para espalhar a semente.
+            Padrão: `width`.
+    """
+
+    def __init__(self, seed=0, width=256, lanes=4096, burn_in=None):
+        if lanes % 64:
+            raise ValueError("lanes deve ser múltiplo de 64")
+        self.seed = seed
+        self.width = width
+        self.lanes = lanes
+        self.burn_in = width if burn_in is None else burn_in
+        self.step_bytes = lanes // 8
+        self.reset()
+
+    def reset(self):
+        """
+        Volta ao início do fluxo.
+        """
+        words = self.lanes // 64
+        state = np.random.SeedSequence(self.seed).generate_state(self.width * words, dtype=np.uint64)
+        self.cells = state.reshape(self.width, words)
+        self.generation = 0
+        self._advance(self.burn_in)
+        # Posição no fluxo (em bytes) e bytes já gerados e ainda não lidos do último passo
+        self.position = 0
+        self._pending = b""
+
+    def _advance(self, steps, out=None):
+        # Roda `steps` passos para todas as lanes; se `out` for dado, guarda nele a coluna central de cada passo
+        cells = self.cells
+        right = np.empty_like(cells)
+        center = self.width // 2
+        for i in range(steps):
+            # Direita da célula j é j - 1; esquerda é j + 1 (com wrap)
+            right[1:] = cells[:-1]
+            right[0] = cells[-1]
+            np.bitwise_or(cells, right, out=right)
+            left = np.roll(cells, -1, axis=0)
+            np.bitwise_xor(left, right, out=cells)
+            if out is not None:
+                out[i] = cells[center]
+        self.generation += steps
+
+    def read(self, nbytes):
+        """
+        Lê os próximos `nbytes` bytes do fluxo.
+        """
+        data = self._pending[:nbytes]
+        self._pending = self._pending[nbytes:]
+        missing = nbytes - len(data)
+        if missing > 0:
+            steps = -(-missing // self.step_bytes)
+            out = np.empty((steps, self.lanes // 64), dtype=np.uint64)
+            self._advance(steps, out)
+            fresh = out.astype("<u8", copy=False).tobytes()
+            data += fresh[:missing]
+            self._pending = fresh[missing:]
+        self.position += nbytes
+        return data
+
+    def stream(self, chunk_size=1 << 16):
+        """
+        Iterador infinito de blocos de `chunk_size` bytes.
+        """
+        while True:
+            yield self.read(chunk_size)
+
+    def random_raw(self, size):
+        """
+        Próximos `size` inteiros uint64 do fluxo.
+        """
+        return np.frombuffer(self.read(8 * size), dtype="<u8").astype(np.uint64)
+
+    def tell(self):
+        """
+        Posição atual no fluxo, em bytes.
+        """
+        return self.position
+
+    def seek(self, position):
+        """
+        Vai para a posição `position` (em bytes). A regra 30 não tem salto
+        direto, então os passos até lá são calculados (sem guardar a saída);
+        voltar para trás recomeça do início.
+        """
+        if position < self.position:
+            self.reset()
+        skip = position - self.position
+        if skip > len(self._pending):
+            skip -= len(self._pending)
+            self._pending = b""
+            self.position = position - skip
+            steps, offset = divmod(skip, self.step_bytes)
+            self._advance(steps)
+            self.position += steps * self.step_bytes
+            self.read(offset)
+        else:
+            self.read(skip)
+
+    @property
+    def state(self):
+        """
+        Estado completo do gerador (para checkpoint), no estilo de `BitGenerator.state`.
+        """
+        return {
+            "seed": self.seed,
+            "width": self.width,
+            "lanes": self.lanes,
+            "burn_in": self.burn_in,
+            "cells": self.cells.copy(),
+            "generation": self.generation,
+            "position": self.position,
+            "pending": self._pending,
+        }
+
+    @state.setter
+    def state(self, value):
+        self.seed = value["seed"]
+        self.width = value["width"]
+        self.lanes = value["lanes"]
+        self.burn_in = value["burn_in"]
+        self.step_bytes = self.lanes // 8
+        self.cells = np.array(value["cells"], dtype=np.uint64)
+        self.generation = value["generation"]
+        self.position = value["position"]
+        self._pending = bytes(value["pending"])
+
+    def save(self, path):
+        """
+        Salva um checkpoint do gerador em `path` (.npz).
+        """
+        state = self.state
+        state["pending"] = np.frombuffer(state["pending"], dtype=np.uint8)
+        np.savez(path, **state)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Recria um gerador a partir de um checkpoint salvo com `save`.
+        """
+        with np.load(path) as data:
+            state = {key: data[key] for key in data.files}
+        stream = cls.__new__(cls)
+        stream.state = {
+            "seed": int(state["seed"]),
+            "width": int(state["width"]),
+            "lanes": int(state["lanes"]),
+            "burn_in": int(state["burn_in"]),
+            "cells": state["cells"],
+            "generation": int(state["generation"]),
+            "position": int(state["position"]),
+            "pending": state["pending"].tobytes(),
+        }
+        return stream
+
+
+# Estrutura bitgen_t usada pelo np.random.Generator (numpy/random/bitgen.h)
+_NEXT_UINT64 = ctypes.CFUNCTYPE(ctypes.c_uint64, ctypes.c_void_p)
+_NEXT_UINT32 = ctypes.CFUNCTYPE(ctypes.c_uint32, ctypes.c_void_p)
+_NEXT_DOUBLE = ctypes.CFUNCTYPE(ctypes.c_double, ctypes.c_void_p)
+
+
+class _BitGen(ctypes.Structure):
+    _fields_ = [
+        ("state", ctypes.c_void_p),
+        ("next_uint64", _NEXT_UINT64),
+        ("next_uint32", _NEXT_UINT32),
+        ("next_double", _NEXT_DOUBLE),
+        ("next_raw", _NEXT_UINT64),
+    ]
+
+
+_capsule_new = ctypes.pythonapi.PyCapsule_New
+_capsule_new.restype = ctypes.py_object
+_capsule_new.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_void_p]
+
+
+class Rule30BitGenerator:
+    """
+    Adaptador que permite usar um Rule30Stream como fonte do `np.random.Generator`:
+
+        rng = np.random.Generator(Rule30BitGenerator(seed=42))
+
+    Os números são gerados em blocos de `buffer_size` uint64 pelo Rule30Stream
+    e entregues ao numpy um a um por callbacks do ctypes. Para o máximo de
+    desempenho em volume, use `Rule30Stream.read` ou `random_raw` diretamente.
+
+    Args:
+        seed (int): Semente do Rule30Stream.
+        buffer_size (int): Quantidade de uint64 gerada de cada vez.
+        **kwargs: Outros argumentos do Rule30Stream (width, lanes, burn_in).
+    """
+
+    def __init__(self, seed=0, buffer_size=1 << 14, **kwargs):
+        self.stream = Rule30Stream(seed, **kwargs)
+        self.buffer_size = buffer_size
+        self._buffer = np.empty(0, dtype=np.uint64)
+        self._index = 0
+        self.lock = threading.Lock()
+
+        # Os callbacks precisam continuar referenciados enquanto o gerador existir
+        self._callbacks = (
+            _NEXT_UINT64(lambda _: self._next_uint64()),
+            _NEXT_UINT32(lambda _: self._next_uint64() >> 32),
+            _NEXT_DOUBLE(lambda _: (self._next_uint64() >> 11) * (1.0 / 9007199254740992.0)),
+            _NEXT_UINT64(lambda _: self._next_uint64()),
+        )
+        self._bitgen = _BitGen(None, *self._callbacks)
+        self.capsule = _capsule_new(ctypes.addressof(self._bitgen), b"BitGenerator", None)
+
+    def _next_uint64(self):
+        if self._index == len(self._buffer):
+            self._buffer = self.stream.random_raw(self.buffer_size)
+            self._index = 0
+        value = int(self._buffer[self._index])
+        self._index += 1
+        return value
+
+    def random_raw(self, size=None):
+        """
+        Inteiros uint64 crus do fluxo, como em `BitGenerator.random_raw`.
+        """
+        if size is None:
+            return self._next_uint64()
+        count = int(np.prod(size))
+        values = self._buffer[self._index : self._index + count]
+        self._index += len(values)
+        if len(values) < count:
+            values = np.concatenate((values, self.stream.random_raw(count - len(values))))
+        return values.reshape(size)
+
+    @property
+    def state(self):
+        """
+        Estado completo (fluxo e buffer ainda não consumido), para checkpoint.
+        """
+        return {
+            "stream": self.stream.state,
+            "buffer": self._buffer.copy(),
+            "index": self._index,
+        }
+
+    @state.setter
+    def state(self, value):
+        self.stream.state = value["stream"]
+        self._buffer = np.array(value["buffer"], dtype=np.uint64)
+        self._index = value["index"]
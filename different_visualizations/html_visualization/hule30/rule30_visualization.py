@@ -6,27 +6,17 @@ import matplotlib.pyplot as plt
 import io
 import base64
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
+from elementary_ca import ElementaryCA
 
-class Rule30Model:
-    def __init__(self, width=128):
-        self.width = width
-        self.state = 1 << (width // 2)
-        self.steps = []
-        self.collect_state()
+# A regra 30 é só um caso do autômato elementar; qualquer regra de 0 a 255 pode ser usada
+class Rule30Model(ElementaryCA):
+    def __init__(self, width=128, rule=30, boundary="fixed"):
+        super().__init__(width, rule, boundary)
 
-    def step(self):
-        next_state = 0
-        for j in range(self.width):
-            left = (self.state >> (j + 1)) & 1
-            center = (self.state >> j) & 1
-            right = (self.state >> (j - 1)) & 1 if j > 0 else 0
-            next_state |= ((left ^ (center | right)) << j)
-        self.state = next_state
-        self.collect_state()
-
-    def collect_state(self):
-        row = [(self.state >> j) & 1 for j in range(self.width - 1, -1, -1)]
-        self.steps.append(row)
+    @property
+    def steps(self):
+        # Histórico desempacotado (uma linha por passo) para o imshow
+        return self.history()
 
 app = Flask(__name__)
 model = Rule30Model(width=128) 
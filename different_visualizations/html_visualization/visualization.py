@@ -1,14 +1,19 @@
 # Import necessary libraries
 import numpy as np
 from mesa import Model
-from mesa.datacollection import DataCollector
 from mesa.space import PropertyLayer
 from scipy.signal import convolve2d
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "shared"))
+from bitlife import BitPackedLife, PackedLayer
+from sparse import ActiveTiles, moore_life_block
+from metrics import MetricsCollector, PopulationCounter
+from trajectory import ReplayModel
 from flask import Flask, render_template_string, jsonify
 import matplotlib
 matplotlib.use('Agg')  # Use a non-GUI backend to avoid threading issues
 import matplotlib.pyplot as plt
-import os
 import io
 import base64
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
@@ -16,36 +21,92 @@ import threading
 import time
 
 class GameOfLifeModel(Model):
-    def __init__(self, width=10, height=10, alive_fraction=0.2):
+    def __init__(self, width=10, height=10, alive_fraction=0.2, backend="convolve"):
         super().__init__()
-        self.cell_layer = PropertyLayer("cells", width, height, False, dtype=bool)
-        self.cell_layer.data = np.random.choice([True, False], size=(width, height), p=[alive_fraction, 1 - alive_fraction])
-
+        # backend "convolve" conta vizinhos com convolve2d; "bitpacked" guarda 64 células por uint64 (BitPackedLife);
+        # "sparse" só calcula os blocos da grade que mudaram recentemente (ActiveTiles)
+        if backend not in ("convolve", "bitpacked", "sparse"):
+            raise ValueError(f"backend desconhecido: {backend!r}")
+        self.backend = backend
         self.cells = width * height
+        if backend == "bitpacked":
+            # O tabuleiro empacotado é a grade: é sorteado já empacotado (semente tirada do np.random global)
+            # e cell_layer.data só desempacota quando alguém lê os pixels (o /plot.png)
+            rng = np.random.default_rng(np.random.randint(0, 2**63, dtype=np.int64))
+            self.board = BitPackedLife.random((width, height), alive_fraction, rng)
+            self.cell_layer = PackedLayer("cells", self.board)
+            alive = self.board.population()
+            self.population = PopulationCounter.from_counts([self.cells - alive, alive])
+        else:
+            self.cell_layer = PropertyLayer("cells", width, height, False, dtype=bool)
+            self.cell_layer.data = np.random.choice([True, False], size=(width, height), p=[alive_fraction, 1 - alive_fraction])
+            self.board = None
+            # Células mortas e vivas: "sparse" soma a variação dos blocos calculados, os outros contam a grade nova
+            self.population = PopulationCounter(self.cell_layer.data)
+        self.tracker = ActiveTiles((width, height), moore_life_block) if backend == "sparse" else None
+
         self.alive_count = 0
         self.alive_fraction = 0
-        self.datacollector = DataCollector(
+        # Fração de blocos calculados no último passo (sempre 1 fora do backend "sparse")
+        self.active_tile_fraction = 1.0
+        self.datacollector = MetricsCollector(
             model_reporters={"Cells alive": "alive_count",
-                             "Fraction alive": "alive_fraction"}
+                             "Fraction alive": "alive_fraction",
+                             "Active tile fraction": "active_tile_fraction"}
         )
         self.datacollector.collect(self)
 
     def step(self):
-        kernel = np.array([[1, 1, 1],
-                           [1, 0, 1],
-                           [1, 1, 1]])
+        if self.backend == "bitpacked":
+            self.board.step()
+            self.population.set(1, self.board.population())
+        elif self.backend == "sparse":
+            self.cell_layer.data = self.tracker.step(self.cell_layer.data)
+            self.active_tile_fraction = self.tracker.active_fraction
+            self.population.apply(self.tracker.delta)
+        else:
+            kernel = np.array([[1, 1, 1],
+                               [1, 0, 1],
+                               [1, 1, 1]])
 
-        neighbor_count = convolve2d(self.cell_layer.data, kernel, mode="same", boundary="wrap")
+            neighbor_count = convolve2d(self.cell_layer.data, kernel, mode="same", boundary="wrap")
 
-        self.cell_layer.data = np.logical_or(
-            np.logical_and(self.cell_layer.data, np.logical_or(neighbor_count == 2, neighbor_count == 3)),
-            np.logical_and(~self.cell_layer.data, neighbor_count == 3)  
-        )
+            self.cell_layer.data = np.logical_or(
+                np.logical_and(self.cell_layer.data, np.logical_or(neighbor_count == 2, neighbor_count == 3)),
+                np.logical_and(~self.cell_layer.data, neighbor_count == 3)  
+            )
+            self.population.set(1, np.count_nonzero(self.cell_layer.data))
 
-        self.alive_count = np.sum(self.cell_layer.data)
-        self.alive_fraction = self.alive_count / self.cells
+        self.alive_count = self.population[1]
+        self.alive_fraction = self.population.fraction(1)
         self.datacollector.collect(self)
 
+    def set_cell(self, x, y, value):
+        """
+        Muda o estado de uma célula (edição pela interface): marca o bloco no
+        backend "sparse" e mantém a contagem de vivas em dia.
+        """
+        value = bool(value)
+        if self.backend == "bitpacked":
+            old = self.board.get_cell(x, y)
+            self.board.set_cell(x, y, value)
+        else:
+            old = bool(self.cell_layer.data[x, y])
+            self.cell_layer.data[x, y] = value
+        if self.tracker is not None:
+            self.tracker.mark(x, y)
+        self.population.move(int(old), int(value))
+        self.alive_count = self.population[1]
+        self.alive_fraction = self.population.fraction(1)
+
+    # Chamado por checkpoint.load_checkpoint depois de restaurar a grade
+    def on_restore(self):
+        if self.backend == "bitpacked":
+            # A grade restaurada já foi empacotada no tabuleiro pelo cell_layer.data
+            self.population.set(1, self.board.population())
+        else:
+            self.population.recount(self.cell_layer.data)
+
 app = Flask(__name__)
 model = GameOfLifeModel(width=20, height=20, alive_fraction=0.3)
 max_steps = 100
@@ -115,4 +176,8 @@ HTML_TEMPLATE = """
 """
 
 if __name__ == "__main__":
+    # python visualization.py arquivo.traj: toca uma trajetória gravada (trajectory.record_model) em vez de rodar o modelo
+    if len(sys.argv) > 1:
+        model = ReplayModel(sys.argv[1])
+        max_steps = len(model.trajectory) - 1
     app.run(debug=True, port=5000)
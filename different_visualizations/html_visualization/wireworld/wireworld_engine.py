@@ -0,0 +1,90 @@
+import numpy as np
+
+EMPTY = 0
+ELECTRON_HEAD = 1
+ELECTRON_TAIL = 2
+CONDUCTOR = 3
+
+# Vizinhança de Moore usada em WireworldModel.step
+OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+class ConductorGraph:
+    """
+    Motor da Wireworld que só trabalha sobre as células de fio.
+
+    Em um circuito da Wireworld as células vazias nunca mudam, então a
+    topologia é extraída uma vez: as células não vazias ganham um índice
+    compacto e a lista de vizinhos de fio de cada uma é guardada no formato
+    CSR (`indptr`, `indices`). O passo conta as cabeças de elétron vizinhas
+    com uma soma acumulada sobre esse array, sem percorrer a grade.
+
+    Args:
+        data (np.array): Grade (width, height) com os estados EMPTY, ELECTRON_HEAD,
+            ELECTRON_TAIL e CONDUCTOR, com wrap nas bordas como no modelo.
+    """
+
+    def __init__(self, data):
+        data = np.asarray(data)
+        self.shape = data.shape
+        width, height = data.shape
+
+        # Índice compacto de cada célula de fio (-1 nas vazias)
+        self.cells = np.flatnonzero(data != EMPTY)
+        index = np.full(data.size, -1, dtype=np.int64)
+        index[self.cells] = np.arange(len(self.cells))
+        index = index.reshape(data.shape)
+
+        # Vizinhos de fio de cada célula, como matriz (n, 8) com -1 onde não há fio
+        xs, ys = np.unravel_index(self.cells, data.shape)
+        neighbors = np.stack(
+            [index[(xs + dx) % width, (ys + dy) % height] for dx, dy in OFFSETS], axis=1
+        )
+        valid = neighbors >= 0
+        self.indptr = np.concatenate(([0], np.cumsum(valid.sum(axis=1))))
+        self.indices = neighbors[valid]
+
+        self.state = data.ravel()[self.cells].astype(np.int8)
+
+    @property
+    def size(self):
+        """
+        Número de células de fio.
+        """
+        return len(self.cells)
+
+    def load(self, data):
+        """
+        Lê os estados das células de fio de uma grade densa com a mesma topologia.
+        """
+        self.state = np.asarray(data).ravel()[self.cells].astype(np.int8)
+
+    def store(self, data):
+        """
+        Escreve os estados das células de fio em uma grade densa (no próprio array).
+        """
+        np.put(data, self.cells, self.state)
+
+    def step(self, generations=1):
+        """
+        Avança `generations` gerações sobre os estados internos.
+        """
+        for _ in range(generations):
+            state = self.state
+            heads = (state == ELECTRON_HEAD)[self.indices]
+            total = np.concatenate(([0], np.cumsum(heads, dtype=np.int64)))
+            head_count = total[self.indptr[1:]] - total[self.indptr[:-1]]
+
+            new_state = state.copy()
+            new_state[state == ELECTRON_HEAD] = ELECTRON_TAIL
+            new_state[state == ELECTRON_TAIL] = CONDUCTOR
+            new_state[(state == CONDUCTOR) & ((head_count == 1) | (head_count == 2))] = ELECTRON_HEAD
+            self.state = new_state
+
+    def to_dense(self, dtype=int):
+        """
+        Retorna a grade densa com os estados atuais.
+        """
+        data = np.full(self.shape, EMPTY, dtype=dtype)
+        self.store(data)
+        return data
@@ -1,6 +1,5 @@
 import numpy as np
 from mesa import Model
-from mesa.datacollection import DataCollector
 from mesa.space import PropertyLayer
 from flask import Flask, render_template_string, jsonify, request
 import matplotlib
@@ -12,6 +11,12 @@ import base64
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 import threading
 import time
+import sys
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "shared"))
+from sparse import ActiveTiles, wireworld_block
+from wireworld_engine import ConductorGraph
+from metrics import MetricsCollector
+from trajectory import ReplayModel
 
 
 EMPTY = 0
@@ -20,7 +25,7 @@ ELECTRON_TAIL = 2
 CONDUCTOR = 3
 
 class WireworldModel(Model):
-    def __init__(self, width=10, height=10, initial_configuration=None):
+    def __init__(self, width=10, height=10, initial_configuration=None, backend="loop"):
         super().__init__()
         self.cell_layer = PropertyLayer("cells", width, height, False, dtype=int)
         if initial_configuration is None:
@@ -28,32 +33,70 @@ class WireworldModel(Model):
         else:
             self.cell_layer.data = np.array(initial_configuration)
 
-        self.datacollector = DataCollector(
-            model_reporters={"State": lambda m: m.cell_layer.data.copy()}
+        # backend "loop" percorre célula por célula; "sparse" só calcula os blocos que mudaram recentemente;
+        # "conductors" só calcula as células de fio, com a vizinhança pré-calculada (ConductorGraph)
+        if backend not in ("loop", "sparse", "conductors"):
+            raise ValueError(f"backend desconhecido: {backend!r}")
+        self.backend = backend
+        self.tracker = ActiveTiles(self.cell_layer.data.shape, wireworld_block) if backend == "sparse" else None
+        # O grafo de condutores é montado no primeiro passo e refeito quando o circuito é editado
+        self.graph = None
+        self._graph_source = None
+        # Fração de blocos calculados no último passo (sempre 1 fora do backend "sparse")
+        self.active_tile_fraction = 1.0
+
+        # A grade é guardada só como diferença em relação ao passo anterior (deltas), não uma cópia inteira por passo
+        self.datacollector = MetricsCollector(
+            model_reporters={"Active tile fraction": "active_tile_fraction"},
+            snapshot_reporters={"State": lambda m: m.cell_layer.data},
+            deltas=True,
         )
         self.datacollector.collect(self)
 
     def step(self):
-        new_data = self.cell_layer.data.copy()
-        for x in range(self.cell_layer.data.shape[0]):
-            for y in range(self.cell_layer.data.shape[1]):
-                cell = self.cell_layer.data[x, y]
-                if cell == ELECTRON_HEAD:
-                    new_data[x, y] = ELECTRON_TAIL
-                elif cell == ELECTRON_TAIL:
-                    new_data[x, y] = CONDUCTOR
-                elif cell == CONDUCTOR:
-                    neighbors = [
-                        self.cell_layer.data[(x + dx) % self.cell_layer.data.shape[0], (y + dy) % self.cell_layer.data.shape[1]]
-                        for dx, dy in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-                    ]
-                    electron_head_count = neighbors.count(ELECTRON_HEAD)
-                    if electron_head_count == 1 or electron_head_count == 2:
-                        new_data[x, y] = ELECTRON_HEAD
-        
-        self.cell_layer.data = new_data
+        if self.backend == "sparse":
+            self.cell_layer.data = self.tracker.step(self.cell_layer.data)
+            self.active_tile_fraction = self.tracker.active_fraction
+        elif self.backend == "conductors":
+            data = self.cell_layer.data
+            if self.graph is None or self._graph_source is not data:
+                self.graph = ConductorGraph(data)
+                self._graph_source = data
+            else:
+                self.graph.load(data)
+            self.graph.step()
+            self.graph.store(data)
+        else:
+            new_data = self.cell_layer.data.copy()
+            for x in range(self.cell_layer.data.shape[0]):
+                for y in range(self.cell_layer.data.shape[1]):
+                    cell = self.cell_layer.data[x, y]
+                    if cell == ELECTRON_HEAD:
+                        new_data[x, y] = ELECTRON_TAIL
+                    elif cell == ELECTRON_TAIL:
+                        new_data[x, y] = CONDUCTOR
+                    elif cell == CONDUCTOR:
+                        neighbors = [
+                            self.cell_layer.data[(x + dx) % self.cell_layer.data.shape[0], (y + dy) % self.cell_layer.data.shape[1]]
+                            for dx, dy in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+                        ]
+                        electron_head_count = neighbors.count(ELECTRON_HEAD)
+                        if electron_head_count == 1 or electron_head_count == 2:
+                            new_data[x, y] = ELECTRON_HEAD
+
+            self.cell_layer.data = new_data
         self.datacollector.collect(self)
 
+    def mark_changed(self, x, y):
+        # Avisa os backends "sparse" e "conductors" de uma edição manual na célula (x, y)
+        if self.tracker is not None:
+            self.tracker.mark(x, y)
+        self.graph = None
+
+    # Chamado por checkpoint.load_checkpoint: o grafo de condutores é refeito a partir da grade restaurada
+    def on_restore(self):
+        self.graph = None
+
 app = Flask(__name__)
 model = WireworldModel(width=20, height=20)
 max_steps = 100
@@ -76,6 +119,7 @@ def toggle_cell():
         model.cell_layer.data[x, y] = ELECTRON_TAIL
     elif current_state == ELECTRON_TAIL:
         model.cell_layer.data[x, y] = EMPTY
+    model.mark_changed(x, y)
     return jsonify(success=True)
 
 @app.route('/step')
@@ -162,4 +206,9 @@ HTML_TEMPLATE = """
 """
 
 if __name__ == "__main__":
+    # python wireworld_visualization.py arquivo.traj: toca uma trajetória gravada em vez de rodar o modelo
+    if len(sys.argv) > 1:
+        model = ReplayModel(sys.argv[1])
+        model.mark_changed = lambda x, y: None
+        max_steps = len(model.trajectory) - 1
     app.run(debug=True, port=5000)
@@ -0,0 +1,210 @@
+import numpy as np
+
+# Quantidade de linhas processadas por vez no passo. Limita o tamanho dos arrays temporários
+BAND_ROWS = 1024
+
+
+class BitPackedLife:
+    """
+    Jogo da Vida de Conway em uma grade toroidal guardando 64 células por palavra uint64.
+
+    A grade segue o mesmo layout do `cell_layer.data` dos modelos: `data[x, y]`,
+    com `width` linhas (x) e `height` colunas (y). Cada linha x é empacotada em
+    ceil(height / 64) palavras; o bit j da palavra k representa y = 64 * k + j.
+    A próxima geração é calculada com somadores completos bit a bit sobre as
+    linhas deslocadas, sem contar vizinhos célula por célula.
+
+    Para grades enormes, `BitPackedLife.random` cria o tabuleiro já empacotado,
+    sem nunca alocar a grade densa.
+
+    Args:
+        data (np.array): Grade inicial (bool ou 0/1) de formato (width, height).
+    """
+
+    def __init__(self, data):
+        data = np.asarray(data, dtype=bool)
+        self._init_shape(*data.shape)
+        self.board = self.pack(data)
+
+    def _init_shape(self, width, height):
+        self.width, self.height = width, height
+        self.words = -(-self.height // 64)
+        # Bits além de `height` na última palavra de cada linha ficam sempre zerados
+        self.tail_bits = self.height - 64 * (self.words - 1)
+        self.tail_mask = np.uint64((1 << self.tail_bits) - 1)
+
+    @classmethod
+    def random(cls, shape, fraction, rng=None, precision=32):
+        """
+        Tabuleiro aleatório em que cada célula está viva com probabilidade
+        `fraction`, preenchido direto nas palavras uint64.
+
+        Cada bit sai da expansão binária de `fraction` (0.b1 b2 ... bk):
+        partindo de zero, para cada dígito, do último ao primeiro, a palavra
+        vira `x | r` (dígito 1) ou `x & r` (dígito 0) com uma palavra
+        aleatória `r`, o que dá a probabilidade exata com `precision` bits.
+        O preenchimento é feito em faixas de BAND_ROWS linhas, então a memória
+        extra não depende do tamanho da grade.
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        life = cls.__new__(cls)
+        life._init_shape(*shape)
+        # Dígitos binários de `fraction`, sem os zeros do fim (que não mudam o resultado)
+        digits = [int(fraction * (1 << (i + 1))) & 1 for i in range(precision)]
+        while digits and not digits[-1]:
+            digits.pop()
+        if fraction >= 1:
+            digits = None
+
+        life.board = np.zeros((life.width, life.words), dtype=np.uint64)
+        max_word = np.iinfo(np.uint64).max
+        for start in range(0, life.width, BAND_ROWS):
+            band = life.board[start : start + BAND_ROWS]
+            if digits is None:
+                band[:] = max_word
+            for digit in reversed(digits or []):
+                words = rng.integers(0, max_word, size=band.shape, dtype=np.uint64, endpoint=True)
+                if digit:
+                    band |= words
+                else:
+                    band &= words
+        life.board[:, -1] &= life.tail_mask
+        return life
+
+    def pack(self, data):
+        """
+        Converte uma grade densa de bool para o formato empacotado.
+        """
+        padded = np.zeros((self.width, self.words * 64), dtype=bool)
+        padded[:, : self.height] = data
+        packed = np.packbits(padded, axis=1, bitorder="little")
+        return packed.view("<u8").astype(np.uint64, copy=False)
+
+    def to_dense(self):
+        """
+        Retorna a grade atual como array bool de formato (width, height).
+        """
+        as_bytes = self.board.astype("<u8", copy=False).view(np.uint8)
+        bits = np.unpackbits(as_bytes, axis=1, bitorder="little")
+        # view em vez de astype: um único array de 1 byte por célula, sem cópia extra
+        return bits[:, : self.height].view(bool)
+
+    def get_cell(self, x, y):
+        """
+        Estado da célula (x, y), lido direto da palavra que a guarda.
+        """
+        word, bit = divmod(int(y), 64)
+        return bool((int(self.board[x, word]) >> bit) & 1)
+
+    def set_cell(self, x, y, value):
+        """
+        Muda o estado da célula (x, y) sem desempacotar a grade.
+        """
+        word, bit = divmod(int(y), 64)
+        mask = np.uint64(1 << bit)
+        if value:
+            self.board[x, word] |= mask
+        else:
+            self.board[x, word] &= ~mask
+
+    def population(self):
+        """
+        Número de células vivas.
+        """
+        if hasattr(np, "bitwise_count"):
+            return int(np.bitwise_count(self.board).sum(dtype=np.int64))
+        total = 0
+        for start in range(0, self.width, BAND_ROWS):
+            band = self.board[start : start + BAND_ROWS]
+            total += int(np.unpackbits(band.view(np.uint8)).sum(dtype=np.int64))
+        return total
+
+    def step(self, generations=1):
+        """
+        Avança a grade `generations` gerações.
+        """
+        new_board = np.empty_like(self.board)
+        for _ in range(generations):
+            for start in range(0, self.width, BAND_ROWS):
+                stop = min(start + BAND_ROWS, self.width)
+                # Linhas da faixa com uma linha extra acima e abaixo (com wrap)
+                rows = np.arange(start - 1, stop + 1) % self.width
+                new_board[start:stop] = self._next_band(self.board[rows])
+            self.board, new_board = new_board, self.board
+
+    def _shift_west(self, rows):
+        # Bit em y recebe a célula de y - 1
+        shifted = rows << np.uint64(1)
+        shifted[:, 1:] |= rows[:, :-1] >> np.uint64(63)
+        last = (rows[:, -1] >> np.uint64(self.tail_bits - 1)) & np.uint64(1)
+        shifted[:, 0] |= last
+        shifted[:, -1] &= self.tail_mask
+        return shifted
+
+    def _shift_east(self, rows):
+        # Bit em y recebe a célula de y + 1
+        shifted = rows >> np.uint64(1)
+        shifted[:, :-1] |= rows[:, 1:] << np.uint64(63)
+        first = rows[:, 0] & np.uint64(1)
+        shifted[:, -1] |= first << np.uint64(self.tail_bits - 1)
+        return shifted
+
+    def _next_band(self, rows):
+        west = self._shift_west(rows)
+        east = self._shift_east(rows)
+
+        # Soma horizontal de 3 células em cada linha (bits de peso 1 e 2)
+        ones = west ^ rows ^ east
+        twos = (west & rows) | (east & (west ^ rows))
+        # Na linha central a própria célula não conta, só oeste e leste
+        center_ones = west[1:-1] ^ east[1:-1]
+        center_twos = west[1:-1] & east[1:-1]
+
+        up_ones, up_twos = ones[:-2], twos[:-2]
+        down_ones, down_twos = ones[2:], twos[2:]
+
+        # Soma dos bits de peso 1 (somador completo)
+        sum_ones = up_ones ^ down_ones ^ center_ones
+        carry = (up_ones & down_ones) | (center_ones & (up_ones ^ down_ones))
+        # Soma dos bits de peso 2 mais o vai-um
+        partial = up_twos ^ down_twos ^ center_twos
+        fours = (up_twos & down_twos) | (center_twos & (up_twos ^ down_twos))
+        sum_twos = partial ^ carry
+        fours_carry = partial & carry
+        # Peso 4 ou 8 ligado significa 4 ou mais vizinhos
+        four_or_more = fours | fours_carry
+
+        alive = rows[1:-1]
+        # Exatamente 2 ou 3 vizinhos: vive se tem 3, ou se tem 2 e já estava viva
+        return sum_twos & ~four_or_more & (sum_ones | alive)
+
+
+class PackedLayer:
+    """
+    Camada com a interface do PropertyLayer do mesa (`name` e `data`) sobre um
+    BitPackedLife, para o backend "bitpacked" dos modelos. O tabuleiro
+    empacotado é a única cópia da grade: `data` desempacota a grade a cada
+    leitura (só quando uma visualização precisa dos pixels) e atribuir a
+    `data` empacota a grade nova no tabuleiro. Escrever em células do array
+    devolvido não altera o tabuleiro.
+    """
+
+    def __init__(self, name, life):
+        self.name = name
+        self.life = life
+
+    @property
+    def width(self):
+        return self.life.width
+
+    @property
+    def height(self):
+        return self.life.height
+
+    @property
+    def data(self):
+        return self.life.to_dense()
+
+    @data.setter
+    def data(self, value):
+        self.life.board = self.life.pack(np.asarray(value, dtype=bool))
@@ -0,0 +1,102 @@
+import json
+import os
+import random
+
+import numpy as np
+
+# Tipos de atributo guardados como escalares (no JSON do checkpoint)
+SCALARS = (bool, int, float, str, type(None), np.bool_, np.integer, np.floating)
+
+
+def _is_layer(value):
+    # PropertyLayer do mesa (ou qualquer objeto com a grade em .data)
+    return isinstance(getattr(value, "data", None), np.ndarray)
+
+
+def _number_dict(value):
+    # Dicionários como {número de vizinhos: probabilidade}, guardados como lista de pares
+    return isinstance(value, dict) and all(
+        isinstance(k, SCALARS) and isinstance(v, SCALARS) for k, v in value.items()
+    )
+
+
+def _plain(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def save_checkpoint(model, path, global_rng=True):
+    """
+    Salva o estado completo do modelo em `path` (.npz sem compressão, rápido de ler e escrever):
+    todos os arrays e camadas (cell_layer, age_layer, time_no_eat, grid...), contadores e
+    parâmetros escalares, dicionários de probabilidades e o estado dos geradores aleatórios
+    (`model.rng`, `model.random` do mesa e, com `global_rng`, o `np.random` global, usado
+    pelos modelos que sorteiam com np.random.*).
+
+    O arquivo é escrito em um temporário e renomeado, então um checkpoint
+    antigo nunca é perdido por uma falha no meio da gravação.
+    """
+    arrays = {}
+    info = {"scalars": {}, "dicts": {}, "layers": [], "generators": {}}
+    for name, value in vars(model).items():
+        if isinstance(value, np.random.Generator):
+            info["generators"][name] = value.bit_generator.state
+        elif isinstance(value, random.Random):
+            info["generators"][name] = value.getstate()
+        elif isinstance(value, np.ndarray):
+            arrays[name] = value
+        elif _is_layer(value):
+            arrays[name] = value.data
+            info["layers"].append(name)
+        elif isinstance(value, SCALARS):
+            info["scalars"][name] = _plain(value)
+        elif _number_dict(value):
+            info["dicts"][name] = [[_plain(k), _plain(v)] for k, v in value.items()]
+
+    if global_rng:
+        kind, keys, pos, has_gauss, cached = np.random.get_state()
+        arrays["__np_random_keys__"] = keys
+        info["np_random"] = [kind, int(pos), int(has_gauss), float(cached)]
+
+    arrays["__info__"] = np.array(json.dumps(info))
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(model, path):
+    """
+    Restaura em `model` (já criado com o mesmo tamanho de grade) um estado
+    salvo com save_checkpoint. A continuação é idêntica bit a bit à execução
+    original. Se o modelo tiver o método `on_restore()`, ele é chamado no fim
+    para refazer estruturas derivadas da grade (backends bitpacked, sparse...).
+    """
+    with np.load(path) as data:
+        info = json.loads(str(data["__info__"]))
+        for name in data.files:
+            if name.startswith("__"):
+                continue
+            if name in info["layers"]:
+                getattr(model, name).data = data[name]
+            else:
+                setattr(model, name, data[name])
+        keys = data["__np_random_keys__"] if "np_random" in info else None
+
+    for name, value in info["scalars"].items():
+        setattr(model, name, value)
+    for name, pairs in info["dicts"].items():
+        setattr(model, name, {k: v for k, v in pairs})
+    for name, state in info["generators"].items():
+        generator = getattr(model, name)
+        if isinstance(generator, random.Random):
+            version, internal, gauss = state
+            generator.setstate((version, tuple(internal), gauss))
+        else:
+            generator.bit_generator.state = state
+    if keys is not None:
+        kind, pos, has_gauss, cached = info["np_random"]
+        np.random.set_state((kind, keys, pos, has_gauss, cached))
+
+    if hasattr(model, "on_restore"):
+        model.on_restore()
+    return model
@@ -0,0 +1,309 @@
+import numpy as np
+
+# Estimativa de memória ocupada por nó (objeto + entrada na tabela + cache de sucessores)
+NODE_BYTES = 256
+
+# Estados da Wireworld, os mesmos de wireworld_visualization.py
+EMPTY = 0
+ELECTRON_HEAD = 1
+ELECTRON_TAIL = 2
+CONDUCTOR = 3
+
+
+def conway(cell, neighbors):
+    """
+    Regra de Conway: `neighbors` é a lista com os estados dos 8 vizinhos.
+    """
+    count = sum(neighbors)
+    if cell:
+        return 1 if count in (2, 3) else 0
+    return 1 if count == 3 else 0
+
+
+def wireworld(cell, neighbors):
+    """
+    Regra da Wireworld, igual à de WireworldModel.step.
+    """
+    if cell == ELECTRON_HEAD:
+        return ELECTRON_TAIL
+    if cell == ELECTRON_TAIL:
+        return CONDUCTOR
+    if cell == CONDUCTOR:
+        heads = neighbors.count(ELECTRON_HEAD)
+        return ELECTRON_HEAD if heads in (1, 2) else CONDUCTOR
+    return EMPTY
+
+
+class Node:
+    """
+    Nó da quadtree. Um nó de nível k representa um quadrado de 2^k x 2^k células,
+    dividido em quatro filhos de nível k - 1 (nw, ne, sw, se). Folhas (nível 0)
+    guardam o estado de uma célula em `state`.
+    """
+
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population", "state")
+
+    def __init__(self, level, nw=None, ne=None, sw=None, se=None, state=0):
+        self.level = level
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.state = state
+        if level == 0:
+            self.population = 1 if state else 0
+        else:
+            self.population = nw.population + ne.population + sw.population + se.population
+
+
+class HashLife:
+    """
+    Motor HashLife (quadtree com memoização) para regras determinísticas de
+    vizinhança de Moore, como Conway e Wireworld.
+
+    Diferente dos modelos com `PropertyLayer`, o universo aqui é infinito (sem
+    wrap nas bordas): a grade importada é colocada a partir da coordenada
+    (0, 0) e a exportação recorta uma janela desse universo. O layout segue o
+    `cell_layer.data` dos modelos, `data[x, y]`.
+
+    Args:
+        rule (callable): Função `rule(cell, neighbors)` que devolve o próximo estado.
+            O estado 0 deve ser o vazio e continuar vazio sem vizinhos vivos.
+        max_memory_mb (float): Teto aproximado de memória dos nós. Quando é
+            ultrapassado, os caches são limpos e só os nós ainda usados pela
+            grade atual são mantidos.
+    """
+
+    def __init__(self, rule=conway, max_memory_mb=512):
+        self.rule = rule
+        self.max_nodes = int(max_memory_mb * 2**20 // NODE_BYTES)
+        self._table = {}
+        self._results = {}
+        self._leaves = {}
+        self._empty = []
+        self.root = self._empty_node(3)
+        # Coordenada (x, y) do canto superior esquerdo da raiz
+        self.origin = (-4, -4)
+        self.shape = (0, 0)
+        self.generation = 0
+
+    # Construção de nós
+
+    def _leaf(self, state):
+        state = int(state)
+        if state not in self._leaves:
+            self._leaves[state] = Node(0, state=state)
+        return self._leaves[state]
+
+    def _join(self, nw, ne, sw, se):
+        key = (nw, ne, sw, se)
+        node = self._table.get(key)
+        if node is None:
+            node = Node(nw.level + 1, nw, ne, sw, se)
+            self._table[key] = node
+        return node
+
+    def _empty_node(self, level):
+        while len(self._empty) <= level:
+            if not self._empty:
+                self._empty.append(self._leaf(0))
+            else:
+                child = self._empty[-1]
+                self._empty.append(self._join(child, child, child, child))
+        return self._empty[level]
+
+    def _centre(self, node):
+        # Coloca o nó no centro de um nó vazio de nível acima
+        empty = self._empty_node(node.level - 1)
+        return self._join(
+            self._join(empty, empty, empty, node.nw),
+            self._join(empty, empty, node.ne, empty),
+            self._join(empty, node.sw, empty, empty),
+            self._join(node.se, empty, empty, empty),
+        )
+
+    def _inner(self, node):
+        # Subnó central de nível k - 1
+        return self._join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    # Evolução
+
+    def _base(self, node):
+        # Nó 4x4: calcula o centro 2x2 uma geração à frente
+        cells = [
+            [node.nw.nw.state, node.nw.ne.state, node.ne.nw.state, node.ne.ne.state],
+            [node.nw.sw.state, node.nw.se.state, node.ne.sw.state, node.ne.se.state],
+            [node.sw.nw.state, node.sw.ne.state, node.se.nw.state, node.se.ne.state],
+            [node.sw.sw.state, node.sw.se.state, node.se.sw.state, node.se.se.state],
+        ]
+        new = []
+        for r in (1, 2):
+            for c in (1, 2):
+                neighbors = [
+                    cells[r + dr][c + dc]
+                    for dr in (-1, 0, 1)
+                    for dc in (-1, 0, 1)
+                    if dr or dc
+                ]
+                new.append(self._leaf(self.rule(cells[r][c], neighbors)))
+        return self._join(*new)
+
+    def _successor(self, node, j):
+        # Centro (nível k - 1) do nó de nível k depois de 2^j gerações, com j <= k - 2
+        if node.population == 0:
+            return node.nw
+        j = min(j, node.level - 2)
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._base(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            c1 = self._successor(nw, j)
+            c2 = self._successor(self._join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c3 = self._successor(ne, j)
+            c4 = self._successor(self._join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c5 = self._successor(self._join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c6 = self._successor(self._join(ne.sw, ne.se, se.nw, se.ne), j)
+            c7 = self._successor(sw, j)
+            c8 = self._successor(self._join(sw.ne, se.nw, sw.se, se.sw), j)
+            c9 = self._successor(se, j)
+            if j < node.level - 2:
+                # Os filhos já andaram 2^j gerações: basta recortar o centro
+                result = self._join(
+                    self._join(c1.se, c2.sw, c4.ne, c5.nw),
+                    self._join(c2.se, c3.sw, c5.ne, c6.nw),
+                    self._join(c4.se, c5.sw, c7.ne, c8.nw),
+                    self._join(c5.se, c6.sw, c8.ne, c9.nw),
+                )
+            else:
+                # Passo completo: mais 2^(k-3) gerações sobre os resultados intermediários
+                result = self._join(
+                    self._successor(self._join(c1, c2, c4, c5), j),
+                    self._successor(self._join(c2, c3, c5, c6), j),
+                    self._successor(self._join(c4, c5, c7, c8), j),
+                    self._successor(self._join(c5, c6, c8, c9), j),
+                )
+        self._results[key] = result
+        return result
+
+    def _expand(self, min_level):
+        # Aumenta a raiz até ter o nível pedido e uma borda vazia em volta do padrão
+        root = self.root
+        x, y = self.origin
+        while (
+            root.level < min_level
+            or self._inner(self._inner(root)).population != root.population
+        ):
+            x -= 2 ** (root.level - 1)
+            y -= 2 ** (root.level - 1)
+            root = self._centre(root)
+        self.root = root
+        self.origin = (x, y)
+
+    def _jump(self, j):
+        # Avança a raiz 2^j gerações. Com nível >= j + 3 e o padrão no quarto
+        # central, mesmo crescendo 1 célula por geração ele não sai do resultado
+        self._expand(j + 3)
+        offset = 2 ** (self.root.level - 2)
+        self.root = self._successor(self.root, j)
+        self.origin = (self.origin[0] + offset, self.origin[1] + offset)
+        self.generation += 2**j
+        if len(self._table) > self.max_nodes:
+            self.collect_garbage()
+
+    def advance(self, generations):
+        """
+        Avança `generations` gerações, saltando em potências de 2.
+        """
+        j = 0
+        while generations:
+            if generations & 1:
+                self._jump(j)
+            generations >>= 1
+            j += 1
+
+    def collect_garbage(self):
+        """
+        Descarta os caches e os nós que não fazem parte da grade atual.
+        """
+        table = {}
+        stack = [self.root] + self._empty
+        seen = set()
+        while stack:
+            node = stack.pop()
+            if node.level == 0 or id(node) in seen:
+                continue
+            seen.add(id(node))
+            table[(node.nw, node.ne, node.sw, node.se)] = node
+            stack.extend((node.nw, node.ne, node.sw, node.se))
+        self._table = table
+        self._results = {}
+
+    @property
+    def population(self):
+        """
+        Número de células não vazias.
+        """
+        return self.root.population
+
+    @property
+    def memory_nodes(self):
+        """
+        Número de nós guardados na tabela (para acompanhar o teto de memória).
+        """
+        return len(self._table)
+
+    # Importação e exportação para arrays densos
+
+    def _build(self, data, level):
+        if level == 0:
+            return self._leaf(data[0, 0])
+        if not data.any():
+            return self._empty_node(level)
+        half = 2 ** (level - 1)
+        return self._join(
+            self._build(data[:half, :half], level - 1),
+            self._build(data[:half, half:], level - 1),
+            self._build(data[half:, :half], level - 1),
+            self._build(data[half:, half:], level - 1),
+        )
+
+    def load(self, data):
+        """
+        Substitui o universo por uma grade densa (por exemplo `model.cell_layer.data`).
+        """
+        data = np.asarray(data)
+        self.shape = data.shape
+        level = max(3, int(np.ceil(np.log2(max(data.shape + (1,))))))
+        padded = np.zeros((2**level, 2**level), dtype=np.int64)
+        padded[: data.shape[0], : data.shape[1]] = data
+        self.root = self._build(padded, level)
+        self.origin = (0, 0)
+        self.generation = 0
+
+    def _fill(self, node, x, y, out, x0, y0):
+        # Copia o nó (canto em x, y) para `out`, cuja posição (0, 0) é (x0, y0)
+        size = 2**node.level
+        if node.population == 0:
+            return
+        if x >= x0 + out.shape[0] or y >= y0 + out.shape[1] or x + size <= x0 or y + size <= y0:
+            return
+        if node.level == 0:
+            out[x - x0, y - y0] = node.state
+            return
+        half = size // 2
+        self._fill(node.nw, x, y, out, x0, y0)
+        self._fill(node.ne, x, y + half, out, x0, y0)
+        self._fill(node.sw, x + half, y, out, x0, y0)
+        self._fill(node.se, x + half, y + half, out, x0, y0)
+
+    def to_dense(self, shape=None, origin=(0, 0), dtype=int):
+        """
+        Exporta a janela de formato `shape` (padrão: o da grade carregada)
+        começando em `origin` como array denso.
+        """
+        shape = self.shape if shape is None else shape
+        out = np.zeros(shape, dtype=dtype)
+        self._fill(self.root, self.origin[0], self.origin[1], out, origin[0], origin[1])
+        return out
@@ -0,0 +1,87 @@
+import numpy as np
+from scipy import stats
+
+# Cache global das tabelas já construídas, indexado por (distribuição, parâmetros)
+_tables = {}
+
+
+class HazardTable:
+    """
+    Probabilidade de morte por passo em função da idade (inteira) da célula.
+
+    A tabela é pré-calculada para as idades 0..N e cresce sob demanda quando
+    aparece uma idade maior, de forma que a consulta no passo do modelo é só
+    uma indexação de array, sem chamadas ao scipy por célula.
+
+    Args:
+        cdf (callable): Função que recebe um array de idades e devolve a
+            probabilidade de morte para cada uma.
+        size (int): Número inicial de idades pré-calculadas.
+    """
+
+    def __init__(self, cdf, size=256):
+        self.cdf = cdf
+        self.table = np.asarray(cdf(np.arange(size)), dtype=float)
+
+    def grow(self, size):
+        """
+        Garante que a tabela cubra as idades 0..size-1 (dobrando o tamanho).
+        """
+        if size <= len(self.table):
+            return
+        new_size = max(size, 2 * len(self.table))
+        self.table = np.asarray(self.cdf(np.arange(new_size)), dtype=float)
+
+    def lookup(self, ages):
+        """
+        Retorna a probabilidade de morte para cada idade do array `ages`.
+        """
+        ages = np.asarray(ages)
+        if ages.size:
+            self.grow(int(ages.max()) + 1)
+        return self.table[ages]
+
+
+def _get(key, cdf):
+    if key not in _tables:
+        _tables[key] = HazardTable(cdf)
+    return _tables[key]
+
+
+def exponential(lamb):
+    """
+    Tabela da distribuição exponencial, equivalente a expon.cdf(idade, scale=lamb).
+    """
+    return _get(("expon", lamb), lambda ages: stats.expon.cdf(ages, scale=lamb))
+
+
+def weibull(shape, scale):
+    """
+    Tabela da distribuição de Weibull (shape < 1: mortalidade infantil, shape > 1: envelhecimento).
+    """
+    return _get(
+        ("weibull", shape, scale),
+        lambda ages: stats.weibull_min.cdf(ages, shape, scale=scale),
+    )
+
+
+def gamma(shape, scale):
+    """
+    Tabela da distribuição gama.
+    """
+    return _get(
+        ("gamma", shape, scale),
+        lambda ages: stats.gamma.cdf(ages, shape, scale=scale),
+    )
+
+
+def empirical(probabilities):
+    """
+    Tabela a partir de uma lista de probabilidades por idade (medidas ou definidas à mão).
+    Idades além do fim da lista usam o último valor.
+    """
+    probabilities = np.asarray(probabilities, dtype=float)
+    return _get(
+        ("empirical", probabilities.tobytes()),
+        lambda ages: probabilities[np.minimum(ages, len(probabilities) - 1)],
+    )
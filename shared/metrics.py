@@ -0,0 +1,247 @@
+import numpy as np
+
+
+def _reporter(value):
+    # Como no DataCollector do mesa: string é o nome de um atributo do modelo, senão uma função(model)
+    if isinstance(value, str):
+        return lambda model: getattr(model, value)
+    return value
+
+
+class MetricsCollector:
+    """
+    Substituto leve do `DataCollector` do mesa, com a mesma chamada
+    `collect(model)` a cada passo.
+
+    Os valores escalares ficam em arrays numpy pré-alocados (que dobram de
+    tamanho quando enchem) ou, com `capacity`, em um buffer circular com as
+    últimas `capacity` coletas. Grades inteiras (snapshots) só são guardadas a
+    cada `snapshot_stride` coletas e, com `deltas=True`, só as células que
+    mudaram desde o snapshot anterior. Assim execuções de milhões de passos
+    não esgotam a memória.
+
+    Args:
+        model_reporters (dict): Nome -> atributo do modelo (str) ou função(model) que devolve um escalar.
+        snapshot_reporters (dict): Nome -> atributo ou função que devolve um array (por exemplo a grade).
+        snapshot_stride (int): Intervalo, em coletas, entre dois snapshots.
+        deltas (bool): Guarda cada snapshot como diferença (índices e valores) em relação ao anterior.
+        capacity (int): Tamanho do buffer circular dos escalares. Padrão: sem limite.
+    """
+
+    def __init__(
+        self,
+        model_reporters=None,
+        snapshot_reporters=None,
+        snapshot_stride=1,
+        deltas=False,
+        capacity=None,
+    ):
+        self.model_reporters = {name: _reporter(r) for name, r in (model_reporters or {}).items()}
+        self.snapshot_reporters = {name: _reporter(r) for name, r in (snapshot_reporters or {}).items()}
+        self.snapshot_stride = snapshot_stride
+        self.deltas = deltas
+        self.capacity = capacity
+        self.count = 0
+
+        size = capacity or 64
+        self._steps = np.zeros(size, dtype=np.int64)
+        self._columns = {}
+        self._snapshots = {name: _SnapshotStore(deltas) for name in self.snapshot_reporters}
+
+    def collect(self, model):
+        """
+        Registra os valores atuais do modelo.
+        """
+        i = self.count % self.capacity if self.capacity else self.count
+        if i == len(self._steps):
+            self._grow(2 * len(self._steps))
+        self._steps[i] = self.count
+        for name, reporter in self.model_reporters.items():
+            value = reporter(model)
+            dtype = np.asarray(value).dtype
+            column = self._columns.get(name)
+            if column is None:
+                column = self._columns[name] = np.zeros(len(self._steps), dtype=dtype)
+            elif not np.can_cast(dtype, column.dtype, "same_kind"):
+                # Um atributo que começa inteiro (por exemplo alive_fraction = 0) e depois vira float
+                column = self._columns[name] = column.astype(np.result_type(column.dtype, dtype))
+            column[i] = value
+
+        if self.count % self.snapshot_stride == 0:
+            for name, reporter in self.snapshot_reporters.items():
+                self._snapshots[name].append(self.count, reporter(model))
+        self.count += 1
+
+    def _grow(self, size):
+        self._steps = np.resize(self._steps, size)
+        for name, column in self._columns.items():
+            self._columns[name] = np.resize(column, size)
+
+    def __len__(self):
+        return min(self.count, self.capacity) if self.capacity else self.count
+
+    def to_arrays(self):
+        """
+        Dicionário {"step": ..., nome: ...} com os escalares coletados, do mais
+        antigo ao mais recente. Sem buffer circular (ou antes de ele dar a
+        volta) os arrays são visões dos buffers internos, sem cópia.
+        """
+        n = len(self)
+        arrays = {"step": self._steps[:n]}
+        arrays.update({name: column[:n] for name, column in self._columns.items()})
+        if self.capacity and self.count > self.capacity:
+            start = self.count % self.capacity
+            arrays = {name: np.roll(values, -start) for name, values in arrays.items()}
+        return arrays
+
+    def get_model_vars_dataframe(self):
+        """
+        DataFrame do pandas com os escalares, indexado pelo número da coleta
+        (mesmo nome do método do DataCollector).
+        """
+        import pandas as pd
+
+        arrays = self.to_arrays()
+        return pd.DataFrame(arrays, index=arrays.pop("step"), copy=False)
+
+    def to_arrow(self):
+        """
+        Tabela do pyarrow com os escalares (pyarrow é opcional).
+        """
+        import pyarrow as pa
+
+        return pa.table(self.to_arrays())
+
+    def snapshot_steps(self, name):
+        """
+        Números das coletas em que o snapshot `name` foi guardado.
+        """
+        return self._snapshots[name].steps_array()
+
+    def get_snapshot(self, name, index=-1):
+        """
+        Snapshot `name` de número `index` (na ordem de snapshot_steps).
+        """
+        return self._snapshots[name].get(index)
+
+
+class _SnapshotStore:
+    # Guarda os snapshots de um reporter: inteiros, ou o primeiro inteiro e os seguintes como diferenças
+
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.steps = []
+        self.frames = []
+        # Diferenças: índices (no array achatado) e novos valores, concatenados; offsets[k] é o início da k-ésima
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.values = None
+        self.offsets = [0]
+        self.size = 0
+        self._previous = None
+
+    def append(self, step, value):
+        value = np.array(value, copy=True)
+        self.steps.append(step)
+        if not self.deltas or self._previous is None:
+            self.frames.append(value)
+            self._previous = value
+            if self.deltas:
+                self.values = np.zeros(0, dtype=value.dtype)
+            return
+
+        changed = np.flatnonzero(value != self._previous)
+        end = self.size + len(changed)
+        if end > len(self.indices):
+            self.indices = np.resize(self.indices, max(end, 2 * len(self.indices), 64))
+            self.values = np.resize(self.values, len(self.indices))
+        self.indices[self.size:end] = changed
+        self.values[self.size:end] = value.ravel()[changed]
+        self.size = end
+        self.offsets.append(end)
+        self._previous = value
+
+    def steps_array(self):
+        return np.array(self.steps, dtype=np.int64)
+
+    def get(self, index):
+        index = range(len(self.steps))[index]
+        if not self.deltas:
+            return self.frames[index]
+        frame = self.frames[0].copy()
+        flat = frame.reshape(-1)
+        for start, end in zip(self.offsets[:index], self.offsets[1 : index + 1]):
+            flat[self.indices[start:end]] = self.values[start:end]
+        return frame
+
+
+class PopulationCounter:
+    """
+    Número de células em cada estado da grade, mantido de forma incremental:
+    o modelo informa as mudanças que já calcula no passo (nascimentos, mortes,
+    conversões) em vez de varrer a grade inteira. A contagem completa
+    (`recount`) só é necessária depois de edições externas na grade.
+
+    A leitura é barata e somente leitura: `population[estado]`,
+    `population.fraction(estado)` e `population.counts` (array não gravável).
+
+    Args:
+        grid (np.array): Grade inicial (estados inteiros ou booleanos).
+        states (int): Número de estados possíveis.
+    """
+
+    def __init__(self, grid, states=2):
+        self.states = states
+        self.recount(grid)
+
+    @classmethod
+    def from_counts(cls, counts):
+        """
+        Contador a partir das contagens já conhecidas (sem precisar da grade densa,
+        por exemplo com o popcount de um BitPackedLife).
+        """
+        counter = cls.__new__(cls)
+        counter._counts = np.array(counts, dtype=np.int64)
+        counter.states = len(counter._counts)
+        counter.cells = int(counter._counts.sum())
+        return counter
+
+    def recount(self, grid):
+        """
+        Refaz a contagem varrendo a grade inteira.
+        """
+        grid = np.asarray(grid)
+        self.cells = grid.size
+        self._counts = np.bincount(grid.ravel().astype(np.intp), minlength=self.states).astype(np.int64)
+
+    def move(self, old_state, new_state, n=1):
+        """
+        Registra que `n` células passaram do estado `old_state` para `new_state`.
+        """
+        self._counts[old_state] -= n
+        self._counts[new_state] += n
+
+    def apply(self, delta):
+        """
+        Soma uma variação por estado (array indexado pelo estado, por exemplo ActiveTiles.delta).
+        """
+        delta = np.asarray(delta)
+        self._counts[: len(delta)] += delta
+
+    def set(self, state, count):
+        """
+        Define a contagem de um estado de uma grade de dois estados (o outro fica com o resto).
+        """
+        self._counts[state] = count
+        self._counts[1 - state] = self.cells - count
+
+    @property
+    def counts(self):
+        view = self._counts.view()
+        view.flags.writeable = False
+        return view
+
+    def __getitem__(self, state):
+        return int(self._counts[state])
+
+    def fraction(self, state):
+        return self._counts[state] / self.cells
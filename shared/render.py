@@ -0,0 +1,302 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pygame
+
+
+def init_display(size=(0, 0), headless=False, flags=0):
+    """
+    Inicializa o pygame e abre a janela. Com `headless`, usa o driver "dummy"
+    do SDL: nada aparece na tela, mas todo o desenho acontece normalmente
+    (para medir desempenho ou rodar em servidores sem monitor).
+    """
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.init()
+    return pygame.display.set_mode(size, flags)
+
+
+def age_palette(empty_color, step=5):
+    """
+    Paleta da rampa de idade usada no jogo da vida probabilístico: índice 0 é a
+    célula morta e o índice 1 + idade a célula viva com essa idade, indo do
+    ciano (nova) ao vermelho (idade 255 // step em diante, onde a cor satura).
+    """
+    ages = np.arange(255 // step + 1)
+    ramp = np.empty((len(ages), 3), dtype=np.uint8)
+    ramp[:, 0] = np.minimum(255, ages * step)
+    ramp[:, 1] = ramp[:, 2] = np.maximum(0, 255 - ages * step)
+    return np.vstack(([empty_color], ramp)).astype(np.uint8)
+
+
+def age_indices(alive, ages, palette):
+    """
+    Índices na paleta de `age_palette` para a grade `alive` com as idades `ages`.
+    """
+    ramp = np.minimum(ages, len(palette) - 2) + 1
+    return np.where(alive, ramp, 0)
+
+
+class GridRenderer:
+    """
+    Desenha uma grade de estados na tela sem percorrer as células em Python.
+
+    Os estados viram cores com uma consulta à paleta (já no formato de pixel
+    da superfície, um uint32 por cor), o resultado vai de uma vez para uma
+    superfície de 1 pixel por célula (`pygame.surfarray.blit_array`) e é
+    ampliado para `cell_size` pixels por célula com `pygame.transform.scale`. A grade é dividida em blocos de
+    `tile_size` células: só os blocos que mudaram desde o último quadro são
+    ampliados e copiados para a tela, e seus retângulos são devolvidos para
+    `pygame.display.update(rects)`.
+
+        renderer = GridRenderer((width, height), cell_size, palette)
+        rects = renderer.render(screen, model.cell_layer.data)
+        pygame.display.update(rects)
+
+    Args:
+        shape (tuple): Formato (width, height) da grade, no mesmo sentido da
+            grade dos modelos e do pygame (grid[x, y]).
+        cell_size (int): Lado de cada célula em pixels.
+        palette (array): Cores (K, 3) em RGB; a grade traz índices de 0 a K - 1.
+        origin (tuple): Posição (em pixels) do canto superior esquerdo da grade na tela.
+        tile_size (int): Lado dos blocos (em células) usados para os retângulos sujos.
+    """
+
+    def __init__(self, shape, cell_size, palette, origin=(0, 0), tile_size=16):
+        self.shape = tuple(shape)
+        self.cell_size = cell_size
+        self.palette = np.asarray(palette, dtype=np.uint8)
+        self.origin = origin
+        self.tile_size = tile_size
+        self.rect = pygame.Rect(origin, (self.shape[0] * cell_size, self.shape[1] * cell_size))
+        self.surface = pygame.Surface(self.shape)
+        # Paleta no formato de pixel da superfície: a consulta já produz o array que vai para a tela
+        self.colors = np.array(
+            [self.surface.map_rgb(tuple(int(c) for c in color)) for color in self.palette], dtype=np.uint32
+        )
+        self.tiles = tuple(-(-size // tile_size) for size in self.shape)
+        # Índices do último quadro desenhado; -1 força o redesenho da célula
+        self._last = np.full(self.shape, -1, dtype=np.int16)
+
+    def invalidate(self, rect=None):
+        """
+        Força o redesenho, no próximo quadro, das células sob `rect` (em pixels
+        da tela), ou da grade toda. Serve para textos e botões desenhados por
+        cima da grade.
+        """
+        if rect is None:
+            self._last[:] = -1
+            return
+        rect = pygame.Rect(rect).clip(self.rect)
+        if rect.width and rect.height:
+            x0 = (rect.left - self.rect.left) // self.cell_size
+            y0 = (rect.top - self.rect.top) // self.cell_size
+            x1 = -(-(rect.right - self.rect.left) // self.cell_size)
+            y1 = -(-(rect.bottom - self.rect.top) // self.cell_size)
+            self._last[x0:x1, y0:y1] = -1
+
+    def changed_tiles(self, indices):
+        """
+        Máscara (tiles_x, tiles_y) dos blocos com alguma célula diferente do último quadro.
+        """
+        t = self.tile_size
+        diff = np.zeros((self.tiles[0] * t, self.tiles[1] * t), dtype=bool)
+        diff[: self.shape[0], : self.shape[1]] = indices != self._last
+        return diff.reshape(self.tiles[0], t, self.tiles[1], t).any(axis=(1, 3))
+
+    def render(self, screen, indices):
+        """
+        Desenha `indices` (array (width, height) de índices da paleta, ou a
+        própria grade de estados) em `screen` e devolve a lista de retângulos
+        que mudaram.
+        """
+        indices = np.asarray(indices)
+        if indices.dtype == np.bool_:
+            indices = indices.view(np.uint8)  # grade booleana: False/True viram os índices 0/1
+        changed = self.changed_tiles(indices)
+        if not changed.any():
+            return []
+        pygame.surfarray.blit_array(self.surface, self.colors.take(indices))
+        self._last[:] = indices
+
+        t, size = self.tile_size, self.cell_size
+        if changed.mean() > 0.5:
+            # Muita coisa mudou: uma única ampliação da grade inteira sai mais barato que bloco a bloco
+            screen.blit(pygame.transform.scale(self.surface, self.rect.size), self.rect)
+            return [self.rect]
+
+        rects = []
+        for tx, ty in np.argwhere(changed):
+            cells = pygame.Rect(tx * t, ty * t, t, t).clip(self.surface.get_rect())
+            target = pygame.Rect(
+                self.rect.left + cells.left * size,
+                self.rect.top + cells.top * size,
+                cells.width * size,
+                cells.height * size,
+            )
+            screen.blit(pygame.transform.scale(self.surface.subsurface(cells), target.size), target)
+            rects.append(target)
+        return rects
+
+
+
+class MetricsPanel:
+    """
+    Gráfico de uma métrica (por exemplo a fração de células vivas) desenhado
+    na própria janela do pygame, sem matplotlib e sem travar o loop do jogo.
+
+    As amostras ficam em um buffer circular de tamanho fixo (`capacity`), e o
+    gráfico mostra as últimas `capacity` amostras. Quando há mais amostras do
+    que colunas de pixels, cada coluna vira um traço do mínimo ao máximo das
+    amostras que caem nela (decimação min/max), então picos curtos não somem
+    e o custo do desenho depende só da largura do painel. O gráfico é
+    redesenhado em uma superfície própria só quando chegam dados novos; nos
+    outros quadros `draw` apenas copia essa superfície para a tela.
+
+        panel = MetricsPanel((x, y, 400, 90), title="Fração viva")
+        panel.append(step, model.alive_fraction)
+        panel.draw(screen)
+
+    Args:
+        rect (pygame.Rect): Área do painel na tela.
+        capacity (int): Número de amostras guardadas (as mais antigas são descartadas).
+        title (str): Nome da métrica, mostrado com o último valor.
+        y_min (float): Início do eixo y.
+        y_max (float): Fim do eixo y. Padrão: ajustado aos dados (1,5 vezes o maior valor, até `y_limit`).
+        y_limit (float): Limite do ajuste automático do eixo y.
+        color (tuple): Cor da linha.
+        background (tuple): Cor de fundo.
+    """
+
+    def __init__(
+        self,
+        rect,
+        capacity=4096,
+        title="",
+        y_min=0.0,
+        y_max=None,
+        y_limit=1.0,
+        color=(0, 255, 0),
+        background=(30, 30, 30),
+    ):
+        self.rect = pygame.Rect(rect)
+        self.capacity = capacity
+        self.title = title
+        self.y_min = y_min
+        self.y_max = y_max
+        self.y_limit = y_limit
+        self.color = color
+        self.background = background
+        self.steps = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros(capacity)
+        self.count = 0
+        self.font = pygame.font.SysFont(None, 18)
+        self.surface = pygame.Surface(self.rect.size)
+        # Área da linha dentro do painel (o topo fica para o título)
+        self.plot_rect = pygame.Rect(4, 18, self.rect.width - 8, self.rect.height - 22)
+        self._dirty = True
+
+    def append(self, step, value):
+        """
+        Adiciona uma amostra (O(1): sobrescreve a mais antiga quando o buffer está cheio).
+        """
+        i = self.count % self.capacity
+        self.steps[i] = step
+        self.values[i] = value
+        self.count += 1
+        self._dirty = True
+
+    def clear(self):
+        self.count = 0
+        self._dirty = True
+
+    def window(self):
+        """
+        Passos e valores guardados, do mais antigo ao mais recente.
+        """
+        if self.count <= self.capacity:
+            return self.steps[: self.count], self.values[: self.count]
+        start = self.count % self.capacity
+        order = np.r_[start : self.capacity, 0:start]
+        return self.steps[order], self.values[order]
+
+    def decimate(self, values, columns):
+        """
+        Pontos (x, y) da linha para `columns` colunas: as próprias amostras se
+        couberem, senão o mínimo e o máximo das amostras de cada coluna.
+        """
+        n = len(values)
+        if n <= columns:
+            return np.arange(n) * ((columns - 1) / max(n - 1, 1)), values
+        starts = np.arange(columns) * n // columns
+        low = np.minimum.reduceat(values, starts)
+        high = np.maximum.reduceat(values, starts)
+        return np.repeat(np.arange(columns), 2), np.column_stack((low, high)).ravel()
+
+    def _render(self):
+        self.surface.fill(self.background)
+        steps, values = self.window()
+        plot = self.plot_rect
+        y_max = self.y_max
+        if y_max is None:
+            y_max = min(self.y_limit, 1.5 * values.max()) if len(values) else self.y_limit
+            y_max = max(y_max, self.y_min + 1e-9)
+
+        title = self.title
+        if len(values):
+            title = f"{self.title}: {values[-1]:.4g}   (passos {steps[0]} a {steps[-1]})"
+        self.surface.blit(self.font.render(title, True, (255, 255, 255)), (4, 3))
+        top_label = self.font.render(f"{y_max:.3g}", True, (160, 160, 160))
+        self.surface.blit(top_label, (plot.right - top_label.get_width(), 3))
+        pygame.draw.rect(self.surface, (90, 90, 90), plot, 1)
+
+        if len(values) >= 2:
+            x, y = self.decimate(values, plot.width)
+            scale = (plot.height - 1) / (y_max - self.y_min)
+            px = plot.left + x
+            py = plot.bottom - 1 - np.clip((y - self.y_min) * scale, 0, plot.height - 1)
+            pygame.draw.lines(self.surface, self.color, False, np.column_stack((px, py)).tolist())
+        self._dirty = False
+
+    def draw(self, screen):
+        """
+        Copia o painel para `screen` (redesenhando-o antes se chegaram dados novos) e devolve sua área.
+        """
+        if self._dirty:
+            self._render()
+        return screen.blit(self.surface, self.rect)
+
+
+def benchmark(width, height, cell_size, frames, density=0.3, flips=0.01, seed=0):
+    """
+    Mede o tempo por quadro do GridRenderer no modo headless, com `flips`
+    das células trocando de estado a cada quadro. Devolve ms por quadro.
+    """
+    screen = init_display((width * cell_size, height * cell_size), headless=True)
+    rng = np.random.default_rng(seed)
+    grid = rng.random((width, height)) < density
+    renderer = GridRenderer((width, height), cell_size, [(0, 0, 0), (255, 255, 255)])
+    renderer.render(screen, grid)
+    start = time.perf_counter()
+    for _ in range(frames):
+        flip = rng.random((width, height)) < flips
+        grid ^= flip
+        pygame.display.update(renderer.render(screen, grid))
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+    return 1000 * elapsed / frames
+
+
+if __name__ == "__main__":
+    # python render.py --width 1000 --height 1000 --cell-size 1: tempo por quadro sem abrir janela
+    parser = argparse.ArgumentParser(description="Benchmark do GridRenderer (headless)")
+    parser.add_argument("--width", type=int, default=1000)
+    parser.add_argument("--height", type=int, default=1000)
+    parser.add_argument("--cell-size", type=int, default=1)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--flips", type=float, default=0.01, help="fração das células que muda a cada quadro")
+    args = parser.parse_args()
+    ms = benchmark(args.width, args.height, args.cell_size, args.frames, flips=args.flips)
+    print(f"{ms:.2f} ms/quadro ({1000 / ms:.0f} fps)")
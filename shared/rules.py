@@ -0,0 +1,15 @@
+def parse_rule(rule):
+    """
+    Converte uma regra no formato "B2/S34" em (nascimento, sobrevivência),
+    as tuplas com os números de vizinhos que fazem a célula nascer ou sobreviver.
+    """
+    birth, survive = (), ()
+    for part in rule.upper().split("/"):
+        counts = tuple(int(c) for c in part[1:])
+        if part.startswith("B"):
+            birth = counts
+        elif part.startswith("S"):
+            survive = counts
+        else:
+            raise ValueError(f"regra inválida: {rule!r}")
+    return birth, survive
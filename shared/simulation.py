@@ -0,0 +1,205 @@
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+
+
+def _layer(value):
+    # PropertyLayer (ou camada do ReplayModel) é lida pelo .data; arrays simples, como o grid hexagonal, direto
+    return getattr(value, "data", value)
+
+
+class Simulation:
+    """
+    Separa a simulação do desenho nos front-ends pygame. O loop de desenho
+    chama `frame()` uma vez por quadro e lê o estado com `latest()`, sem mexer
+    no modelo diretamente.
+
+    Nesta versão síncrona, cada quadro roda `steps_per_frame` passos do
+    modelo antes de desenhar: a simulação avança N passos por quadro, qualquer
+    que seja a taxa de quadros. `SimulationThread` roda o modelo em uma
+    thread separada, na velocidade pedida.
+
+        simulation = Simulation(model, layers=("cell_layer",), values=("alive_count",), steps_per_frame=10)
+        while running:
+            simulation.frame()
+            with simulation.latest() as state:
+                renderer.render(screen, state.cell_layer)
+
+    Args:
+        model: Modelo com `step()`.
+        layers (tuple): Nomes das camadas (PropertyLayer ou array) lidas pelo desenho.
+        values (tuple): Nomes dos atributos escalares lidos pelo desenho (alive_count...).
+        steps_per_frame (int): Passos do modelo a cada quadro.
+    """
+
+    def __init__(self, model, layers=(), values=(), steps_per_frame=1):
+        self.model = model
+        self.layers = tuple(layers)
+        self.values = tuple(values)
+        self.steps_per_frame = steps_per_frame
+        self.steps = 0
+        self.paused = False
+        # Trava do modelo: passos e edições (cliques, botões) nunca acontecem ao mesmo tempo
+        self.lock = threading.RLock()
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+    def frame(self):
+        """
+        Chamado pelo loop de desenho uma vez por quadro.
+        """
+        if not self.paused:
+            for _ in range(self.steps_per_frame):
+                self.model.step()
+                self.steps += 1
+
+    def _state(self):
+        state = SimpleNamespace(steps=self.steps)
+        for name in self.layers:
+            setattr(state, name, _layer(getattr(self.model, name)))
+        for name in self.values:
+            setattr(state, name, getattr(self.model, name))
+        return state
+
+    @contextmanager
+    def latest(self):
+        """
+        Estado mais recente do modelo (camadas como arrays, escalares e `steps`),
+        válido dentro do bloco `with`.
+        """
+        yield self._state()
+
+    @contextmanager
+    def edit(self):
+        """
+        Acesso ao modelo para edições da interface (limpar a grade, clicar em
+        células...), sem que um passo aconteça no meio.
+        """
+        with self.lock:
+            yield self.model
+
+    def replace(self, model):
+        """
+        Troca o modelo (por exemplo ao reiniciar ou mudar o tamanho da grade) e zera a contagem de passos.
+        """
+        with self.lock:
+            self.model = model
+            self.steps = 0
+
+
+class SimulationThread(Simulation):
+    """
+    Roda o modelo em uma thread própria, o mais rápido possível
+    (`steps_per_second=None`) ou em uma taxa fixa de passos por segundo,
+    independente da taxa de quadros do desenho.
+
+    O estado lido pelo desenho fica em buffer duplo: a thread copia as
+    camadas para o buffer de trás e troca os dois de uma vez. A cópia só é
+    feita quando o desenho já leu o estado anterior (no máximo uma por
+    quadro), então ela não limita a velocidade da simulação, e o desenho nunca
+    vê uma grade pela metade.
+
+    Args:
+        model: Modelo com `step()`.
+        layers (tuple): Nomes das camadas lidas pelo desenho.
+        values (tuple): Nomes dos atributos escalares lidos pelo desenho.
+        steps_per_second (float): Passos por segundo; None roda sem limite e 0 pausa.
+    """
+
+    def __init__(self, model, layers=(), values=(), steps_per_second=None):
+        super().__init__(model, layers, values)
+        self.steps_per_second = steps_per_second
+        self._back = None
+        self._front = None
+        self._swap_lock = threading.Lock()
+        self._wanted = threading.Event()
+        self._stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        with self.lock:
+            self._publish()
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self.thread.is_alive():
+            self.thread.join()
+
+    def frame(self):
+        # Os passos acontecem na thread; o quadro só lê o estado publicado
+        pass
+
+    def _publish(self):
+        # Copia o estado do modelo para o buffer de trás (reaproveitando os arrays) e troca com o da frente
+        back = self._back or SimpleNamespace()
+        back.steps = self.steps
+        for name in self.layers:
+            data = _layer(getattr(self.model, name))
+            buffer = getattr(back, name, None)
+            if buffer is None or buffer.shape != data.shape or buffer.dtype != data.dtype:
+                setattr(back, name, np.array(data, copy=True))
+            else:
+                np.copyto(buffer, data)
+        for name in self.values:
+            setattr(back, name, getattr(self.model, name))
+        with self._swap_lock:
+            self._back, self._front = self._front, back
+
+    def _run(self):
+        next_time = time.perf_counter()
+        while not self._stopped.is_set():
+            rate = self.steps_per_second
+            if self.paused or rate == 0:
+                # Parado: só publica edições feitas pela interface
+                if self._wanted.is_set():
+                    self._wanted.clear()
+                    with self.lock:
+                        self._publish()
+                time.sleep(0.01)
+                next_time = time.perf_counter()
+                continue
+
+            with self.lock:
+                self.model.step()
+                self.steps += 1
+                if self._wanted.is_set():
+                    self._wanted.clear()
+                    self._publish()
+
+            if rate is not None:
+                next_time += 1 / rate
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                elif delay < -0.1:
+                    # Atrasou demais (modelo mais lento que a taxa pedida): não tenta compensar de uma vez
+                    next_time = time.perf_counter()
+            else:
+                # Sem limite: cede a vez para a thread de desenho entre os passos
+                time.sleep(0)
+
+    @contextmanager
+    def latest(self):
+        with self._swap_lock:
+            yield self._front
+        self._wanted.set()
+
+    @contextmanager
+    def edit(self):
+        with self.lock:
+            yield self.model
+        self._wanted.set()
+
+    def replace(self, model):
+        with self.lock:
+            super().replace(model)
+            self._publish()
@@ -0,0 +1,198 @@
+import numpy as np
+
+# Deslocamentos (dx, dy) das vizinhanças usadas pelos modelos
+MOORE = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+HEX = [(-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0)]  # Mesma vizinhança de HexGameOfLifeModel
+
+# Estados da Wireworld, os mesmos de wireworld_visualization.py
+ELECTRON_HEAD = 1
+ELECTRON_TAIL = 2
+CONDUCTOR = 3
+
+
+def neighbor_sum(padded, offsets):
+    """
+    Soma os vizinhos de cada célula de blocos com borda de 1 célula.
+    `padded` tem formato (..., n + 2, m + 2) e o resultado (..., n, m).
+    """
+    rows = padded.shape[-2] - 2
+    cols = padded.shape[-1] - 2
+    total = np.zeros(padded.shape[:-2] + (rows, cols), dtype=np.uint8)
+    for dx, dy in offsets:
+        total += padded[..., 1 + dx : 1 + dx + rows, 1 + dy : 1 + dy + cols]
+    return total
+
+
+class SpeciesCounter:
+    """
+    Conta, em uma só passada, quantos vizinhos de cada espécie (estados
+    0..K-1) cada célula tem. Cada estado vira um código com um campo de 4 bits
+    por espécie (estado k -> 1 << 4k); somar os códigos dos vizinhos soma
+    todos os campos ao mesmo tempo, então o custo não cresce com K. Depois
+    cada campo é extraído para `counts[k]` (uint8). Os arrays intermediários
+    e a saída são alocados uma vez e reaproveitados a cada chamada.
+
+    Args:
+        shape (tuple): Formato (width, height) da grade.
+        species (int): Número de estados K (até 16).
+        offsets (list): Vizinhança, como MOORE ou HEX (até 15 vizinhos).
+        wrap (bool): Bordas com wrap; senão as células de fora não contam para nenhuma espécie.
+    """
+
+    def __init__(self, shape, species, offsets=MOORE, wrap=True):
+        if species > 16 or len(offsets) > 15:
+            raise ValueError("SpeciesCounter suporta até 16 espécies e 15 vizinhos")
+        self.shape = tuple(shape)
+        self.offsets = offsets
+        self.wrap = wrap
+        dtype = np.uint32 if species <= 8 else np.uint64
+        self.codes = (np.ones(species, dtype=dtype) << (4 * np.arange(species, dtype=dtype))).astype(dtype)
+        self._padded = np.zeros((self.shape[0] + 2, self.shape[1] + 2), dtype=dtype)
+        self._total = np.zeros(self.shape, dtype=dtype)
+        self._field = np.zeros(self.shape, dtype=dtype)
+        self.counts = np.zeros((species,) + self.shape, dtype=np.uint8)
+
+    def count(self, grid):
+        """
+        Conta os vizinhos de cada espécie em `grid` (inteiros de 0 a K-1).
+        Retorna `counts`, formato (K, width, height); o array é sobrescrito na próxima chamada.
+        """
+        padded = self._padded
+        np.take(self.codes, grid, out=padded[1:-1, 1:-1], mode="clip")
+        if self.wrap:
+            padded[0, 1:-1] = padded[-2, 1:-1]
+            padded[-1, 1:-1] = padded[1, 1:-1]
+            padded[:, 0] = padded[:, -2]
+            padded[:, -1] = padded[:, 1]
+
+        rows, cols = self.shape
+        total = self._total
+        for i, (dx, dy) in enumerate(self.offsets):
+            window = padded[1 + dx : 1 + dx + rows, 1 + dy : 1 + dy + cols]
+            if i == 0:
+                np.copyto(total, window)
+            else:
+                np.add(total, window, out=total)
+
+        for k in range(len(self.codes)):
+            np.right_shift(total, 4 * k, out=self._field)
+            np.bitwise_and(self._field, 15, out=self.counts[k], casting="unsafe")
+        return self.counts
+
+
+def moore_life_block(padded):
+    """
+    Regra de Conway (B3/S23) aplicada ao centro dos blocos.
+    """
+    alive = padded[..., 1:-1, 1:-1]
+    count = neighbor_sum(padded, MOORE)
+    return (count == 3) | (alive & (count == 2))
+
+
+def hex_life_block(padded, birth=(3,), survive=(2, 3)):
+    """
+    Regra de HexGameOfLifeModel na vizinhança hexagonal (B3/S23 por padrão) aplicada ao centro dos blocos.
+    """
+    alive = padded[..., 1:-1, 1:-1]
+    count = neighbor_sum(padded, HEX)
+    return np.where(alive, np.isin(count, survive), np.isin(count, birth))
+
+
+def wireworld_block(padded):
+    """
+    Regra da Wireworld aplicada ao centro dos blocos.
+    """
+    cell = padded[..., 1:-1, 1:-1]
+    heads = neighbor_sum(padded == ELECTRON_HEAD, MOORE)
+    new = cell.copy()
+    new[cell == ELECTRON_HEAD] = ELECTRON_TAIL
+    new[cell == ELECTRON_TAIL] = CONDUCTOR
+    new[(cell == CONDUCTOR) & ((heads == 1) | (heads == 2))] = ELECTRON_HEAD
+    return new
+
+
+class ActiveTiles:
+    """
+    Divide a grade toroidal em blocos (tiles) e só calcula os blocos que
+    mudaram na geração anterior ou que são vizinhos de um bloco que mudou.
+    Regiões estáveis (ou vazias) são puladas.
+
+    Args:
+        shape (tuple): Formato (width, height) da grade.
+        update (callable): Função que recebe os blocos com borda de 1 célula,
+            formato (n, t + 2, t + 2), e devolve o centro (n, t, t) na próxima
+            geração. Serve para qualquer vizinhança de raio 1 (Moore, hexagonal, Wireworld).
+        tile_size (int): Lado de cada bloco em células.
+    """
+
+    def __init__(self, shape, update, tile_size=32):
+        self.shape = tuple(shape)
+        self.update = update
+        self.tile_size = tile_size
+        self.tiles = tuple(-(-size // tile_size) for size in self.shape)
+        self.active = np.ones(self.tiles, dtype=bool)
+        self.active_fraction = 1.0
+        # Variação do número de células em cada estado no último passo (índice = estado)
+        self.delta = np.zeros(0, dtype=np.int64)
+        self._last = None
+
+    def mark_all(self):
+        """
+        Marca todos os blocos como ativos (por exemplo após editar a grade inteira).
+        """
+        self.active[:] = True
+
+    def mark(self, x, y):
+        """
+        Marca o bloco da célula (x, y) e seus vizinhos após uma edição manual.
+        """
+        tx, ty = x // self.tile_size, y // self.tile_size
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                self.active[(tx + dx) % self.tiles[0], (ty + dy) % self.tiles[1]] = True
+
+    def step(self, grid):
+        """
+        Calcula a próxima geração de `grid`, alterando o próprio array, e o devolve.
+        """
+        # Uma grade diferente da última devolvida foi trocada por fora: recalcula tudo
+        if grid is not self._last:
+            self.mark_all()
+        tiles = np.argwhere(self.active)
+        self.active_fraction = len(tiles) / self.active.size
+
+        changed = np.zeros(self.tiles, dtype=bool)
+        self.delta = np.zeros(0, dtype=np.int64)
+        if len(tiles):
+            t = self.tile_size
+            offsets = np.arange(-1, t + 1)
+            # Índices (com wrap) das linhas e colunas de cada bloco, incluindo a borda
+            rows = tiles[:, :1] * t + offsets
+            cols = tiles[:, 1:] * t + offsets
+            blocks = grid[rows[:, :, None] % self.shape[0], cols[:, None, :] % self.shape[1]]
+            new = self.update(blocks)
+
+            # Blocos da última linha/coluna podem passar do fim da grade: essas células são descartadas
+            inside = (rows[:, 1:-1, None] < self.shape[0]) & (cols[:, None, 1:-1] < self.shape[1])
+            diff = (new != blocks[:, 1:-1, 1:-1]) & inside
+            changed[tiles[:, 0], tiles[:, 1]] = diff.any(axis=(1, 2))
+
+            target_rows = np.broadcast_to(rows[:, 1:-1, None], new.shape)
+            target_cols = np.broadcast_to(cols[:, None, 1:-1], new.shape)
+            grid[target_rows[diff], target_cols[diff]] = new[diff]
+
+            # Só as células que mudaram entram na variação da população
+            before = blocks[:, 1:-1, 1:-1][diff].astype(np.intp)
+            after = new[diff].astype(np.intp)
+            states = max(before.max(initial=-1), after.max(initial=-1)) + 1
+            self.delta = np.bincount(after, minlength=states) - np.bincount(before, minlength=states)
+
+        # Próxima geração: blocos que mudaram e seus 8 vizinhos
+        active = changed.copy()
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if dx or dy:
+                    active |= np.roll(changed, (dx, dy), axis=(0, 1))
+        self.active = active
+        self._last = grid
+        return grid
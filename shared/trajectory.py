@@ -0,0 +1,269 @@
+import json
+import struct
+import zlib
+from types import SimpleNamespace
+
+import numpy as np
+
+# Formato do arquivo de trajetória:
+#   cabeçalho: MAGIC, tamanho do JSON (uint32) e JSON com as camadas (nome, formato, dtype) e parâmetros
+#   um bloco comprimido com zlib por passo: a cada `keyframe_interval` passos o registro inteiro (keyframe),
+#   nos outros o XOR do registro com o último keyframe
+#   índice: offsets (uint64) do início de cada bloco e do fim do último
+#   rodapé: offset do índice, número de blocos e INDEX_MAGIC
+MAGIC = b"GOLTRAJ1"
+INDEX_MAGIC = b"TRAJIDX1"
+FOOTER = struct.Struct("<QQ8s")
+
+
+def _encode(array, dtype):
+    # Camadas booleanas são empacotadas (8 células por byte); as outras vão como bytes crus
+    if dtype == np.bool_:
+        return np.packbits(np.asarray(array, dtype=bool).ravel(), bitorder="little")
+    return np.ascontiguousarray(array, dtype=dtype).view(np.uint8).ravel()
+
+
+def _encoded_size(shape, dtype):
+    cells = int(np.prod(shape))
+    return -(-cells // 8) if dtype == np.bool_ else cells * dtype.itemsize
+
+
+class TrajectoryWriter:
+    """
+    Grava a evolução de um modelo passo a passo em um arquivo compacto.
+
+    Cada passo é um registro com uma ou mais camadas (por exemplo a grade e a
+    idade das células). A cada `keyframe_interval` passos o registro é
+    guardado inteiro (keyframe); nos outros, só o XOR com o último keyframe,
+    que é quase todo zero quando pouca coisa muda. Cada passo é comprimido
+    separadamente com zlib, que reduz as sequências de zeros a poucos bytes,
+    e ler um passo qualquer só precisa dele e do seu keyframe.
+
+        with TrajectoryWriter("run.traj") as writer:
+            for _ in range(steps):
+                writer.append(cell_layer=model.cell_layer.data, age_layer=model.age_layer.data)
+                model.step()
+
+    Args:
+        path (str): Arquivo de saída.
+        keyframe_interval (int): Intervalo entre keyframes. Maior comprime mais quando a grade muda
+            devagar; menor comprime mais quando as diferenças em relação ao keyframe crescem rápido.
+        level (int): Nível de compressão do zlib (0 a 9).
+        meta (dict): Informações extras guardadas no cabeçalho (parâmetros do modelo etc.).
+    """
+
+    def __init__(self, path, keyframe_interval=64, level=6, meta=None):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.level = level
+        self.meta = meta or {}
+        self.layers = None
+        self.frame_count = 0
+        self._file = open(path, "wb")
+        self._offsets = []
+        self._keyframe = None
+
+    def _write_header(self, frame):
+        self.layers = [
+            (name, tuple(np.shape(array)), np.asarray(array).dtype) for name, array in frame.items()
+        ]
+        header = json.dumps({
+            "layers": [[name, list(shape), dtype.str] for name, shape, dtype in self.layers],
+            "keyframe_interval": self.keyframe_interval,
+            "meta": self.meta,
+        }).encode()
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def append(self, **frame):
+        """
+        Adiciona um passo. Os argumentos são as camadas (nome=array), sempre as mesmas em todos os passos.
+        """
+        if self.layers is None:
+            self._write_header(frame)
+        record = np.concatenate([_encode(frame[name], dtype) for name, _, dtype in self.layers])
+        if self.frame_count % self.keyframe_interval == 0:
+            self._keyframe = record
+        else:
+            record = record ^ self._keyframe
+        self._offsets.append(self._file.tell())
+        self._file.write(zlib.compress(record.tobytes(), self.level))
+        self.frame_count += 1
+
+    def close(self):
+        """
+        Grava o índice e o rodapé.
+        """
+        if self._file.closed:
+            return
+        if self.layers is None:
+            self._write_header({})
+        index_offset = self._file.tell()
+        np.array(self._offsets + [index_offset], dtype="<u8").tofile(self._file)
+        self._file.write(FOOTER.pack(index_offset, self.frame_count, INDEX_MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TrajectoryReader:
+    """
+    Lê um arquivo gravado pelo TrajectoryWriter. O arquivo é mapeado em
+    memória (np.memmap) e o índice dá a posição de cada passo, então ler um
+    passo qualquer custa descomprimir só ele e seu keyframe, independente do
+    tamanho da trajetória. O último keyframe lido fica em cache, o que torna a
+    leitura sequencial (replay) barata.
+
+        trajectory = TrajectoryReader("run.traj")
+        trajectory[500]["cell_layer"]
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._data = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(self._data[:8]) != MAGIC:
+            raise ValueError(f"{path} não é um arquivo de trajetória")
+        (header_size,) = struct.unpack("<I", bytes(self._data[8:12]))
+        header = json.loads(bytes(self._data[12 : 12 + header_size]))
+        self.layers = [(name, tuple(shape), np.dtype(dtype)) for name, shape, dtype in header["layers"]]
+        self.keyframe_interval = header["keyframe_interval"]
+        self.meta = header["meta"]
+
+        index_offset, self.frame_count, magic = FOOTER.unpack(
+            bytes(self._data[-FOOTER.size :])
+        )
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{path} está incompleto (o gravador não foi fechado)")
+        self._offsets = np.frombuffer(
+            self._data, dtype="<u8", count=self.frame_count + 1, offset=index_offset
+        ).astype(np.int64)
+        self._sizes = [_encoded_size(shape, dtype) for _, shape, dtype in self.layers]
+        self._keyframe = (None, None)
+
+    def __len__(self):
+        return self.frame_count
+
+    def _block(self, step):
+        raw = zlib.decompress(self._data[self._offsets[step] : self._offsets[step + 1]])
+        return np.frombuffer(raw, dtype=np.uint8)
+
+    def _record(self, step):
+        key = step - step % self.keyframe_interval
+        if self._keyframe[0] != key:
+            self._keyframe = (key, self._block(key))
+        if step == key:
+            return self._keyframe[1]
+        return self._block(step) ^ self._keyframe[1]
+
+    def __getitem__(self, step):
+        """
+        Camadas do passo `step`, como dicionário {nome: array}.
+        """
+        step = range(self.frame_count)[step]
+        record = self._record(step)
+        frame = {}
+        start = 0
+        for (name, shape, dtype), size in zip(self.layers, self._sizes):
+            raw = record[start : start + size]
+            if dtype == np.bool_:
+                cells = int(np.prod(shape))
+                frame[name] = np.unpackbits(raw, count=cells, bitorder="little").astype(bool).reshape(shape)
+            else:
+                frame[name] = raw.view(dtype).reshape(shape).copy()
+            start += size
+        return frame
+
+    def __iter__(self):
+        for step in range(self.frame_count):
+            yield self[step]
+
+
+# Camadas gravadas por padrão, se o modelo as tiver: PropertyLayer (gravada pelo .data) ou array
+RECORDED_LAYERS = ("cell_layer", "age_layer", "time_no_eat", "grid")
+# Métricas escalares gravadas por padrão, se o modelo as tiver (cada uma vira uma camada de 1 valor)
+RECORDED_METRICS = ("alive_count",)
+
+
+def record_model(model, path, steps, layers=RECORDED_LAYERS, metrics=RECORDED_METRICS, **kwargs):
+    """
+    Roda `steps` passos do modelo gravando o estado inicial e o de cada passo em `path`,
+    com as camadas `layers` e as métricas `metrics` que o modelo tiver.
+    `kwargs` vão para o TrajectoryWriter.
+    """
+    def frame():
+        out = {}
+        for name in layers:
+            value = getattr(model, name, None)
+            if value is not None:
+                out[name] = getattr(value, "data", value)
+        for name in metrics:
+            value = getattr(model, name, None)
+            if value is not None:
+                out[name] = np.asarray([value])
+        return out
+
+    with TrajectoryWriter(path, **kwargs) as writer:
+        writer.append(**frame())
+        for _ in range(steps):
+            model.step()
+            writer.append(**frame())
+
+
+class ReplayModel:
+    """
+    Toca uma trajetória gravada com a mesma interface dos modelos
+    (`step()`, `reset()`, `cell_layer.data`, `age_layer.data`, `grid`,
+    `alive_count`...), para usar nos front-ends pygame e Flask sem rodar o
+    modelo de novo.
+
+    As métricas gravadas por `record_model` (RECORDED_METRICS) voltam como
+    atributos escalares. Em trajetórias sem `alive_count` gravado, ele é a
+    contagem da grade booleana (`cell_layer` ou `grid`); se a grade tem
+    vários estados (como a das espécies do predador-presa), não há "vivas" e
+    `alive_count` fica None.
+
+    Args:
+        path (str): Arquivo de trajetória.
+        loop (bool): Volta ao início depois do último passo (senão fica parado nele).
+    """
+
+    def __init__(self, path, loop=False):
+        self.trajectory = TrajectoryReader(path)
+        self.loop = loop
+        grids = [layer for layer in self.trajectory.layers if layer[0] not in RECORDED_METRICS]
+        name, shape, _ = grids[0]
+        self.width, self.height = shape[:2]
+        self.cells = int(np.prod(shape))
+        self.seek(0)
+
+    def seek(self, step):
+        """
+        Vai direto para o passo `step`.
+        """
+        self.steps = range(len(self.trajectory))[step]
+        frame = self.trajectory[self.steps]
+        self.alive_count = None
+        for name, data in frame.items():
+            if name in RECORDED_METRICS:
+                setattr(self, name, data[0].item())
+            else:
+                # Arrays simples (como o grid do modelo hexagonal) ficam como estão; camadas ganham o atributo .data
+                setattr(self, name, data if name == "grid" else SimpleNamespace(name=name, data=data))
+        if "alive_count" not in frame:
+            # Gravação sem a métrica: só uma grade booleana diz quais células estão vivas
+            grid = frame.get("cell_layer", frame.get("grid"))
+            if grid is not None and grid.dtype == np.bool_:
+                self.alive_count = int(np.count_nonzero(grid))
+        self.alive_fraction = None if self.alive_count is None else self.alive_count / self.cells
+
+    def step(self):
+        if self.steps + 1 < len(self.trajectory):
+            self.seek(self.steps + 1)
+        elif self.loop:
+            self.seek(0)
+
+    def reset(self):
+        self.seek(0)
@@ -0,0 +1,24 @@
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, "shared"))
+
+
+def load_module(name, relative_path):
+    """
+    Importa um script do repositório pelo caminho (as pastas não são pacotes e
+    alguns nomes têm hífen ou acento). O módulo fica em sys.modules com `name`.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    path = os.path.join(ROOT, relative_path)
+    # Como ao rodar o script: a pasta dele entra no sys.path (wireworld_engine, elementary_ca...)
+    if os.path.dirname(path) not in sys.path:
+        sys.path.append(os.path.dirname(path))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from helpers import load_module
+
+import checkpoint
+
+visualization = load_module("visualization", "different_visualizations/html_visualization/visualization.py")
+hex_model = load_module("hex_model", "different_visualizations/html_visualization/hex/hex.py")
+pp_model = load_module("pp_model", "different_visualizations/PP-model/pp_model.py")
+ww = load_module("wireworld_visualization", "different_visualizations/html_visualization/wireworld/wireworld_visualization.py")
+
+
+def grid_of(model):
+    return model.grid if hasattr(model, "grid") else model.cell_layer.data
+
+
+def run(model, steps):
+    for _ in range(steps):
+        model.step()
+    return model
+
+
+def wire_loop():
+    grid = np.full((24, 24), ww.EMPTY)
+    grid[3, 3:20] = grid[19, 3:20] = grid[3:20, 3] = grid[3:20, 19] = ww.CONDUCTOR
+    grid[3, 5], grid[3, 4] = ww.ELECTRON_HEAD, ww.ELECTRON_TAIL
+    grid[10, 10:19] = ww.CONDUCTOR
+    return grid
+
+
+MODELS = {
+    "gol-convolve": lambda: visualization.GameOfLifeModel(40, 40, 0.3, backend="convolve"),
+    "gol-bitpacked": lambda: visualization.GameOfLifeModel(40, 40, 0.3, backend="bitpacked"),
+    "gol-sparse": lambda: visualization.GameOfLifeModel(40, 40, 0.3, backend="sparse"),
+    "hex-sparse": lambda: hex_model.HexGameOfLifeModel(30, 30, 0.35, backend="sparse"),
+    "pp": lambda: pp_model.GameOfLifeModel(5, 20, 20, seed=int(np.random.randint(1000))),
+    "wireworld-sparse": lambda: ww.WireworldModel(24, 24, wire_loop(), backend="sparse"),
+    "wireworld-conductors": lambda: ww.WireworldModel(24, 24, wire_loop(), backend="conductors"),
+}
+
+
+@pytest.mark.parametrize("name", MODELS)
+def test_restore_continues_identically(tmp_path, name):
+    # Salva no meio da execução, continua; um modelo novo (em outro estado) restaura e tem que repetir a continuação
+    path = str(tmp_path / "model.npz")
+    np.random.seed(0)
+    original = run(MODELS[name](), 5)
+    checkpoint.save_checkpoint(original, path)
+    expected = [grid_of(run(original, 1)).copy() for _ in range(8)]
+
+    np.random.seed(1)
+    restored = run(MODELS[name](), 3)
+    checkpoint.load_checkpoint(restored, path)
+    for step, grid in enumerate(expected):
+        assert np.array_equal(grid_of(run(restored, 1)), grid), step
+    for attribute in ("alive_count", "presas_count", "preadores_count", "active_tile_fraction"):
+        assert getattr(restored, attribute, None) == getattr(original, attribute, None), attribute
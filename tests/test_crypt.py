@@ -0,0 +1,112 @@
+import copy
+import io
+import pickle
+
+import numpy as np
+import pytest
+
+from helpers import load_module
+
+crypt = load_module("conwaycrypt", "conway-crypt/conwaycrypt-muitobasico.py")
+
+
+def test_duplicate_characters():
+    # Caracteres repetidos (predefinidos ou não) recebem o mesmo estado, sem erro de colisão
+    states = crypt.generate_unique_states(list("abcaxyx"))
+    assert np.array_equal(states[0], states[3])
+    assert np.array_equal(states[4], states[6])
+    assert np.array_equal(states[:3], crypt.generate_unique_states(list("abc")))
+    assert crypt.create_mapping(list("abca")) == crypt.create_mapping("abc")
+
+
+def test_cache_key_follows_starting_patterns(tmp_path, monkeypatch):
+    # O arquivo em disco é indexado pelas grades iniciais: mudar um padrão predefinido não reaproveita o mapa antigo
+    monkeypatch.setattr(crypt, "_mapping_cache", {})
+    first = crypt.create_mapping("abc", cache_dir=tmp_path)
+    monkeypatch.setitem(crypt.PREDEFINED_PATTERNS, "a", [(4, 4), (4, 5), (5, 4), (5, 5)])
+    monkeypatch.setattr(crypt, "_mapping_cache", {})
+    second = crypt.create_mapping("abc", cache_dir=tmp_path)
+    assert first["a"] != second["a"]
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_cached_mapping_is_read_only():
+    mapping = crypt.create_mapping("abc")
+    with pytest.raises(TypeError):
+        mapping["z"] = mapping["a"]
+    with pytest.raises(TypeError):
+        mapping.update(z=mapping["a"])
+    assert "z" not in crypt.create_mapping("abc")
+
+    clone = pickle.loads(pickle.dumps(mapping))
+    assert clone == mapping and clone.grid_size == mapping.grid_size and clone.rule == mapping.rule
+    assert copy.deepcopy(mapping).reverse == mapping.reverse
+
+
+def test_key_collisions_compare_full_blocks(monkeypatch):
+    # Com um hash que só olha o primeiro byte, blocos diferentes colidem e ainda assim são decifrados
+    monkeypatch.setattr(crypt, "block_keys", lambda blocks: blocks[:, 0].astype(np.uint64))
+    table = np.array([[1, 2], [1, 3], [1, 4], [5, 6]], dtype=np.uint8)
+    packed = crypt.PackedMapping([10, 11, 12, 13], table)
+    assert packed.injective
+    data = packed.encrypt_codes([12, 13, 10, 11, 12])
+    assert packed.decrypt_codes(data).tolist() == [12, 13, 10, 11, 12]
+    with pytest.raises(ValueError, match="não encontrado"):
+        packed.decrypt_codes(bytes([1, 9]))
+
+    repeated = crypt.PackedMapping([10, 11, 12], table[[0, 1, 0]])
+    assert not repeated.injective
+    with pytest.raises(ValueError, match="repetidos"):
+        repeated.decrypt_codes(table[0].tobytes())
+
+
+def test_stream_rejects_codes_above_255():
+    mapping = crypt.create_mapping("a€")
+    with pytest.raises(ValueError):
+        crypt.decrypt_stream(io.BytesIO(), io.BytesIO(), mapping)
+    with pytest.raises(ValueError):
+        crypt.encrypt_stream(io.BytesIO(b"a"), io.BytesIO(), mapping)
+
+
+class ShortReads(io.BytesIO):
+    # Arquivo que devolve no máximo 7 bytes por leitura, como um pipe
+    def read(self, size=-1):
+        return super().read(min(size, 7) if size and size > 0 else 7)
+
+
+def test_message_round_trip():
+    message = "o jogo da vida, de conway!"
+    mapping = crypt.create_mapping(sorted(set(message)))
+    encrypted = crypt.encrypt_message(message, mapping)
+    assert len(encrypted) == len(message) * mapping.chunk_size
+    assert crypt.decrypt_message(encrypted, mapping) == message
+    # Um dict comum (por exemplo carregado de outro lugar) também funciona
+    assert crypt.decrypt_message(encrypted, dict(mapping)) == message
+
+
+def test_binary_round_trip(tmp_path):
+    message = "o jogo da vida, de conway!"
+    mapping = crypt.create_mapping(sorted(set(message)))
+    ciphertext = crypt.encrypt_binary(message, mapping)
+    assert crypt.decrypt_binary(ciphertext, mapping) == message
+    # Os blocos binários são as strings de '0' e '1' do modo texto empacotadas
+    bits = np.frombuffer(crypt.encrypt_message(message, mapping).encode(), dtype=np.uint8) - ord("0")
+    assert ciphertext == np.packbits(bits.reshape(len(message), -1), axis=1).tobytes()
+
+    path = tmp_path / "mapa.bin"
+    crypt.save_mapping(mapping, path)
+    assert crypt.load_mapping(path) == mapping
+    assert crypt.PackedMapping.load(path).decrypt_codes(ciphertext).tolist() == [ord(c) for c in message]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+def test_stream_round_trip(chunk_size):
+    mapping = crypt.create_full_mapping()
+    data = bytes(np.random.default_rng(0).integers(0, 256, 1001, dtype=np.uint8))
+    encrypted, decrypted = io.BytesIO(), io.BytesIO()
+    crypt.encrypt_stream(ShortReads(data), encrypted, mapping, chunk_size)
+    assert encrypted.getvalue() == crypt.PackedMapping.from_mapping(mapping).encrypt_codes(np.frombuffer(data, np.uint8))
+    crypt.decrypt_stream(ShortReads(encrypted.getvalue()), decrypted, mapping, chunk_size)
+    assert decrypted.getvalue() == data
+    with pytest.raises(ValueError, match="truncado"):
+        crypt.decrypt_stream(io.BytesIO(encrypted.getvalue()[:-1]), io.BytesIO(), mapping, chunk_size)
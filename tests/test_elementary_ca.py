@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from helpers import load_module
+
+elementary_ca = load_module("elementary_ca", "different_visualizations/html_visualization/hule30/elementary_ca.py")
+
+
+def naive_step(cells, rule, boundary):
+    # Referência célula por célula: a célula j olha (j + 1, j, j - 1), como no docstring de ElementaryCA
+    width = len(cells)
+    new = [0] * width
+    for j in range(width):
+        if boundary == "wrap":
+            left, right = cells[(j + 1) % width], cells[(j - 1) % width]
+        else:
+            left = cells[j + 1] if j + 1 < width else 0
+            right = cells[j - 1] if j > 0 else 0
+        new[j] = (rule >> (4 * left + 2 * cells[j] + right)) & 1
+    return new
+
+
+@pytest.mark.parametrize("rule", [30, 90, 110, 184, 0, 255])
+@pytest.mark.parametrize("boundary", ["fixed", "wrap"])
+@pytest.mark.parametrize("width", [37, 64])
+def test_matches_naive(rule, boundary, width):
+    rng = np.random.default_rng(rule)
+    cells = [int(bit) for bit in rng.integers(0, 2, width)]
+    ca = elementary_ca.ElementaryCA(width, rule, boundary, sum(bit << j for j, bit in enumerate(cells)))
+    rows = [cells]
+    for _ in range(100):
+        rows.append(naive_step(rows[-1], rule, boundary))
+    ca.step(100)
+    # 100 gerações passam do histórico inicial (64 linhas); history() guarda a célula de maior índice na primeira coluna
+    assert np.array_equal(ca.history(), np.array(rows)[:, ::-1])
+    assert ca.state == sum(bit << j for j, bit in enumerate(rows[-1]))
+
+
+def test_default_state_is_centre_cell():
+    ca = elementary_ca.ElementaryCA(11)
+    ca.step(3)
+    assert ca.history()[0].tolist() == [0] * 5 + [1] + [0] * 5
+    assert ca.packed_history.shape == (4, 2)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from helpers import load_module
+
+hex_model = load_module("hex_model", "different_visualizations/html_visualization/hex/hex.py")
+
+
+def build(backend, grid, **kwargs):
+    model = hex_model.HexGameOfLifeModel(*grid.shape, backend=backend, **kwargs)
+    model.grid = grid.copy()
+    model.on_restore()
+    return model
+
+
+@pytest.mark.parametrize(
+    "backends, kwargs",
+    [
+        (("loop", "vectorized", "sparse"), {}),
+        (("loop", "vectorized", "sparse"), {"rule": "B2/S34"}),
+        (("loop", "vectorized"), {"wrap": False}),
+        (("loop", "vectorized"), {"rule": "B24/S35", "wrap": False}),
+    ],
+)
+def test_backends_match(backends, kwargs):
+    # O backend "loop" (célula por célula) é a referência
+    grid = np.random.default_rng(0).random((36, 41)) < 0.35
+    models = {backend: build(backend, grid, **kwargs) for backend in backends}
+    for _ in range(12):
+        for model in models.values():
+            model.step()
+        reference = models["loop"].grid
+        for backend, model in models.items():
+            assert np.array_equal(model.grid, reference), backend
+            assert model.alive_count == np.count_nonzero(reference), backend
+
+
+def test_sparse_set_cell():
+    grid = np.random.default_rng(1).random((40, 40)) < 0.3
+    vectorized, sparse = build("vectorized", grid), build("sparse", grid)
+    rng = np.random.default_rng(2)
+    for _ in range(30):
+        vectorized.step()
+        sparse.step()
+    for _ in range(10):
+        edits = [(rng.integers(40), rng.integers(40), rng.integers(2)) for _ in range(5)]
+        for model in (vectorized, sparse):
+            for x, y, value in edits:
+                model.set_cell(x, y, value)
+            model.step()
+        assert np.array_equal(sparse.grid, vectorized.grid)
+        assert sparse.population[1] == np.count_nonzero(sparse.grid)
@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from scipy.signal import convolve2d
+
+from helpers import load_module
+
+from bitlife import BitPackedLife
+from hashlife import HashLife
+
+visualization = load_module("visualization", "different_visualizations/html_visualization/visualization.py")
+gol_visualization = load_module(
+    "GoL_visualization", "different_visualizations/html_visualization/game-of-life/GoL_visualization.py"
+)
+
+KERNEL = np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]])
+
+
+def conway_step(grid, boundary="wrap"):
+    count = convolve2d(grid, KERNEL, mode="same", boundary=boundary)
+    return (count == 3) | (grid & (count == 2))
+
+
+def random_grid(shape, seed=0, fraction=0.3):
+    return np.random.default_rng(seed).random(shape) < fraction
+
+
+def build(module, backend, grid):
+    model = module.GameOfLifeModel(*grid.shape, backend=backend)
+    model.cell_layer.data = grid.copy()
+    model.on_restore()
+    return model
+
+
+@pytest.mark.parametrize("shape", [(40, 40), (70, 45), (33, 130)])
+def test_backends_match(shape):
+    grid = random_grid(shape)
+    models = {backend: build(visualization, backend, grid) for backend in ("convolve", "bitpacked", "sparse")}
+    reference = grid
+    for _ in range(30):
+        reference = conway_step(reference)
+        for backend, model in models.items():
+            model.step()
+            assert np.array_equal(model.cell_layer.data, reference), backend
+            assert model.alive_count == np.count_nonzero(reference), backend
+
+
+def test_backends_match_after_edits():
+    grid = random_grid((64, 48), seed=1)
+    models = {backend: build(visualization, backend, grid) for backend in ("convolve", "bitpacked", "sparse")}
+    rng = np.random.default_rng(2)
+    for _ in range(15):
+        edits = [(rng.integers(64), rng.integers(48), rng.integers(2)) for _ in range(10)]
+        for model in models.values():
+            for x, y, value in edits:
+                model.set_cell(x, y, value)
+            model.step()
+        reference = models["convolve"].cell_layer.data
+        for backend, model in models.items():
+            assert np.array_equal(model.cell_layer.data, reference), backend
+            assert model.population[1] == np.count_nonzero(reference), backend
+
+
+def test_gol_visualization_backends_match():
+    grid = random_grid((50, 37), seed=3)
+    convolve, bitpacked = (build(gol_visualization, backend, grid) for backend in ("convolve", "bitpacked"))
+    for _ in range(20):
+        convolve.step()
+        bitpacked.step()
+    assert np.array_equal(convolve.cell_layer.data, bitpacked.cell_layer.data)
+    bitpacked.reset()
+    assert bitpacked.alive_count == np.count_nonzero(bitpacked.cell_layer.data)
+
+
+def test_bitpacked_pack_roundtrip_and_random():
+    grid = random_grid((17, 131), seed=4)
+    life = BitPackedLife(grid)
+    assert np.array_equal(life.to_dense(), grid)
+    assert life.population() == np.count_nonzero(grid)
+
+    rng = np.random.default_rng(5)
+    for fraction in (0.0, 0.3, 1.0):
+        board = BitPackedLife.random((300, 301), fraction, rng)
+        dense = board.to_dense()
+        assert dense.shape == (300, 301)
+        assert board.population() == np.count_nonzero(dense)
+        assert abs(dense.mean() - fraction) < 0.01
+
+
+def test_hashlife_matches_dense():
+    # Universo sem bordas: o padrão fica longe das bordas da janela comparada
+    grid = np.zeros((64, 64), dtype=bool)
+    grid[24:40, 24:40] = random_grid((16, 16), seed=6, fraction=0.4)
+    life = HashLife()
+    life.load(grid)
+    life.advance(13)
+    reference = grid
+    for _ in range(13):
+        reference = conway_step(reference, boundary="fill")
+    assert np.array_equal(life.to_dense() > 0, reference)
+    assert life.population == np.count_nonzero(reference)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from helpers import load_module
+
+import checkpoint
+
+probabilistico = load_module("model_probabilistico", "conway-probabilistico/model_probabilistico.py")
+rule30 = load_module("rule30_random", "different_visualizations/html_visualization/hule30/rule30_random.py")
+
+
+def run(model, steps=5):
+    for _ in range(steps):
+        model.step()
+    return model
+
+
+@pytest.mark.parametrize("engine", ["loop", "vectorized"])
+def test_generator_seed(engine):
+    # Um np.random.Generator (aqui com o Rule30BitGenerator) serve de seed e é usado direto pelo modelo
+    def build():
+        rng = np.random.Generator(rule30.Rule30BitGenerator(seed=1))
+        return run(probabilistico.GameOfLifeModel(12, 12, engine=engine, seed=rng, lamb=5))
+
+    first, second = build(), build()
+    assert np.array_equal(first.cell_layer.data, second.cell_layer.data)
+    assert first.random.random() == second.random.random()
+    assert first.alive_count == np.count_nonzero(first.cell_layer.data)
+
+
+@pytest.mark.parametrize("engine", ["loop", "vectorized"])
+def test_int_seed_is_reproducible(engine):
+    first = run(probabilistico.GameOfLifeModel(12, 12, engine=engine, seed=7, lamb=5))
+    np.random.seed(123)
+    second = run(probabilistico.GameOfLifeModel(12, 12, engine=engine, seed=7, lamb=5))
+    assert np.array_equal(first.cell_layer.data, second.cell_layer.data)
+    assert first._seed == 7
+
+
+@pytest.mark.parametrize("engine", ["loop", "vectorized"])
+def test_checkpoint_restore(tmp_path, engine):
+    # Restaurar um checkpoint continua bit a bit a execução original e refaz as contagens
+    path = str(tmp_path / "model.npz")
+    original = run(probabilistico.GameOfLifeModel(16, 16, engine=engine, seed=3, lamb=5), 3)
+    checkpoint.save_checkpoint(original, path)
+    run(original, 4)
+
+    restored = probabilistico.GameOfLifeModel(16, 16, engine=engine, seed=99, lamb=5)
+    run(restored, 2)
+    checkpoint.load_checkpoint(restored, path)
+    assert restored.population[1] == np.count_nonzero(restored.cell_layer.data) == restored.alive_count
+    run(restored, 4)
+    assert np.array_equal(restored.cell_layer.data, original.cell_layer.data)
+    assert np.array_equal(restored.age_layer.data, original.age_layer.data)
+    assert restored.alive_count == original.alive_count
@@ -0,0 +1,41 @@
+import numpy as np
+
+from helpers import load_module
+
+import trajectory
+
+probabilistico = load_module("model_probabilistico", "conway-probabilistico/model_probabilistico.py")
+pp_model = load_module("pp_model", "different_visualizations/PP-model/pp_model.py")
+
+
+def test_replay_matches_recording(tmp_path):
+    path = str(tmp_path / "run.traj")
+    model = probabilistico.GameOfLifeModel(16, 16, engine="vectorized", seed=1, lamb=5)
+    reference = probabilistico.GameOfLifeModel(16, 16, engine="vectorized", seed=1, lamb=5)
+    trajectory.record_model(model, path, 20, keyframe_interval=8)
+
+    replay = trajectory.ReplayModel(path)
+    for step in range(21):
+        assert replay.steps == step
+        assert np.array_equal(replay.cell_layer.data, reference.cell_layer.data)
+        assert np.array_equal(replay.age_layer.data, reference.age_layer.data)
+        assert replay.alive_count == reference.alive_count
+        replay.step()
+        reference.step()
+
+    replay.seek(7)
+    assert np.array_equal(replay.cell_layer.data, trajectory.TrajectoryReader(path)[7]["cell_layer"])
+
+
+def test_replay_alive_count_of_multi_state_grid(tmp_path):
+    # A grade de espécies do predador-presa tem vários estados: contar os não-zeros não dá "vivas"
+    path = str(tmp_path / "pp.traj")
+    trajectory.record_model(pp_model.GameOfLifeModel(5, 12, 12, seed=2), path, 3)
+    assert trajectory.ReplayModel(path).alive_count is None
+
+    # Gravação antiga sem a métrica: a grade booleana ainda dá a contagem
+    path = str(tmp_path / "old.traj")
+    grid = np.random.default_rng(0).random((8, 8)) < 0.3
+    with trajectory.TrajectoryWriter(path) as writer:
+        writer.append(cell_layer=grid)
+    assert trajectory.ReplayModel(path).alive_count == np.count_nonzero(grid)
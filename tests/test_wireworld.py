@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from helpers import load_module
+
+from hashlife import HashLife, wireworld
+
+ww = load_module("wireworld_visualization", "different_visualizations/html_visualization/wireworld/wireworld_visualization.py")
+
+
+def circuit(shape, seed=0):
+    # Fios aleatórios (metade das células) com alguns elétrons (cabeça e cauda) espalhados
+    rng = np.random.default_rng(seed)
+    grid = np.where(rng.random(shape) < 0.5, ww.CONDUCTOR, ww.EMPTY)
+    electrons = (grid == ww.CONDUCTOR) & (rng.random(shape) < 0.1)
+    grid[electrons] = rng.choice([ww.ELECTRON_HEAD, ww.ELECTRON_TAIL], size=np.count_nonzero(electrons))
+    return grid
+
+
+def loop(width, height, length):
+    # Anel de fio com um elétron dando a volta, longe das bordas
+    grid = np.full((width, height), ww.EMPTY)
+    grid[2, 2 : 2 + length] = grid[2 + length, 2 : 2 + length] = ww.CONDUCTOR
+    grid[2 : 3 + length, 2] = grid[2 : 3 + length, 1 + length] = ww.CONDUCTOR
+    grid[2, 3], grid[2, 2] = ww.ELECTRON_HEAD, ww.ELECTRON_TAIL
+    return grid
+
+
+@pytest.mark.parametrize("grid", [circuit((30, 30)), circuit((25, 47), seed=1), loop(40, 40, 12)])
+def test_backends_match(grid):
+    # O backend "loop" (célula por célula) é a referência
+    models = {
+        backend: ww.WireworldModel(*grid.shape, initial_configuration=grid.copy(), backend=backend)
+        for backend in ("loop", "sparse", "conductors")
+    }
+    for _ in range(25):
+        for model in models.values():
+            model.step()
+        reference = models["loop"].cell_layer.data
+        for backend, model in models.items():
+            assert np.array_equal(model.cell_layer.data, reference), backend
+
+
+def test_edits_match():
+    grid = loop(30, 30, 10)
+    models = [ww.WireworldModel(30, 30, grid.copy(), backend) for backend in ("loop", "sparse", "conductors")]
+    for step in range(20):
+        for model in models:
+            if step == 7:
+                # Corta o anel e acende um novo elétron, como um clique na página
+                model.cell_layer.data[2, 8] = ww.EMPTY
+                model.cell_layer.data[12, 2] = ww.ELECTRON_HEAD
+                model.mark_changed(2, 8)
+                model.mark_changed(12, 2)
+            model.step()
+        for model in models[1:]:
+            assert np.array_equal(model.cell_layer.data, models[0].cell_layer.data)
+
+
+def test_hashlife_wireworld():
+    grid = loop(32, 32, 12)
+    model = ww.WireworldModel(32, 32, grid.copy())
+    life = HashLife(rule=wireworld)
+    life.load(grid)
+    life.advance(16)
+    for _ in range(16):
+        model.step()
+    assert np.array_equal(life.to_dense(shape=grid.shape), model.cell_layer.data)